@@ -1,50 +1,243 @@
 import os
+import logging
+import threading
+import time
 from typing import Optional
 from pydantic import BaseModel
-from dotenv import load_dotenv, set_key
+from dotenv import load_dotenv
 
 ENV_FILE = ".env"
 load_dotenv(ENV_FILE)
 
+DATA_DIR = os.getenv("DATA_DIR", "data")
+JOB_DB_PATH = os.getenv("JOB_DB_PATH", os.path.join(DATA_DIR, "jobs.db"))
+JOB_UPLOAD_DIR = os.getenv("JOB_UPLOAD_DIR", os.path.join(DATA_DIR, "uploads"))
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+# A running job renews its lease every JOB_HEARTBEAT_SECONDS; one not
+# renewed for JOB_LEASE_SECONDS lost its worker and goes back in the queue
+JOB_HEARTBEAT_SECONDS = float(os.getenv("JOB_HEARTBEAT_SECONDS", "10"))
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "60"))
+# How long a finished job's progress events are kept for replaying its stream
+JOB_EVENT_RETENTION_SECONDS = float(os.getenv("JOB_EVENT_RETENTION_SECONDS", str(24 * 3600)))
+
+CACHE_DIR = os.getenv("CACHE_DIR", os.path.join(DATA_DIR, "cache"))
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+
+REMINDER_DB_PATH = os.getenv("REMINDER_DB_PATH", os.path.join(DATA_DIR, "reminders.db"))
+REMINDER_TIMEZONE = os.getenv("REMINDER_TIMEZONE") or None
+SCHEDULER_LOCK_PATH = os.getenv("SCHEDULER_LOCK_PATH", os.path.join(DATA_DIR, "scheduler.lock"))
+# Upper bound on how long the leader sleeps before re-reading schedules changed by other workers
+SCHEDULER_RESCAN_SECONDS = float(os.getenv("SCHEDULER_RESCAN_SECONDS", "60"))
+
+OUTBOX_DB_PATH = os.getenv("OUTBOX_DB_PATH", os.path.join(DATA_DIR, "outbox.db"))
+OUTBOX_LOCK_PATH = os.getenv("OUTBOX_LOCK_PATH", os.path.join(DATA_DIR, "outbox.lock"))
+OUTBOX_POLL_SECONDS = float(os.getenv("OUTBOX_POLL_SECONDS", "2"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "8"))
+OUTBOX_BACKOFF_SECONDS = float(os.getenv("OUTBOX_BACKOFF_SECONDS", "1"))
+OUTBOX_COALESCE_MAX_CHARS = int(os.getenv("OUTBOX_COALESCE_MAX_CHARS", "3500"))
+
+# Overridden by the benchmarks to point at a local Slack stand-in
+SLACK_API_URL = os.getenv("SLACK_API_URL", "https://slack.com/api/")
+
+TENANT_DB_PATH = os.getenv("TENANT_DB_PATH", os.path.join(DATA_DIR, "tenants.db"))
+# Sent as X-Admin-Token, opens every team's tenant-scoped routes. Without
+# it the default team and any team that has not claimed its secret yet stay
+# open; with it both need the token.
+ADMIN_API_TOKEN = os.getenv("ADMIN_API_TOKEN") or None
+
+# Per-person updates from every summary, kept for the /history endpoints
+HISTORY_DB_PATH = os.getenv("HISTORY_DB_PATH", os.path.join(DATA_DIR, "history.db"))
+SLACK_CLIENT_POOL_SIZE = int(os.getenv("SLACK_CLIENT_POOL_SIZE", "256"))
+
+MAX_MEDIA_UPLOAD_BYTES = int(os.getenv("MAX_MEDIA_UPLOAD_BYTES", str(500 * 1024 * 1024)))
+MAX_DOCX_UPLOAD_BYTES = int(os.getenv("MAX_DOCX_UPLOAD_BYTES", str(20 * 1024 * 1024)))
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
+
+# Admission control, per web worker. Media uploads are weighed in estimated
+# audio seconds (Content-Length / ADMISSION_MEDIA_BYTES_PER_SECOND, about
+# 128 kbps) and hold their share until their job finishes; transcript
+# uploads are weighed in KB while they are summarized. Requests that do not
+# fit wait in a bounded queue: a full queue answers 429, a wait longer than
+# ADMISSION_QUEUE_TIMEOUT_SECONDS answers 503, both with Retry-After.
+ADMISSION_MEDIA_CAPACITY_SECONDS = int(os.getenv("ADMISSION_MEDIA_CAPACITY_SECONDS", "7200"))
+ADMISSION_MEDIA_BYTES_PER_SECOND = int(os.getenv("ADMISSION_MEDIA_BYTES_PER_SECOND", "16000"))
+ADMISSION_MEDIA_QUEUE = int(os.getenv("ADMISSION_MEDIA_QUEUE", "8"))
+ADMISSION_DOCX_CAPACITY_KB = int(os.getenv("ADMISSION_DOCX_CAPACITY_KB", "4096"))
+ADMISSION_DOCX_QUEUE = int(os.getenv("ADMISSION_DOCX_QUEUE", "32"))
+ADMISSION_QUEUE_TIMEOUT_SECONDS = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_SECONDS", "10"))
+
+WHISPER_MODEL_SIZES = ("tiny", "base", "small", "medium", "large")
+WHISPER_MODEL_SIZE = os.getenv("WHISPER_MODEL_SIZE", "large")
+WHISPER_SOCKET_PATH = os.getenv("WHISPER_SOCKET_PATH", os.path.join(DATA_DIR, "whisper.sock"))
+WHISPER_SERVER_AUTOSTART = os.getenv("WHISPER_SERVER_AUTOSTART", "true").lower() == "true"
+# Warm-up in the background after startup: job worker processes are
+# spawned and the Whisper server (and its model) started before /readyz
+# reports ready, instead of on the first upload
+STARTUP_WARMUP = os.getenv("STARTUP_WARMUP", "true").lower() == "true"
+# Off for deployments that only summarize transcripts
+READY_REQUIRES_WHISPER = os.getenv("READY_REQUIRES_WHISPER", "true").lower() == "true"
+# Torch intra-op threads for the openai-whisper backend (0 leaves torch's default)
+WHISPER_THREADS = int(os.getenv("WHISPER_THREADS", "0"))
+# None keeps openai-whisper's greedy decoding
+WHISPER_BEAM_SIZE = int(os.getenv("WHISPER_BEAM_SIZE", "0")) or None
+
+# "openai-whisper" (PyTorch) or "faster-whisper" (CTranslate2, quantized on CPU)
+TRANSCRIBE_BACKENDS = ("openai-whisper", "faster-whisper")
+TRANSCRIBE_BACKEND = os.getenv("TRANSCRIBE_BACKEND", "openai-whisper")
+FASTER_WHISPER_MODEL_SIZE = os.getenv("FASTER_WHISPER_MODEL_SIZE", WHISPER_MODEL_SIZE)
+FASTER_WHISPER_COMPUTE_TYPE = os.getenv("FASTER_WHISPER_COMPUTE_TYPE", "int8")
+FASTER_WHISPER_CPU_THREADS = int(os.getenv("FASTER_WHISPER_CPU_THREADS", "0"))
+FASTER_WHISPER_BEAM_SIZE = int(os.getenv("FASTER_WHISPER_BEAM_SIZE", "5"))
+
+# "single" runs one transcribe() over the whole file; "chunked" splits long
+# recordings at silences and transcribes the chunks in parallel processes.
+TRANSCRIBE_MODE = os.getenv("TRANSCRIBE_MODE", "single")
+# Every chunk worker loads its own copy of the model (several GB each for
+# "large", about a third of that with faster-whisper int8), so memory grows
+# with this setting; raise it only with the RAM to match.
+TRANSCRIBE_CHUNK_WORKERS = int(os.getenv("TRANSCRIBE_CHUNK_WORKERS", "2"))
+TRANSCRIBE_CHUNK_SECONDS = float(os.getenv("TRANSCRIBE_CHUNK_SECONDS", "120"))
+TRANSCRIBE_MIN_SILENCE_SECONDS = float(os.getenv("TRANSCRIBE_MIN_SILENCE_SECONDS", "0.5"))
+
+# Voice-activity pre-pass: quiet stretches at least VAD_MIN_SILENCE_SECONDS
+# long are cut before transcription, keeping VAD_PAD_SECONDS of audio around
+# each speech region; louder bursts shorter than VAD_MIN_SPEECH_SECONDS
+# (clicks, a chair moving) are cut too.
+VAD_ENABLED = os.getenv("VAD_ENABLED", "true").lower() == "true"
+VAD_MIN_SILENCE_SECONDS = float(os.getenv("VAD_MIN_SILENCE_SECONDS", "1.0"))
+VAD_MIN_SPEECH_SECONDS = float(os.getenv("VAD_MIN_SPEECH_SECONDS", "0.25"))
+VAD_PAD_SECONDS = float(os.getenv("VAD_PAD_SECONDS", "0.2"))
+
+GROQ_BASE_URL = os.getenv("GROQ_BASE_URL", "https://api.groq.com/openai/v1")
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "30"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "4"))
+LLM_BACKOFF_SECONDS = float(os.getenv("LLM_BACKOFF_SECONDS", "0.5"))
+
+# Transcripts longer than this many input tokens are summarized in chunks
+# that run concurrently and are merged per person
+SUMMARY_CHUNK_TOKENS = int(os.getenv("SUMMARY_CHUNK_TOKENS", "1500"))
+
+SPEAKER_BATCH_SIZE = int(os.getenv("SPEAKER_BATCH_SIZE", "25"))
+SPEAKER_CONTEXT_WINDOW = int(os.getenv("SPEAKER_CONTEXT_WINDOW", "10"))
+# Update segments the rule-based attribution scores below this are sent to Groq
+SPEAKER_CONFIDENCE_THRESHOLD = float(os.getenv("SPEAKER_CONFIDENCE_THRESHOLD", "0.6"))
+
+METRICS_DIR = os.getenv("METRICS_DIR", os.path.join(DATA_DIR, "metrics"))
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+# "json" for one JSON object per line, "text" for key=value lines
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+
+# How often get_config() checks the .env mtime for changes made by other workers
+CONFIG_RELOAD_INTERVAL_SECONDS = float(os.getenv("CONFIG_RELOAD_INTERVAL_SECONDS", "1"))
+
+ENV_KEYS = {
+    "bot_token": "SLACK_BOT_TOKEN",
+    "bot_app_token": "SLACK_APP_TOKEN",
+    "channel_id": "SLACK_CHANNEL_ID",
+    "meeting_end_time": "MEETING_END_TIME",
+}
+
 class BotConfig(BaseModel):
     bot_token: Optional[str] = os.getenv("SLACK_BOT_TOKEN")
     bot_app_token: Optional[str] = os.getenv("SLACK_APP_TOKEN")
     channel_id: Optional[str] = os.getenv("SLACK_CHANNEL_ID")
     meeting_end_time: Optional[str] = os.getenv("MEETING_END_TIME")  
 
+def _env_mtime():
+    try:
+        return os.stat(ENV_FILE).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+def _env_line(key, value):
+    value = "" if value is None else str(value)
+    return "{}='{}'".format(key, value.replace("'", "\\'"))
+
+def _write_env(values: dict):
+    # Rewrite .env once with every changed key, then swap it into place so
+    # other workers never read a half-written file.
+    lines = []
+    if os.path.exists(ENV_FILE):
+        with open(ENV_FILE) as f:
+            lines = f.read().splitlines()
+    remaining = dict(values)
+    for index, line in enumerate(lines):
+        key = line.split("=", 1)[0].strip()
+        if key.startswith("export "):
+            key = key[len("export "):].strip()
+        if key in remaining:
+            lines[index] = _env_line(key, remaining.pop(key))
+    lines.extend(_env_line(key, value) for key, value in remaining.items())
+    tmp_path = f"{ENV_FILE}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+    os.replace(tmp_path, ENV_FILE)
+
 class Config:
+    # In-memory settings: reads never touch .env, each update is one atomic
+    # write, and subscribers are told whenever the settings change.
     _instance = None
-    _config = BotConfig()
+    _config = BotConfig(meeting_end_time=os.getenv("MEETING_END_TIME", "09:00"))
+    _version = 1
+    _mtime = _env_mtime()
+    _checked_at = 0.0
+    _subscribers = []
+    _lock = threading.Lock()
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(Config, cls).__new__(cls)
         return cls._instance
 
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def subscribe(self, callback):
+        # callback(config: BotConfig) runs after every change
+        self._subscribers.append(callback)
+
+    def _notify(self):
+        for callback in list(self._subscribers):
+            try:
+                callback(self._config)
+            except Exception as e:
+                logging.getLogger("clover.config").exception("Config subscriber failed", extra={"error": str(e)})
+
     def set_config(self, **kwargs):
-        for key, value in kwargs.items():
-            if hasattr(self._config, key):
-                setattr(self._config, key, value)
-
-                env_key = key.upper()
-                if key == "bot_token":
-                    env_key = "SLACK_BOT_TOKEN"
-                elif key == "bot_app_token":
-                    env_key = "SLACK_APP_TOKEN"
-                elif key == "channel_id":
-                    env_key = "SLACK_CHANNEL_ID"
-                elif key == "meeting_end_time":
-                    env_key = "MEETING_END_TIME"
-                set_key(ENV_FILE, env_key, value)
+        with self._lock:
+            updates = {key: value for key, value in kwargs.items() if hasattr(self._config, key)}
+            env_values = {ENV_KEYS.get(key, key.upper()): value for key, value in updates.items()}
+            _write_env(env_values)
+            os.environ.update(env_values)
+            Config._config = self._config.model_copy(update=updates)
+            Config._mtime = _env_mtime()
+            Config._version += 1
+        self._notify()
+
+    def _reload_if_changed(self):
+        now = time.monotonic()
+        if now - self._checked_at < CONFIG_RELOAD_INTERVAL_SECONDS:
+            return
+        Config._checked_at = now
+        mtime = _env_mtime()
+        if mtime == self._mtime:
+            return
+        with self._lock:
+            load_dotenv(ENV_FILE, override=True)
+            Config._config = BotConfig(
+                bot_token=os.getenv("SLACK_BOT_TOKEN"),
+                bot_app_token=os.getenv("SLACK_APP_TOKEN"),
+                channel_id=os.getenv("SLACK_CHANNEL_ID"),
+                meeting_end_time=os.getenv("MEETING_END_TIME", "09:00")
+            )
+            Config._mtime = mtime
+            Config._version += 1
+        self._notify()
 
     def get_config(self) -> BotConfig:
-        load_dotenv(ENV_FILE, override=True) 
-        self._config = BotConfig(
-            bot_token=os.getenv("SLACK_BOT_TOKEN"),
-            bot_app_token=os.getenv("SLACK_APP_TOKEN"),
-            channel_id=os.getenv("SLACK_CHANNEL_ID"),
-            meeting_end_time=os.getenv("MEETING_END_TIME", "09:00")
-        )
+        self._reload_if_changed()
         return self._config
 
 
@@ -1,24 +1,104 @@
-from app.config import config
+import hashlib
+import hmac
+import secrets
+from fastapi import HTTPException
+from app.config import ADMIN_API_TOKEN, REMINDER_TIMEZONE
+from app.utils import reminder_store, tenant_store
+from app.controllers.slack_controller import notify_schedule_changed
+
+def _hash_secret(secret: str) -> str:
+    return hashlib.sha256(secret.encode()).hexdigest()
+
+def is_admin(admin_token: str = None) -> bool:
+    return bool(ADMIN_API_TOKEN and admin_token and hmac.compare_digest(admin_token, ADMIN_API_TOKEN))
+
+def authorize_tenant(tenant_id: str = None, admin_token: str = None, tenant_secret: str = None):
+    # The admin token opens every team. The default team never claims a
+    # secret, so the existing single-team client keeps working; it is gated
+    # by the admin token alone once one is configured. Any other team that
+    # has claimed a secret needs it, and an unclaimed one is open only while
+    # no admin token is configured, so a fresh deployment can still be set up.
+    if is_admin(admin_token):
+        return
+    if tenant_store.resolve(tenant_id) == tenant_store.DEFAULT_TENANT:
+        if ADMIN_API_TOKEN:
+            raise HTTPException(status_code=401, detail="X-Admin-Token required")
+        return
+    stored = tenant_store.get_secret_hash(tenant_id)
+    if stored is None:
+        if ADMIN_API_TOKEN:
+            raise HTTPException(status_code=401, detail="X-Admin-Token required")
+        return
+    if not tenant_secret:
+        raise HTTPException(status_code=401, detail="X-Tenant-Secret required")
+    if not hmac.compare_digest(_hash_secret(tenant_secret), stored):
+        raise HTTPException(status_code=403, detail="Invalid tenant secret")
+
+def _mask(token: str):
+    # Enough to tell which token is set without revealing it
+    if not token:
+        return None
+    return f"{token[:5]}…{token[-4:]}" if len(token) > 12 else "…"
 
 def set_credentials(
     bot_token: str,
     bot_app_token: str,
     channel_id: str,
-    meeting_end_time: str = "09:00"
+    meeting_end_time: str = "09:00",
+    tenant_id: str = None,
+    admin_token: str = None,
+    tenant_secret: str = None
 ):
-    config.set_config(
-        bot_token=bot_token,
-        bot_app_token=bot_app_token,
-        channel_id=channel_id,
-        meeting_end_time=meeting_end_time
+    authorize_tenant(tenant_id, admin_token, tenant_secret)
+    try:
+        reminder_store.validate(meeting_end_time)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid meeting_end_time: {str(e)}")
+
+    tenant_id = tenant_store.resolve(tenant_id)
+    # The first save claims a team: its secret is returned this once and
+    # only its hash is kept. If another request claimed it in the meantime,
+    # check this one against that secret.
+    new_secret = None
+    if tenant_id != tenant_store.DEFAULT_TENANT:
+        new_secret = secrets.token_urlsafe(32)
+        if not tenant_store.claim_secret(tenant_id, _hash_secret(new_secret)):
+            new_secret = None
+            authorize_tenant(tenant_id, admin_token, tenant_secret)
+    tenant_store.set_tenant(tenant_id, bot_token, bot_app_token, channel_id, meeting_end_time)
+    reminder_store.upsert_reminder(
+        channel_id,
+        meeting_end_time,
+        REMINDER_TIMEZONE,
+        reminder_store.default_reminder_id(tenant_id),
+        tenant_id
     )
-    return {
+    notify_schedule_changed()
+    response = {
         "message": "Credentials and settings saved successfully",
         "settings": {
+            "tenant_id": tenant_id,
             "channel_id": channel_id,
             "meeting_end_time": meeting_end_time
         }
     }
+    if new_secret:
+        response["tenant_secret"] = new_secret
+    return response
+
+def get_tenant_or_404(tenant_id: str = None):
+    tenant = tenant_store.get_tenant(tenant_id)
+    if tenant is None:
+        raise HTTPException(status_code=404, detail=f"Tenant not found: {tenant_id}")
+    return tenant
 
-def get_credentials():
-    return config.get_config().dict()
+def get_credentials(tenant_id: str = None, admin_token: str = None, tenant_secret: str = None):
+    authorize_tenant(tenant_id, admin_token, tenant_secret)
+    tenant = get_tenant_or_404(tenant_id)
+    return {
+        "tenant_id": tenant_store.resolve(tenant_id),
+        "bot_token": _mask(tenant.bot_token),
+        "bot_app_token": _mask(tenant.bot_app_token),
+        "channel_id": tenant.channel_id,
+        "meeting_end_time": tenant.meeting_end_time
+    }
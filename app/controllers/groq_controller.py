@@ -1,29 +1,24 @@
+import asyncio
 import os
-import json
-import requests
-from io import BytesIO
-from dotenv import load_dotenv
+import tempfile
 from fastapi import UploadFile, File, HTTPException, BackgroundTasks
+from app.config import MAX_DOCX_UPLOAD_BYTES, SUMMARY_CHUNK_TOKENS
 from app.utils.docx_parser import extract_text_from_docx
+from app.utils.upload_utils import save_upload
+from app.utils.llm_client import chat_completion, LLMError, LLMTimeoutError
+from app.utils import event_stream, metrics, result_cache, summary_chunker
+from app.utils.log import get_logger
+from app.controllers.creds_controller import get_tenant_or_404
+from app.controllers.history_controller import record_summary
 from app.controllers.slack_controller import send_groq_summary_to_slack
 
-load_dotenv()
+SUMMARY_MODEL = "llama3-8b-8192"
+# Bump when the prompt or generation parameters change so cached summaries are not reused
+PROMPT_VERSION = "2"
 
-API_URL = "https://api.groq.com/openai/v1/chat/completions" 
-API_KEY = os.getenv("GROQ_API_KEY")
-
-
-async def process_docx_file(file: UploadFile = File(...), background_tasks: BackgroundTasks = None) -> dict:
-    if file.content_type != "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-        raise HTTPException(status_code=400, detail="Invalid file type. Please upload a .docx file.")
-
-    contents = await file.read()
-
-    try:
-        full_text = extract_text_from_docx(contents)
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Failed to read .docx file: {str(e)}")
+logger = get_logger("summary")
 
+def format_prompt(input_text: str) -> str:
     prompt = """
 You are a text parser that extracts and formats information from team updates. Output *only* the formatted information for *all* team members in the input, in the exact format shown below, with no additional text or commentary. Summarize each field to 5-10 words, preserving technical terms and keywords. Use lowercase for tasks and blockers fields, and separate each person's summary with a single blank line.
 
@@ -46,32 +41,76 @@ Output concise formatted summaries for all team members, in the specified format
     prompt = prompt.replace("{today_tasks}", "{{today_tasks}}")
     prompt = prompt.replace("{blockers}", "{{blockers}}")
 
-    formatted_prompt = prompt.format(input_text=full_text)
+    return prompt.format(input_text=input_text)
 
-    payload = {
-        "model": "llama3-8b-8192",
-        "messages": [
-            {
-                "role": "user",
-                "content": formatted_prompt
-            }
-        ],
-        "max_tokens": 400,
-        "temperature": 0.7,
-        "stop": ["\n\n\n"]
-    }
+async def summarize_chunk(text: str) -> str:
+    return await chat_completion(
+        format_prompt(text),
+        model=SUMMARY_MODEL,
+        max_tokens=400,
+        temperature=0.7,
+        stop=["\n\n\n"]
+    )
 
-    headers = {
-        "Authorization": f"Bearer {API_KEY}",
-        "Content-Type": "application/json"
-    }
+async def read_docx_upload(file: UploadFile, tenant_id: str = None):
+    # Returns (text, content_hash); bad uploads fail here, before any
+    # response has started
+    get_tenant_or_404(tenant_id)
+    if file.content_type != "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
+        raise HTTPException(status_code=400, detail="Invalid file type. Please upload a .docx file.")
 
+    tmp_path = tempfile.NamedTemporaryFile(delete=False, suffix=".docx").name
+    hasher = result_cache.content_hasher()
     try:
-        response = requests.post(API_URL, headers=headers, data=json.dumps(payload), timeout=30)
-        response.raise_for_status()
-        result = response.json()
-        summary = result["choices"][0]["message"]["content"].strip()
-        
+        await save_upload(file, tmp_path, MAX_DOCX_UPLOAD_BYTES, hasher)
+        with metrics.stage_timer("docx_extract"):
+            full_text = extract_text_from_docx(tmp_path)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Failed to read .docx file: {str(e)}")
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return full_text, hasher.hexdigest()
+
+async def summarize_docx_text(full_text: str, content_hash: str, background_tasks: BackgroundTasks = None,
+                              tenant_id: str = None, on_event=None) -> dict:
+    # on_event(type, **data), if given, hears about each chunk's partial
+    # summary as it arrives and each person's merged summary
+    emit = on_event or (lambda event_type, **data: None)
+    cache_key = result_cache.make_key(
+        "docx-summary", content_hash, SUMMARY_MODEL, PROMPT_VERSION, SUMMARY_CHUNK_TOKENS
+    )
+
+    async def summarize():
+        # Long transcripts are summarized chunk by chunk, all at once, so
+        # latency follows the slowest chunk rather than the total length
+        chunks = summary_chunker.chunk_text(full_text, SUMMARY_CHUNK_TOKENS)
+        if len(chunks) > 1:
+            logger.info("Summarizing in chunks", extra={"chunks": len(chunks), "chars": len(full_text)})
+        emit("stage", stage="summarizing", status="running", chunks=len(chunks))
+
+        async def summarize_part(index, chunk):
+            output = await summarize_chunk(chunk)
+            if len(chunks) > 1:
+                emit("partial", chunk=index, chunks=len(chunks), summary=output)
+            return output
+
+        outputs = await asyncio.gather(*(summarize_part(i, chunk) for i, chunk in enumerate(chunks)))
+        if len(outputs) == 1:
+            return outputs[0]
+        with metrics.stage_timer("summary_merge"):
+            return summary_chunker.merge_summaries(outputs)
+
+    try:
+        summary = await result_cache.get_or_compute(cache_key, "summary", summarize)
+        for block in summary.split("\n\n"):
+            if block.strip():
+                emit("summary", person=block.strip().splitlines()[0], text=block.strip())
+        emit("stage", stage="summarizing", status="done")
+        await asyncio.to_thread(record_summary, tenant_id, content_hash, "docx", summary)
+
         response_data = {
             "status": "success",
             "data": {
@@ -81,21 +120,61 @@ Output concise formatted summaries for all team members, in the specified format
         }
         
         if background_tasks:
-            background_tasks.add_task(send_groq_summary_to_slack, response_data)
+            background_tasks.add_task(send_groq_summary_to_slack, response_data, tenant_id)
+            emit("stage", stage="posting", status="queued")
         
         return response_data
-    except requests.exceptions.Timeout:
+    except LLMTimeoutError:
         error_data = {"status": "error", "error": "Request timed out. Please try again."}
         if background_tasks:
-            background_tasks.add_task(send_groq_summary_to_slack, error_data)
+            background_tasks.add_task(send_groq_summary_to_slack, error_data, tenant_id)
         raise HTTPException(status_code=504, detail="Request timed out. Please try again.")
-    except requests.exceptions.RequestException as e:
+    except LLMError as e:
         error_data = {"status": "error", "error": f"Error making API request: {str(e)}"}
         if background_tasks:
-            background_tasks.add_task(send_groq_summary_to_slack, error_data)
+            background_tasks.add_task(send_groq_summary_to_slack, error_data, tenant_id)
         raise HTTPException(status_code=500, detail=f"Error making API request: {str(e)}")
-    except (KeyError, json.JSONDecodeError) as e:
-        error_data = {"status": "error", "error": f"Error parsing API response: {str(e)}"}
-        if background_tasks:
-            background_tasks.add_task(send_groq_summary_to_slack, error_data)
-        raise HTTPException(status_code=500, detail=f"Error parsing API response: {str(e)}")
+
+async def process_docx_file(file: UploadFile = File(...), background_tasks: BackgroundTasks = None,
+                            tenant_id: str = None) -> dict:
+    full_text, content_hash = await read_docx_upload(file, tenant_id)
+    return await summarize_docx_text(full_text, content_hash, background_tasks, tenant_id)
+
+# Summaries still running after their client disconnected; kept referenced
+# so they finish and land in the result cache
+_detached = set()
+
+async def stream_docx_file(file: UploadFile, background_tasks: BackgroundTasks, tenant_id: str, fmt: str):
+    full_text, content_hash = await read_docx_upload(file, tenant_id)
+    events = asyncio.Queue()
+
+    def on_event(event_type, **data):
+        events.put_nowait({"type": event_type, **data})
+
+    on_event("stage", stage="uploaded", status="done")
+    on_event("stage", stage="converting", status="done", chars=len(full_text))
+
+    async def run():
+        try:
+            result = await summarize_docx_text(full_text, content_hash, background_tasks, tenant_id, on_event)
+            on_event("result", **result)
+        except HTTPException as e:
+            on_event("error", status_code=e.status_code, error=e.detail)
+        except Exception as e:
+            on_event("error", status_code=500, error=str(e))
+
+    async def follow():
+        task = asyncio.create_task(run())
+        _detached.add(task)
+        task.add_done_callback(_detached.discard)
+        while True:
+            try:
+                event = await asyncio.wait_for(events.get(), event_stream.HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield {"type": "heartbeat"}
+                continue
+            yield event
+            if event["type"] in ("result", "error"):
+                return
+
+    return event_stream.response(follow(), fmt)
@@ -0,0 +1,58 @@
+from datetime import date
+from fastapi import HTTPException
+from app.utils import history_store, tenant_store
+from app.utils.log import get_logger
+from app.controllers.creds_controller import get_tenant_or_404
+
+logger = get_logger("history")
+
+def _check_dates(since: str = None, until: str = None):
+    for name, value in (("since", since), ("until", until)):
+        if value is None:
+            continue
+        try:
+            date.fromisoformat(value)
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"{name} must be a date in YYYY-MM-DD format")
+
+def _check_field(field: str = None):
+    if field is not None and field not in history_store.FIELDS:
+        raise HTTPException(status_code=400, detail=f"field must be one of {', '.join(history_store.FIELDS)}")
+
+def record_summary(tenant_id: str, content_hash: str, source: str, summary: str):
+    # Called after every successful summary; history is best-effort and
+    # never fails the upload that produced it
+    try:
+        people = history_store.record_summary(tenant_store.resolve(tenant_id), content_hash, source, summary)
+        logger.info("Standup recorded in history", extra={"people": people, "source": source})
+    except Exception as e:
+        logger.warning("Failed to record standup history", extra={"error": str(e)})
+
+def get_history(tenant_id: str = None, q: str = None, person: str = None, field: str = None, since: str = None,
+                until: str = None, limit: int = 50, offset: int = 0):
+    get_tenant_or_404(tenant_id)
+    _check_field(field)
+    _check_dates(since, until)
+    updates = history_store.search_updates(
+        tenant_store.resolve(tenant_id), q, person, field, since, until, limit, offset
+    )
+    return {"updates": updates, "limit": limit, "offset": offset}
+
+def get_recurring_blockers(tenant_id: str = None, person: str = None, since: str = None, until: str = None,
+                           min_days: int = 2, limit: int = 50, offset: int = 0):
+    get_tenant_or_404(tenant_id)
+    _check_dates(since, until)
+    blockers = history_store.recurring_blockers(
+        tenant_store.resolve(tenant_id), person, since, until, min_days, limit=limit, offset=offset
+    )
+    return {"blockers": blockers, "limit": limit, "offset": offset}
+
+def get_person_timeline(person: str, tenant_id: str = None, since: str = None, until: str = None,
+                        limit: int = 100, offset: int = 0):
+    get_tenant_or_404(tenant_id)
+    _check_dates(since, until)
+    updates = history_store.search_updates(
+        tenant_store.resolve(tenant_id), person=person, since=since, until=until,
+        limit=limit, offset=offset, oldest_first=True
+    )
+    return {"person": person, "updates": updates, "limit": limit, "offset": offset}
@@ -0,0 +1,148 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from fastapi import HTTPException
+from app.config import JOB_LEASE_SECONDS, JOB_WORKERS
+from app.utils import job_store, tenant_store
+from app.controllers.creds_controller import authorize_tenant, is_admin
+from app.utils.log import get_logger
+
+logger = get_logger("jobs")
+
+_executor = None
+_executor_lock = threading.Lock()
+_stop_reaper = threading.Event()
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # spawn keeps the children clear of the web worker's threads and sockets
+            _executor = ProcessPoolExecutor(
+                max_workers=JOB_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _executor
+
+def _reset_executor(broken):
+    # A worker that died (e.g. OOM-killed) breaks the whole pool for good;
+    # drop it so the next submit starts a fresh one
+    global _executor
+    with _executor_lock:
+        if _executor is broken:
+            _executor = None
+        else:
+            return
+    logger.warning("Job worker pool broken; starting a new one")
+    broken.shutdown(wait=False, cancel_futures=True)
+
+def _fail_job(job_id: str, input_path: str, error: str):
+    # The job will not run again, so its upload is not needed either
+    job_store.finish_job(job_id, error=error)
+    if input_path and os.path.exists(input_path):
+        os.remove(input_path)
+
+def submit_job(job_id: str, input_path: str, file_ext: str, on_done=None):
+    # on_done is called with no arguments when the job ends, from an
+    # executor thread (or at once if the job could not be submitted)
+    from app.controllers.rec_controller import run_transcription_job
+    for attempt in range(2):
+        executor = _get_executor()
+        try:
+            future = executor.submit(run_transcription_job, job_id, input_path, file_ext)
+            break
+        except BrokenProcessPool as e:
+            _reset_executor(executor)
+            error = e
+    else:
+        logger.error("Job could not be submitted", extra={"job_id": job_id, "error": str(error)})
+        _fail_job(job_id, input_path, f"Worker pool unavailable: {error}")
+        if on_done is not None:
+            on_done()
+        return
+    future.add_done_callback(lambda f: _job_done(job_id, input_path, file_ext, on_done, f, executor))
+
+def _warm_worker():
+    # Imports the job code in a fresh worker process
+    import app.controllers.rec_controller  # noqa: F401
+    return os.getpid()
+
+def warm_job_workers():
+    # Spawns every worker process and imports the job code in it, so the
+    # first upload does not pay for either; returns the worker pids
+    executor = _get_executor()
+    futures = [executor.submit(_warm_worker) for _ in range(JOB_WORKERS)]
+    return sorted({future.result() for future in futures})
+
+def _job_done(job_id, input_path, file_ext, on_done, future, executor):
+    if not future.cancelled():
+        exc = future.exception()
+        if isinstance(exc, BrokenProcessPool):
+            _reset_executor(executor)
+            # A dead worker fails every future in its pool, including jobs
+            # still waiting for a worker; only one that had been claimed
+            # was running when it died. The rest go to the new pool.
+            job = job_store.get_job(job_id)
+            if job is not None and job["status"] == "queued":
+                logger.warning("Job re-submitted after worker crash", extra={"job_id": job_id})
+                submit_job(job_id, input_path, file_ext, on_done)
+                return
+        if exc is not None:
+            logger.error("Job crashed in worker", extra={"job_id": job_id, "error": str(exc)})
+            _fail_job(job_id, input_path, f"Worker crashed: {exc}")
+    if on_done is not None:
+        on_done()
+
+def _reap_expired_jobs():
+    # Jobs whose worker went away without failing its future, e.g. one that
+    # was running when the web worker that owned it was restarted
+    while not _stop_reaper.wait(JOB_LEASE_SECONDS):
+        try:
+            expired = job_store.requeue_expired()
+        except Exception as e:
+            logger.warning("Failed to requeue expired jobs", extra={"error": str(e)})
+            continue
+        for job in expired:
+            logger.warning("Job lease expired; re-submitting", extra={"job_id": job["id"]})
+            submit_job(job["id"], job["input_path"], job["file_ext"])
+
+def start_job_workers():
+    job_store.init_db()
+    pending = job_store.recover_jobs()
+    for job in pending:
+        submit_job(job["id"], job["input_path"], job["file_ext"])
+    _stop_reaper.clear()
+    threading.Thread(target=_reap_expired_jobs, daemon=True, name="job-reaper").start()
+    logger.info("Job workers ready", extra={"processes": JOB_WORKERS, "resumed": len(pending)})
+
+def stop_job_workers():
+    global _executor
+    _stop_reaper.set()
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def get_job_status(job_id: str, admin_token: str = None, tenant_secret: str = None):
+    job = job_store.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    authorize_tenant(job["tenant_id"], admin_token, tenant_secret)
+    return job
+
+def list_job_statuses(status: str = None, limit: int = 50, offset: int = 0, tenant_id: str = None,
+                      admin_token: str = None, tenant_secret: str = None):
+    # With no tenant_id the admin token lists every team's jobs; anyone
+    # else gets the default team's
+    if tenant_id is None and is_admin(admin_token):
+        team = None
+    else:
+        authorize_tenant(tenant_id, admin_token, tenant_secret)
+        team = tenant_store.resolve(tenant_id)
+    return {
+        "jobs": job_store.list_jobs(status=status, limit=limit, offset=offset, tenant_id=team),
+        "limit": limit,
+        "offset": offset
+    }
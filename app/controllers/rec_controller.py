@@ -1,50 +1,205 @@
+import asyncio
 import os
-import tempfile
+import time
+import uuid
 from fastapi import APIRouter, UploadFile, File, HTTPException
-from app.utils.whisper_utils import convert_to_audio, transcribe_audio
-from app.utils.whisper_groq_parser import process_transcript
-from app.controllers.slack_controller import send_groq_summary_to_slack
+from app.config import JOB_UPLOAD_DIR, MAX_MEDIA_UPLOAD_BYTES, VAD_ENABLED
+from app.utils import event_stream, job_store, result_cache, tenant_store, transcription_backends
+from app.utils.caption_parser import CAPTION_EXTENSIONS, read_captions
+from app.utils.log import get_logger, job_id_var
+from app.utils.upload_utils import save_upload
+from app.controllers.creds_controller import get_tenant_or_404
+from app.controllers.history_controller import record_summary
+from app.controllers.job_controller import submit_job
 
 router = APIRouter()
 
+logger = get_logger("jobs")
+
+# Anything ffmpeg can pull an audio stream from, video containers included
+MEDIA_EXTENSIONS = ['mp3', 'wav', 'm4a', 'ogg', 'flac', 'aac', 'mp4', 'webm', 'mov', 'mkv']
+# Already text: parsed directly, never sent through ffmpeg or Whisper
+TEXT_EXTENSIONS = ['txt', 'docx'] + CAPTION_EXTENSIONS
+SUPPORTED_EXTENSIONS = MEDIA_EXTENSIONS + TEXT_EXTENSIONS
+
 @router.post("/transcribe_and_summarize")
-async def transcribe_and_summarize(file: UploadFile = File(...)):
-    tmp_path = None
-    audio_path = None
+async def transcribe_and_summarize(file: UploadFile = File(...), tenant_id: str = None, backend: str = None,
+                                   stream: str = None, admission_ticket=None):
+    stream = event_stream.resolve_format(stream)
+    get_tenant_or_404(tenant_id)
+    tenant_id = tenant_store.resolve(tenant_id)
+    try:
+        backend = transcription_backends.resolve(backend)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Validate file type
+    if not file.filename:
+        raise HTTPException(status_code=400, detail="No file provided")
+
+    file_ext = file.filename.lower().split('.')[-1]
+    if file_ext not in SUPPORTED_EXTENSIONS:
+        raise HTTPException(status_code=400, detail=f"Unsupported file type: {file_ext}")
+
+    # Keep the upload on disk until the job finishes so it survives a restart
+    os.makedirs(JOB_UPLOAD_DIR, exist_ok=True)
+    input_path = os.path.join(JOB_UPLOAD_DIR, f"{uuid.uuid4().hex}.{file_ext}")
+    hasher = result_cache.content_hasher()
+    await save_upload(file, input_path, MAX_MEDIA_UPLOAD_BYTES, hasher)
+
+    # Text uploads never reach a transcription backend, so the same file
+    # shares one job whichever backend was asked for
+    if file_ext in TEXT_EXTENSIONS:
+        backend = None
+    job_id, created = job_store.create_job(
+        "media", file.filename, input_path, file_ext, hasher.hexdigest(), tenant_id, backend
+    )
+    logger.info(
+        "Media upload received",
+        extra={"upload_name": file.filename, "job_id": job_id, "tenant_id": tenant_id, "joined": not created}
+    )
+    if created:
+        # The job keeps its admission cost until it finishes, not just
+        # until this response is sent
+        on_done = None
+        if admission_ticket is not None:
+            admission_ticket.detach()
+            on_done = admission_ticket.release
+        submit_job(job_id, input_path, file_ext, on_done)
+    else:
+        # Identical upload already in progress; share its result
+        os.remove(input_path)
+
+    if stream:
+        return event_stream.response(stream_job_events(job_id), stream)
+    return {
+        "status": "queued",
+        "data": {
+            "job_id": job_id,
+            "status_url": f"/jobs/{job_id}"
+        }
+    }
+
+async def stream_job_events(job_id: str):
+    # Follows the job's event log until it finishes. A job joined by an
+    # identical upload replays from its first event.
+    yield {"type": "job", "job_id": job_id, "status_url": f"/jobs/{job_id}"}
+    after = 0
+    last_sent = time.monotonic()
+    while True:
+        events = await asyncio.to_thread(job_store.list_events, job_id, after)
+        for event in events:
+            after = event["seq"]
+            yield event
+            if event["type"] in ("result", "error"):
+                return
+        if events:
+            last_sent = time.monotonic()
+            continue
+        if time.monotonic() - last_sent >= event_stream.HEARTBEAT_SECONDS:
+            last_sent = time.monotonic()
+            yield {"type": "heartbeat"}
+        await asyncio.sleep(event_stream.POLL_SECONDS)
+
+def read_text_transcript(input_path: str, file_ext: str) -> dict:
+    # Same shape as a Whisper result; only captions carry timestamps
+    if file_ext in CAPTION_EXTENSIONS:
+        segments = read_captions(input_path)
+        return {"text": " ".join(segment["text"] for segment in segments), "segments": segments}
+    if file_ext == "docx":
+        from app.utils.docx_parser import extract_text_from_docx
+        text = extract_text_from_docx(input_path)
+    else:
+        with open(input_path, encoding="utf-8-sig", errors="replace") as f:
+            text = f.read()
+    return {"text": text, "segments": None}
+
+def run_transcription_job(job_id: str, input_path: str, file_ext: str):
+    # Runs inside a job worker process, never on the event loop
+    job = job_store.claim_job(job_id)
+    if job is None:
+        return
+
+    from app.controllers.slack_controller import send_groq_summary_to_slack
+
+    job_id_var.set(job_id)
+    started = time.perf_counter()
+    logger.info("Job started", extra={"file_ext": file_ext})
+    content_hash = job["content_hash"]
+    tenant_id = job["tenant_id"]
+    backend = job["backend"]
+    is_text = file_ext in TEXT_EXTENSIONS
+    stage = "converting" if is_text else "transcribing"
+    lease = job_store.hold_lease(job_id)
     try:
-        # Validate file type
-        if not file.filename:
-            raise HTTPException(status_code=400, detail="No file provided")
-            
-        file_ext = file.filename.lower().split('.')[-1]
-        if file_ext not in ['mp3', 'wav', 'm4a', 'txt', 'docx']:
-            raise HTTPException(status_code=400, detail=f"Unsupported file type: {file_ext}")
-
-        # Save uploaded file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix=f".{file_ext}") as tmp:
-            content = await file.read()
-            if not content:
-                raise HTTPException(status_code=400, detail="Empty file provided")
-            tmp.write(content)
-            tmp_path = tmp.name
-
-        # Step 1: Convert to audio (if needed)
-        if file_ext in ['mp3', 'wav', 'm4a']:
-            audio_path = tmp_path
+        from app.utils.whisper_utils import transcribe_audio_segments
+        from app.utils.whisper_groq_parser import process_transcript, PROMPT_VERSION
+        # vad pulls in numpy, which the web workers never need
+        from app.utils import vad
+
+        versions = ["text"] if is_text else [transcription_backends.cache_version(backend)]
+        if VAD_ENABLED and not is_text:
+            versions.append(vad.cache_version())
+        transcript_key = result_cache.make_key("transcript", content_hash, *versions)
+        summary_key = result_cache.make_key("media-summary", content_hash, *versions, PROMPT_VERSION)
+        summary = result_cache.get(summary_key, "summary")
+        transcription = None if summary or is_text else result_cache.get(transcript_key, "transcript")
+
+        if summary or transcription:
+            job_store.set_stage(job_id, "converting", "skipped", cached=True)
+            job_store.set_stage(job_id, "transcribing", "skipped", cached=True)
+        elif is_text:
+            # Step 1-2: Text-like uploads are read as they are; re-running
+            # this is cheap, so only the summary is cached
+            job_store.set_stage(job_id, stage, "running")
+            transcription = read_text_transcript(input_path, file_ext)
+            if not transcription["text"].strip():
+                raise ValueError(f"No text found in the {file_ext} upload")
+            job_store.set_stage(job_id, stage, "done", text_input=file_ext)
+            job_store.set_stage(job_id, "transcribing", "skipped", text_input=file_ext)
         else:
-            audio_path = convert_to_audio(tmp_path)
+            # Step 1: The Whisper server decodes the upload straight to PCM
+            # as part of transcription, so there is no separate conversion
+            job_store.set_stage(job_id, "converting", "skipped", decoded_in_memory=True)
 
-        # Step 2: Whisper transcription
-        transcript = transcribe_audio(audio_path)
-        if not transcript:
-            raise HTTPException(status_code=500, detail="Failed to transcribe audio")
+            # Step 2: Whisper transcription
+            stage = "transcribing"
+            job_store.set_stage(job_id, stage, "running")
+            transcription = transcribe_audio_segments(
+                input_path,
+                backend=backend,
+                on_segment=lambda segment, progress: job_store.add_event(
+                    job_id, "segment", progress=progress, **segment
+                )
+            )
+            if not transcription["text"]:
+                raise ValueError("Failed to transcribe audio")
+            result_cache.put(transcript_key, "transcript", transcription)
+            job_store.set_stage(
+                job_id, stage, "done",
+                audio_seconds=transcription.get("audio_seconds"),
+                speech_seconds=transcription.get("speech_seconds"),
+                speech_ratio=transcription.get("speech_ratio")
+            )
 
         # Step 3: Groq summarization
-        summary = process_transcript(transcript)
-        if not summary:
-            raise HTTPException(status_code=500, detail="Failed to generate summary")
+        stage = "summarizing"
+        if summary:
+            job_store.set_stage(job_id, stage, "skipped", cached=True)
+        else:
+            job_store.set_stage(job_id, stage, "running")
+            summary = process_transcript(
+                transcription["text"],
+                transcription["segments"],
+                on_event=lambda event_type, **data: job_store.add_event(job_id, event_type, **data)
+            )
+            if not summary:
+                raise ValueError("Failed to generate summary")
+            result_cache.put(summary_key, "summary", summary)
+            job_store.set_stage(job_id, stage, "done")
+
+        record_summary(tenant_id, content_hash, "media", summary)
 
-        # Prepare response
         response_data = {
             "status": "success",
             "data": {
@@ -52,28 +207,24 @@ async def transcribe_and_summarize(file: UploadFile = File(...)):
             }
         }
 
-        # Send to Slack
-        send_groq_summary_to_slack(response_data)
-
-        return response_data
+        # Step 4: Send to Slack
+        stage = "posting"
+        job_store.set_stage(job_id, stage, "running")
+        send_groq_summary_to_slack(response_data, tenant_id)
+        job_store.set_stage(job_id, stage, "done")
 
-    except HTTPException as he:
-        error_data = {
-            "status": "error",
-            "error": str(he.detail)
-        }
-        send_groq_summary_to_slack(error_data)
-        raise he
+        job_store.finish_job(job_id, result=response_data)
+        logger.info("Job completed", extra={"duration_seconds": round(time.perf_counter() - started, 3)})
     except Exception as e:
-        error_data = {
+        logger.error("Job failed", extra={"stage": stage, "error": str(e)})
+        job_store.set_stage(job_id, stage, "failed", error=str(e))
+        job_store.finish_job(job_id, error=f"Processing failed: {str(e)}")
+        send_groq_summary_to_slack({
             "status": "error",
             "error": str(e)
-        }
-        send_groq_summary_to_slack(error_data)
-        raise HTTPException(status_code=500, detail=f"Processing failed: {str(e)}")
+        }, tenant_id)
     finally:
+        lease.set()
         # Cleanup
-        if tmp_path and os.path.exists(tmp_path):
-            os.remove(tmp_path)
-        if audio_path and os.path.exists(audio_path) and audio_path != tmp_path:
-            os.remove(audio_path)
+        if input_path and os.path.exists(input_path):
+            os.remove(input_path)
@@ -0,0 +1,32 @@
+from fastapi import HTTPException
+from app.utils import reminder_store, tenant_store
+from app.controllers.creds_controller import get_tenant_or_404
+from app.controllers.slack_controller import notify_schedule_changed
+
+def create_reminder(channel_id: str, time: str, timezone: str = None, tenant_id: str = None):
+    get_tenant_or_404(tenant_id)
+    tenant_id = tenant_store.resolve(tenant_id)
+    try:
+        reminder_id = reminder_store.upsert_reminder(channel_id, time, timezone, tenant_id=tenant_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    notify_schedule_changed()
+    return {
+        "message": "Reminder scheduled successfully",
+        "reminder": {
+            "id": reminder_id,
+            "tenant_id": tenant_id,
+            "channel_id": channel_id,
+            "time": time,
+            "timezone": timezone
+        }
+    }
+
+def list_reminders(tenant_id: str = None):
+    return {"reminders": reminder_store.list_reminders(tenant_store.resolve(tenant_id))}
+
+def delete_reminder(reminder_id: str, tenant_id: str = None):
+    if not reminder_store.delete_reminder(reminder_id, tenant_store.resolve(tenant_id)):
+        raise HTTPException(status_code=404, detail=f"Reminder not found: {reminder_id}")
+    notify_schedule_changed()
+    return {"message": "Reminder deleted successfully"}
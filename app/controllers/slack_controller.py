@@ -1,12 +1,12 @@
 import os
 from slack_sdk import WebClient
-from slack_bolt import App
-from slack_bolt.adapter.socket_mode import SocketModeHandler
 from dotenv import load_dotenv
-import schedule
+import fcntl
 import threading
-import time
 from datetime import datetime
+from app.config import config, SLACK_API_URL, REMINDER_TIMEZONE, SCHEDULER_LOCK_PATH, SCHEDULER_RESCAN_SECONDS
+from app.utils import reminder_store, slack_outbox, tenant_store
+from app.utils.log import get_logger
 
 load_dotenv()
 
@@ -16,10 +16,34 @@ CHANNEL_ID = os.getenv("SLACK_CHANNEL_ID")
 UPLOAD_LINK = os.getenv("UPLOAD_LINK")
 MEETING_END_TIME = os.getenv("MEETING_END_TIME")
 
-client = WebClient(token=SLACK_BOT_TOKEN)
-app = App(token=SLACK_BOT_TOKEN)
+client = WebClient(token=SLACK_BOT_TOKEN, base_url=SLACK_API_URL)
 
-def send_daily_reminder():
+logger = get_logger("slack")
+
+_schedule_changed = threading.Event()
+
+def _apply_config(bot_config):
+    # Keeps the client and channel in step with /set-credentials, including
+    # changes made through another worker.
+    global client, SLACK_BOT_TOKEN, SLACK_APP_TOKEN, CHANNEL_ID, MEETING_END_TIME
+    if bot_config.bot_token != SLACK_BOT_TOKEN:
+        SLACK_BOT_TOKEN = bot_config.bot_token
+        client = WebClient(token=SLACK_BOT_TOKEN, base_url=SLACK_API_URL)
+    SLACK_APP_TOKEN = bot_config.bot_app_token
+    CHANNEL_ID = bot_config.channel_id
+    MEETING_END_TIME = bot_config.meeting_end_time
+    notify_schedule_changed()
+
+config.subscribe(_apply_config)
+
+def _tenant_channel(tenant_id: str = None):
+    if tenant_store.resolve(tenant_id) == tenant_store.DEFAULT_TENANT:
+        return CHANNEL_ID
+    tenant = tenant_store.get_tenant(tenant_id)
+    return tenant.channel_id if tenant else None
+
+def send_daily_reminder(channel_id: str = None, tenant_id: str = None):
+    config.get_config()
     try:
         current_date = datetime.now().strftime("%B %d, %Y")
         current_time = datetime.now().strftime("%H:%M:%S")
@@ -31,9 +55,9 @@ def send_daily_reminder():
 *Action Required:* Please upload today's standup transcript here:
 {UPLOAD_LINK}
 """
-        response = client.chat_postMessage(
-            channel=CHANNEL_ID,
-            text=message,
+        slack_outbox.enqueue(
+            channel_id or _tenant_channel(tenant_id),
+            message,
             blocks=[
                 {
                     "type": "section",
@@ -42,11 +66,12 @@ def send_daily_reminder():
                         "text": message
                     }
                 }
-            ]
+            ],
+            tenant_id=tenant_id
         )
-        print(f"✅ Daily reminder sent at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        logger.info("Daily reminder queued", extra={"tenant_id": tenant_id, "channel_id": channel_id})
     except Exception as e:
-        print(f"❌ Failed to send daily reminder: {str(e)}")
+        logger.error("Failed to send daily reminder", extra={"tenant_id": tenant_id, "error": str(e)})
 
 #########################
 # def send_test_reminder():
@@ -79,44 +104,72 @@ def send_daily_reminder():
 #         print(f"❌ Failed to send test message: {str(e)}")
 #########################
 
-def send_groq_summary_to_slack(result: dict):
+def send_groq_summary_to_slack(result: dict, tenant_id: str = None):
+    config.get_config()
     try:
+        channel_id = _tenant_channel(tenant_id)
         if result.get("status") == "success" and "data" in result:
             summary = result["data"]["summary"]
-            slack_response = client.chat_postMessage(
-                channel=CHANNEL_ID,
-                text=f"📝 *Team Update Summary:*\n```{summary}```"
+            message_id = slack_outbox.enqueue(
+                channel_id, f"📝 *Team Update Summary:*\n```{summary}```", tenant_id=tenant_id
             )
-            print("✅ Summary sent to Slack:", slack_response["ts"])
+            logger.info("Summary queued for Slack", extra={"tenant_id": tenant_id, "message_id": message_id})
         else:
             error_msg = result.get("error", "Unknown error occurred")
-            client.chat_postMessage(
-                channel=CHANNEL_ID,
-                text=f"⚠️ *Error processing transcript:*\n{error_msg}"
-            )
+            slack_outbox.enqueue(channel_id, f"⚠️ *Error processing transcript:*\n{error_msg}", tenant_id=tenant_id)
     except Exception as e:
-        print("❌ Error sending summary to Slack:", e)
-        client.chat_postMessage(
-            channel=CHANNEL_ID,
-            text=f"⚠️ *Error sending to Slack:*\n{str(e)}"
-        )
+        logger.error("Error queueing summary for Slack", extra={"tenant_id": tenant_id, "error": str(e)})
+
+def notify_schedule_changed():
+    # Wakes the leader in this worker at once; leaders in other workers
+    # re-read the schedules within SCHEDULER_RESCAN_SECONDS.
+    _schedule_changed.set()
 
 def run_schedule():
-    
-    schedule.every().day.at(MEETING_END_TIME).do(send_daily_reminder)
-    
-    # schedule.every(1).minutes.do(send_test_reminder)#########################
-    
-    print(f"✅ Scheduler started with daily reminder at {MEETING_END_TIME}")
     while True:
-        schedule.run_pending()
-        time.sleep(1) 
+        _schedule_changed.clear()
+        config.get_config()
+        now = datetime.now().astimezone()
+        wake_in = SCHEDULER_RESCAN_SECONDS
+        try:
+            for reminder in reminder_store.list_reminders():
+                if not reminder["enabled"]:
+                    continue
+                run_at = reminder_store.next_run(reminder)
+                if run_at <= now:
+                    if reminder_store.claim_due(reminder["id"], run_at.date().isoformat()):
+                        send_daily_reminder(reminder["channel_id"], reminder["tenant_id"])
+                else:
+                    wake_in = min(wake_in, (run_at - now).total_seconds())
+        except Exception:
+            logger.exception("Scheduler error")
+        # Sleep until the next reminder is due or a schedule changes
+        _schedule_changed.wait(timeout=max(wake_in, 0))
+
+def _run_as_leader():
+    # Every worker blocks on the same lock; whichever holds it runs the
+    # scheduler, and another takes over if that worker exits.
+    os.makedirs(os.path.dirname(SCHEDULER_LOCK_PATH) or ".", exist_ok=True)
+    lock_file = open(SCHEDULER_LOCK_PATH, "w")
+    fcntl.flock(lock_file, fcntl.LOCK_EX)
+    logger.info("Scheduler leader elected", extra={"pid": os.getpid()})
+    run_schedule()
 
 def start_scheduler():
-    thread = threading.Thread(target=run_schedule, daemon=True)
+    tenant_store.init_db()
+    reminder_store.init_db()
+    if CHANNEL_ID and MEETING_END_TIME and not reminder_store.list_reminders():
+        reminder_store.upsert_reminder(
+            CHANNEL_ID, MEETING_END_TIME, REMINDER_TIMEZONE, reminder_store.DEFAULT_REMINDER_ID
+        )
+    thread = threading.Thread(target=_run_as_leader, daemon=True)
     thread.start()
-    print("✅ Scheduler thread started")
+    logger.info("Scheduler thread started")
 
 def start_slack_bot():
-    handler = SocketModeHandler(app, SLACK_APP_TOKEN)
+    # Bolt checks the token with Slack when the App is built, so that
+    # happens here rather than when every web worker imports this module
+    from slack_bolt import App
+    from slack_bolt.adapter.socket_mode import SocketModeHandler
+    handler = SocketModeHandler(App(client=client), SLACK_APP_TOKEN)
     handler.start()
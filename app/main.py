@@ -1,13 +1,32 @@
-from fastapi import FastAPI, Body, UploadFile, File, BackgroundTasks
+import time
+import uuid
+from typing import Optional
+from fastapi import FastAPI, Body, UploadFile, File, BackgroundTasks, Header, Query, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from app.config import config
-from app.controllers.groq_controller import process_docx_file
+from fastapi.responses import JSONResponse, Response
+from app.config import (
+    config, MAX_MEDIA_UPLOAD_BYTES, MAX_DOCX_UPLOAD_BYTES, STARTUP_WARMUP, READY_REQUIRES_WHISPER,
+    WHISPER_SERVER_AUTOSTART
+)
+from app.controllers.groq_controller import process_docx_file, stream_docx_file
 from app.controllers.slack_controller import start_scheduler
-from app.controllers.creds_controller import set_credentials, get_credentials
+from app.controllers.creds_controller import authorize_tenant, set_credentials, get_credentials
+from app.controllers.reminder_controller import create_reminder, list_reminders, delete_reminder
 from app.controllers.rec_controller import transcribe_and_summarize
+from app.controllers.history_controller import get_history, get_recurring_blockers, get_person_timeline
+from app.controllers.job_controller import (
+    start_job_workers, stop_job_workers, warm_job_workers, get_job_status, list_job_statuses
+)
+from app.utils.upload_utils import check_content_length
+from app.utils import (
+    admission, event_stream, history_store, llm_client, metrics, readiness, result_cache, slack_outbox, whisper_utils
+)
+from app.utils.log import get_logger, request_id_var
 
 app = FastAPI(title="Bot Backend Server")
 
+logger = get_logger("http")
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -17,31 +36,280 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Probes and scrapes are too frequent to log
+UNLOGGED_PATHS = {"/metrics", "/healthz", "/readyz"}
+
+UPLOAD_LIMITS = {
+    "/upload_media": MAX_MEDIA_UPLOAD_BYTES,
+    "/upload-transcript": MAX_DOCX_UPLOAD_BYTES,
+}
+
+@app.middleware("http")
+async def admission_control(request: Request, call_next):
+    # Registered before limit_upload_size so oversized uploads are refused
+    # without waiting for a slot. The ticket is held until the response
+    # body has been sent, or handed to the job by a media upload.
+    try:
+        ticket = await admission.admit(request.url.path, request.headers.get("content-length"))
+    except admission.Rejected as r:
+        return JSONResponse(
+            status_code=r.status_code,
+            content={"detail": r.detail},
+            headers={"Retry-After": str(r.retry_after)}
+        )
+    if ticket is None:
+        return await call_next(request)
+    request.state.admission = ticket
+    try:
+        response = await call_next(request)
+    except Exception:
+        ticket.release()
+        raise
+    if ticket.detached:
+        return response
+
+    body = response.body_iterator
+
+    async def release_after_body():
+        try:
+            async for chunk in body:
+                yield chunk
+        finally:
+            ticket.release()
+
+    response.body_iterator = release_after_body()
+    return response
+
+@app.middleware("http")
+async def limit_upload_size(request: Request, call_next):
+    max_bytes = UPLOAD_LIMITS.get(request.url.path)
+    if max_bytes is not None:
+        try:
+            check_content_length(request.headers.get("content-length"), max_bytes)
+        except HTTPException as he:
+            return JSONResponse(status_code=he.status_code, content={"detail": he.detail})
+    return await call_next(request)
+
+@app.middleware("http")
+async def log_requests(request: Request, call_next):
+    # Registered last so it wraps every other middleware; tags each log
+    # line written while handling the request with the request id
+    request_id = request.headers.get("x-request-id") or uuid.uuid4().hex
+    token = request_id_var.set(request_id)
+    start = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        response.headers["X-Request-ID"] = request_id
+        return response
+    finally:
+        if request.url.path not in UNLOGGED_PATHS:
+            logger.info("Request handled", extra={
+                "method": request.method,
+                "path": request.url.path,
+                "status": status_code,
+                "duration_ms": round((time.perf_counter() - start) * 1000, 1)
+            })
+        request_id_var.reset(token)
+
 @app.post("/upload_media")
-async def upload_media(file: UploadFile = File(...)):
-    return await transcribe_and_summarize(file)
+async def upload_media(
+    request: Request,
+    file: UploadFile = File(...),
+    tenant_id: Optional[str] = Query(None, description="Team whose Slack workspace receives the summary"),
+    backend: Optional[str] = Query(None, description="Transcription backend: openai-whisper or faster-whisper"),
+    stream: Optional[str] = Query(None, description="Stream job progress as sse or ndjson instead of returning the job id"),
+    x_admin_token: Optional[str] = Header(None),
+    x_tenant_secret: Optional[str] = Header(None)
+):
+    authorize_tenant(tenant_id, x_admin_token, x_tenant_secret)
+    return await transcribe_and_summarize(
+        file, tenant_id, backend, stream, getattr(request.state, "admission", None)
+    )
+
+@app.get("/jobs/{job_id}", tags=["Jobs"])
+def get_job_route(
+    job_id: str,
+    x_admin_token: Optional[str] = Header(None),
+    x_tenant_secret: Optional[str] = Header(None)
+):
+    return get_job_status(job_id, x_admin_token, x_tenant_secret)
+
+@app.get("/jobs", tags=["Jobs"])
+def list_jobs_route(
+    status: Optional[str] = Query(None, description="Filter by status: queued, running, completed or failed"),
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    tenant_id: Optional[str] = Query(None, description="Team to list; omit for the default team, or for every team with X-Admin-Token"),
+    x_admin_token: Optional[str] = Header(None),
+    x_tenant_secret: Optional[str] = Header(None)
+):
+    return list_job_statuses(status, limit, offset, tenant_id, x_admin_token, x_tenant_secret)
+
+@app.get("/history", tags=["History"])
+def history_route(
+    q: Optional[str] = Query(None, description="Words that must all appear in the update"),
+    person: Optional[str] = Query(None),
+    field: Optional[str] = Query(None, description="yesterday, today or blockers; with no q, blockers keeps only reported blockers"),
+    since: Optional[str] = Query(None, description="First meeting date, YYYY-MM-DD"),
+    until: Optional[str] = Query(None, description="Last meeting date, YYYY-MM-DD"),
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    tenant_id: Optional[str] = Query(None),
+    x_admin_token: Optional[str] = Header(None),
+    x_tenant_secret: Optional[str] = Header(None)
+):
+    authorize_tenant(tenant_id, x_admin_token, x_tenant_secret)
+    return get_history(tenant_id, q, person, field, since, until, limit, offset)
+
+@app.get("/history/blockers/recurring", tags=["History"])
+def recurring_blockers_route(
+    person: Optional[str] = Query(None),
+    since: Optional[str] = Query(None, description="First meeting date, YYYY-MM-DD"),
+    until: Optional[str] = Query(None, description="Last meeting date, YYYY-MM-DD"),
+    min_days: int = Query(2, ge=1, description="Standups a similar blocker must appear in"),
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    tenant_id: Optional[str] = Query(None),
+    x_admin_token: Optional[str] = Header(None),
+    x_tenant_secret: Optional[str] = Header(None)
+):
+    authorize_tenant(tenant_id, x_admin_token, x_tenant_secret)
+    return get_recurring_blockers(tenant_id, person, since, until, min_days, limit, offset)
+
+@app.get("/history/people/{person}", tags=["History"])
+def person_timeline_route(
+    person: str,
+    since: Optional[str] = Query(None, description="First meeting date, YYYY-MM-DD"),
+    until: Optional[str] = Query(None, description="Last meeting date, YYYY-MM-DD"),
+    limit: int = Query(100, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    tenant_id: Optional[str] = Query(None),
+    x_admin_token: Optional[str] = Header(None),
+    x_tenant_secret: Optional[str] = Header(None)
+):
+    authorize_tenant(tenant_id, x_admin_token, x_tenant_secret)
+    return get_person_timeline(person, tenant_id, since, until, limit, offset)
+
+@app.get("/healthz", tags=["Health"])
+async def healthz_route():
+    # Liveness: the event loop is serving requests
+    return {"status": "ok"}
+
+@app.get("/readyz", tags=["Health"])
+def readyz_route():
+    # Readiness: warm-up finished and Whisper listening; config problems
+    # are listed in the body without failing the probe
+    result = readiness.status()
+    return JSONResponse(status_code=200 if result["status"] == "ready" else 503, content=result)
+
+@app.get("/cache/stats", tags=["Cache"])
+def cache_stats_route():
+    return result_cache.stats()
+
+@app.get("/metrics", tags=["Metrics"])
+def metrics_route():
+    content, content_type = metrics.render()
+    return Response(content=content, media_type=content_type)
+
+@app.get("/slack/outbox/stats", tags=["Slack"])
+def slack_outbox_stats_route():
+    return slack_outbox.stats()
+
+@app.get("/admission/stats", tags=["Admission"])
+def admission_stats_route():
+    return admission.stats()
 
 @app.post("/set-credentials", tags=["Credentials"])
 def set_creds_route(
     bot_token: str = Body(..., description="Slack Bot User OAuth Token"),
     bot_app_token: str = Body(..., description="Slack App-Level Token"),
     channel_id: str = Body(..., description="Slack Channel ID where messages will be sent"),
-    meeting_end_time: str = Body("09:00", description="Time when the daily meeting ends (24-hour format, e.g., '09:00')")
+    meeting_end_time: str = Body("09:00", description="Time when the daily meeting ends (24-hour format, e.g., '09:00')"),
+    tenant_id: Optional[str] = Body(None, description="Team these settings belong to; omit for the default team"),
+    x_admin_token: Optional[str] = Header(None),
+    x_tenant_secret: Optional[str] = Header(None, description="Returned by a team's first /set-credentials; not used by the default team")
 ):
-    return set_credentials(bot_token, bot_app_token, channel_id, meeting_end_time)
+    return set_credentials(
+        bot_token, bot_app_token, channel_id, meeting_end_time, tenant_id, x_admin_token, x_tenant_secret
+    )
 
 @app.get("/get-credentials", tags=["Credentials"])
-def get_creds_route():
-    return get_credentials()
+def get_creds_route(
+    tenant_id: Optional[str] = Query(None, description="Team to read; omit for the default team"),
+    x_admin_token: Optional[str] = Header(None),
+    x_tenant_secret: Optional[str] = Header(None)
+):
+    return get_credentials(tenant_id, x_admin_token, x_tenant_secret)
+
+@app.post("/reminders", tags=["Reminders"])
+def create_reminder_route(
+    channel_id: str = Body(..., description="Slack Channel ID to remind"),
+    time: str = Body(..., description="Time of the daily reminder (24-hour format, e.g., '09:00')"),
+    timezone: Optional[str] = Body(None, description="IANA timezone, e.g., 'Asia/Kolkata'; defaults to server time"),
+    tenant_id: Optional[str] = Body(None, description="Team whose Slack workspace sends the reminder"),
+    x_admin_token: Optional[str] = Header(None),
+    x_tenant_secret: Optional[str] = Header(None)
+):
+    authorize_tenant(tenant_id, x_admin_token, x_tenant_secret)
+    return create_reminder(channel_id, time, timezone, tenant_id)
+
+@app.get("/reminders", tags=["Reminders"])
+def list_reminders_route(
+    tenant_id: Optional[str] = Query(None, description="Team to list; omit for the default team"),
+    x_admin_token: Optional[str] = Header(None),
+    x_tenant_secret: Optional[str] = Header(None)
+):
+    authorize_tenant(tenant_id, x_admin_token, x_tenant_secret)
+    return list_reminders(tenant_id)
+
+@app.delete("/reminders/{reminder_id}", tags=["Reminders"])
+def delete_reminder_route(
+    reminder_id: str,
+    tenant_id: Optional[str] = Query(None),
+    x_admin_token: Optional[str] = Header(None),
+    x_tenant_secret: Optional[str] = Header(None)
+):
+    authorize_tenant(tenant_id, x_admin_token, x_tenant_secret)
+    return delete_reminder(reminder_id, tenant_id)
 
 @app.post("/upload-transcript", tags=["Transcript"])
-async def upload_transcript(file: UploadFile = File(...), background_tasks: BackgroundTasks = BackgroundTasks()):
-    print("📥 Received file:", file.filename)
-    result = await process_docx_file(file, background_tasks)
-    print("📤 Generated summary:", result)
+async def upload_transcript(
+    file: UploadFile = File(...),
+    background_tasks: BackgroundTasks = BackgroundTasks(),
+    tenant_id: Optional[str] = Query(None, description="Team whose Slack workspace receives the summary"),
+    stream: Optional[str] = Query(None, description="Stream progress and partial summaries as sse or ndjson"),
+    x_admin_token: Optional[str] = Header(None),
+    x_tenant_secret: Optional[str] = Header(None)
+):
+    authorize_tenant(tenant_id, x_admin_token, x_tenant_secret)
+    logger.info("Transcript upload received", extra={"upload_name": file.filename, "tenant_id": tenant_id})
+    stream = event_stream.resolve_format(stream)
+    if stream:
+        return await stream_docx_file(file, background_tasks, tenant_id, stream)
+    result = await process_docx_file(file, background_tasks, tenant_id)
+    logger.info("Transcript summarized", extra={"summary_chars": len(result["data"]["summary"])})
     return result
 
 @app.on_event("startup")
 def startup_event():
+    metrics.cleanup_dead_processes()
+    history_store.init_db()
     start_scheduler()
-    print("✅ Scheduler started")
+    slack_outbox.start_sender()
+    start_job_workers()
+    # Slow steps run after startup returns, so the worker is already
+    # accepting connections (and answering /healthz) while they run
+    warmup = {}
+    if STARTUP_WARMUP:
+        warmup["job_workers"] = warm_job_workers
+        # A server started elsewhere is only checked for by /readyz
+        if READY_REQUIRES_WHISPER and WHISPER_SERVER_AUTOSTART:
+            warmup["whisper_server"] = whisper_utils.ensure_server
+    readiness.start_warmup(warmup)
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    stop_job_workers()
+    await llm_client.close()
@@ -0,0 +1,183 @@
+import asyncio
+import math
+import time
+from collections import deque
+from app.config import (
+    ADMISSION_MEDIA_CAPACITY_SECONDS,
+    ADMISSION_MEDIA_BYTES_PER_SECOND,
+    ADMISSION_MEDIA_QUEUE,
+    ADMISSION_DOCX_CAPACITY_KB,
+    ADMISSION_DOCX_QUEUE,
+    ADMISSION_QUEUE_TIMEOUT_SECONDS,
+)
+from app.utils import metrics
+
+# Cost-weighted admission control for the expensive endpoints. Each lane has
+# a capacity in cost units; a request holds its cost from admission until
+# its ticket is released. Waiters are served in order, except that a cheap
+# request may pass an expensive one that does not fit yet, until that one
+# has waited half the queue timeout.
+
+class Rejected(Exception):
+    def __init__(self, status_code: int, detail: str, retry_after: int):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+class Ticket:
+    def __init__(self, lane, cost: int):
+        self.lane = lane
+        self.cost = cost
+        self.admitted_at = time.monotonic()
+        self.detached = False
+        self._loop = asyncio.get_running_loop()
+        self._released = False
+
+    def detach(self):
+        # The handler keeps the ticket past the response (a media job)
+        self.detached = True
+
+    def release(self):
+        # Safe to call more than once and from any thread, e.g. a job
+        # future's done callback
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._release()
+        else:
+            self._loop.call_soon_threadsafe(self._release)
+
+    def _release(self):
+        if not self._released:
+            self._released = True
+            self.lane._release(self)
+
+class Lane:
+    def __init__(self, name: str, capacity: int, max_queue: int, queue_timeout: float = ADMISSION_QUEUE_TIMEOUT_SECONDS):
+        self.name = name
+        self.capacity = capacity
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.in_use = 0
+        self.running = 0
+        self.admitted = 0
+        self.rejected = {"queue_full": 0, "timeout": 0}
+        # Moving average of how long a ticket is held, for Retry-After
+        self.average_hold = None
+        self._waiters = deque()
+
+    def _update_gauges(self):
+        metrics.ADMISSION_QUEUE_DEPTH.labels(self.name).set(len(self._waiters))
+        metrics.ADMISSION_IN_USE.labels(self.name).set(self.in_use)
+
+    def retry_after(self) -> int:
+        # Roughly how long until the queue ahead of a new request drains
+        hold = self.average_hold or self.queue_timeout
+        seconds = hold * (len(self._waiters) + 1) / max(1, self.running)
+        return max(1, min(600, math.ceil(seconds)))
+
+    def _grant(self, cost: int) -> Ticket:
+        self.in_use += cost
+        self.running += 1
+        self.admitted += 1
+        return Ticket(self, cost)
+
+    def _fits(self, cost: int) -> bool:
+        return self.in_use + cost <= self.capacity
+
+    def _starving(self, waiter) -> bool:
+        return time.monotonic() - waiter[2] >= self.queue_timeout / 2
+
+    def _wake(self):
+        remaining = deque()
+        for waiter in self._waiters:
+            cost, future, _queued_at = waiter
+            if future.done():
+                continue
+            # Nothing may pass a waiter that has already waited too long
+            if not (remaining and self._starving(remaining[0])) and self._fits(cost):
+                future.set_result(self._grant(cost))
+                continue
+            remaining.append(waiter)
+        self._waiters = remaining
+        self._update_gauges()
+
+    def _release(self, ticket: Ticket):
+        self.in_use -= ticket.cost
+        self.running -= 1
+        held = time.monotonic() - ticket.admitted_at
+        self.average_hold = held if self.average_hold is None else 0.8 * self.average_hold + 0.2 * held
+        self._wake()
+
+    def _reject(self, status_code: int, reason: str, detail: str):
+        self.rejected[reason] += 1
+        metrics.ADMISSION_REJECTIONS.labels(self.name, reason).inc()
+        raise Rejected(status_code, detail, self.retry_after())
+
+    async def acquire(self, cost: int) -> Ticket:
+        # Costs above the capacity are capped so any request can run alone
+        cost = max(1, min(int(cost), self.capacity))
+        if self._fits(cost) and not (self._waiters and self._starving(self._waiters[0])):
+            ticket = self._grant(cost)
+            self._update_gauges()
+            return ticket
+        if len(self._waiters) >= self.max_queue:
+            self._reject(429, "queue_full", f"Too many {self.name} requests queued; retry later")
+
+        queued_at = time.monotonic()
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append((cost, future, queued_at))
+        self._update_gauges()
+        try:
+            ticket = await asyncio.wait_for(future, self.queue_timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            self._waiters = deque(w for w in self._waiters if w[1] is not future)
+            self._update_gauges()
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            self._reject(503, "timeout", f"Server is busy with {self.name} requests; retry later")
+        metrics.ADMISSION_WAIT_SECONDS.labels(self.name).observe(time.monotonic() - queued_at)
+        return ticket
+
+    def stats(self) -> dict:
+        return {
+            "capacity": self.capacity,
+            "in_use": self.in_use,
+            "running": self.running,
+            "queued": len(self._waiters),
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "rejected": dict(self.rejected),
+            "average_hold_seconds": round(self.average_hold, 3) if self.average_hold is not None else None,
+        }
+
+def _media_cost(content_length: int) -> int:
+    return math.ceil(content_length / ADMISSION_MEDIA_BYTES_PER_SECOND)
+
+def _docx_cost(content_length: int) -> int:
+    return math.ceil(content_length / 1024)
+
+# path -> (lane, cost from Content-Length)
+LANES = {
+    "/upload_media": (Lane("media", ADMISSION_MEDIA_CAPACITY_SECONDS, ADMISSION_MEDIA_QUEUE), _media_cost),
+    "/upload-transcript": (Lane("transcript", ADMISSION_DOCX_CAPACITY_KB, ADMISSION_DOCX_QUEUE), _docx_cost),
+}
+
+async def admit(path: str, content_length: str):
+    # Returns a Ticket, or None for paths without admission control.
+    # Without a Content-Length the request is weighed as a full lane.
+    entry = LANES.get(path)
+    if entry is None:
+        return None
+    lane, cost_of = entry
+    try:
+        cost = cost_of(int(content_length))
+    except (TypeError, ValueError):
+        cost = lane.capacity
+    return await lane.acquire(cost)
+
+def stats() -> dict:
+    return {lane.name: lane.stats() for lane, _cost_of in LANES.values()}
@@ -0,0 +1,81 @@
+import numpy as np
+
+SAMPLE_RATE = 16000
+FRAME_SECONDS = 0.03
+
+def frame_energy(audio: np.ndarray) -> np.ndarray:
+    frame = int(SAMPLE_RATE * FRAME_SECONDS)
+    count = len(audio) // frame
+    if count == 0:
+        return np.zeros(0, dtype=np.float32)
+    frames = audio[:count * frame].reshape(count, frame)
+    return np.sqrt(np.mean(frames ** 2, axis=1))
+
+# Frames this far above the noise floor count as sound
+NOISE_MARGIN = 10 ** (12 / 20)
+# About -60 dBFS; anything quieter is silence even in a clean recording
+MIN_THRESHOLD = 1e-3
+
+def silence_threshold(energy: np.ndarray) -> float:
+    # Adaptive: 12 dB above the noise floor, taken from the quietest 10% of
+    # frames, so a recording that is mostly silence still has its silence
+    # found. Never below 20 dB under the loudest 10% of frames, which keeps
+    # the pauses inside continuous speech from being cut.
+    if len(energy) == 0:
+        return 0.0
+    floor = float(np.percentile(energy, 10)) * NOISE_MARGIN
+    return max(floor, float(np.percentile(energy, 90)) * 0.1, MIN_THRESHOLD)
+
+def find_silences(audio: np.ndarray, min_silence_seconds: float) -> list:
+    # Returns (start_sample, end_sample) for each run of quiet frames that
+    # lasts at least min_silence_seconds.
+    energy = frame_energy(audio)
+    if len(energy) == 0:
+        return []
+    quiet = energy < silence_threshold(energy)
+    frame = int(SAMPLE_RATE * FRAME_SECONDS)
+    min_frames = max(1, int(min_silence_seconds / FRAME_SECONDS))
+
+    silences = []
+    run_start = None
+    for index, is_quiet in enumerate(np.append(quiet, False)):
+        if is_quiet and run_start is None:
+            run_start = index
+        elif not is_quiet and run_start is not None:
+            if index - run_start >= min_frames:
+                silences.append((run_start * frame, index * frame))
+            run_start = None
+    return silences
+
+def split_on_silence(audio: np.ndarray, target_seconds: float, min_silence_seconds: float) -> list:
+    # Returns (offset_seconds, samples) chunks of roughly target_seconds,
+    # cut in the middle of the silence closest to each target boundary.
+    target = int(target_seconds * SAMPLE_RATE)
+    if len(audio) <= target * 1.5:
+        return [(0.0, audio)]
+
+    cut_points = [(start + end) // 2 for start, end in find_silences(audio, min_silence_seconds)]
+    chunks = []
+    start = 0
+    while len(audio) - start > target * 1.5:
+        ideal = start + target
+        candidates = [p for p in cut_points if start + target // 2 <= p <= start + target * 3 // 2]
+        cut = min(candidates, key=lambda p: abs(p - ideal)) if candidates else ideal
+        chunks.append((start / SAMPLE_RATE, audio[start:cut]))
+        start = cut
+    chunks.append((start / SAMPLE_RATE, audio[start:]))
+    return chunks
+
+def stitch_segments(chunk_results: list) -> dict:
+    # chunk_results: [(offset_seconds, transcribe_result), ...] in audio order
+    segments = []
+    texts = []
+    for offset, result in chunk_results:
+        texts.append(result["text"].strip())
+        for segment in result.get("segments", []):
+            segments.append({
+                "start": round(segment["start"] + offset, 2),
+                "end": round(segment["end"] + offset, 2),
+                "text": segment["text"]
+            })
+    return {"text": " ".join(t for t in texts if t), "segments": segments}
@@ -0,0 +1,44 @@
+import subprocess
+import threading
+import numpy as np
+from app.utils import metrics
+from app.utils.audio_chunker import SAMPLE_RATE
+
+READ_SIZE = 1024 * 1024
+
+def decode_audio(path: str, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    # One ffmpeg process turns any audio or video container into mono
+    # float32 PCM at the model's sample rate, read straight from its stdout.
+    # ffmpeg reads the file itself rather than a pipe so containers that keep
+    # their index at the end (mp4, mov) can still be seeked.
+    command = [
+        "ffmpeg", "-nostdin", "-hide_banner", "-loglevel", "error", "-threads", "0",
+        "-i", path,
+        "-vn", "-ac", "1", "-ar", str(sample_rate), "-f", "f32le", "-"
+    ]
+    with metrics.stage_timer("audio_decode"):
+        try:
+            process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        except FileNotFoundError:
+            raise RuntimeError("ffmpeg is not installed")
+        # Drain stderr alongside stdout so a chatty ffmpeg cannot block on it
+        errors = []
+        drain = threading.Thread(target=lambda: errors.append(process.stderr.read()), daemon=True)
+        drain.start()
+        # A bytearray keeps the samples writable without a second copy
+        buffer = bytearray()
+        while True:
+            chunk = process.stdout.read(READ_SIZE)
+            if not chunk:
+                break
+            buffer += chunk
+        returncode = process.wait()
+        drain.join()
+        error = b"".join(errors).decode(errors="replace").strip()
+        if returncode != 0:
+            raise RuntimeError(f"Failed to decode audio: {error or f'ffmpeg exited with {process.returncode}'}")
+
+    usable = len(buffer) - len(buffer) % 4
+    if usable == 0:
+        raise RuntimeError("No audio stream found in the upload")
+    return np.frombuffer(buffer, dtype=np.float32, count=usable // 4)
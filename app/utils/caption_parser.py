@@ -0,0 +1,53 @@
+import re
+
+# Parsers for the caption files meeting tools export (WebVTT from Zoom,
+# Teams and Meet, SubRip from most recorders). Cues come back in the same
+# shape as Whisper segments, {"start", "end", "text"} with times in seconds,
+# so process_transcript can use their timestamps directly.
+
+CAPTION_EXTENSIONS = ['vtt', 'srt']
+
+# "01:02:03.456 --> 01:02:05.000 align:start"; hours are optional in WebVTT
+# and SubRip uses a comma before the milliseconds
+CUE_TIMING = re.compile(
+    r"^\s*((?:\d+:)?\d{1,2}:\d{2}[.,]\d{1,3})\s*-->\s*((?:\d+:)?\d{1,2}:\d{2}[.,]\d{1,3})"
+)
+# Voice spans (<v Sam>), classes, italics and inline timestamps
+CUE_TAG = re.compile(r"<[^>]*>")
+
+def parse_timestamp(value: str) -> float:
+    seconds = 0.0
+    for part in value.replace(",", ".").split(":"):
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+def _clean(line: str) -> str:
+    line = CUE_TAG.sub("", line)
+    return line.replace("&amp;", "&").replace("&lt;", "<").replace("&gt;", ">").replace("&nbsp;", " ").strip()
+
+def parse_captions(text: str) -> list:
+    # Works for both formats: a cue is its timing line plus the text lines up
+    # to the next blank line. Cue numbers, the WEBVTT header and NOTE/STYLE
+    # blocks have no timing line and are skipped.
+    segments = []
+    current = None
+    for line in text.splitlines():
+        timing = CUE_TIMING.match(line)
+        if timing:
+            current = {
+                "start": parse_timestamp(timing.group(1)),
+                "end": parse_timestamp(timing.group(2)),
+                "text": ""
+            }
+            segments.append(current)
+        elif not line.strip():
+            current = None
+        elif current is not None:
+            cleaned = _clean(line)
+            if cleaned:
+                current["text"] = f"{current['text']} {cleaned}".strip()
+    return [segment for segment in segments if segment["text"]]
+
+def read_captions(path: str) -> list:
+    with open(path, encoding="utf-8-sig", errors="replace") as f:
+        return parse_captions(f.read())
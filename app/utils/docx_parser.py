@@ -1,7 +1,65 @@
-from docx import Document
+import zipfile
 from io import BytesIO
+from xml.etree.ElementTree import iterparse
 
-def extract_text_from_docx(file_bytes):
-    doc = Document(BytesIO(file_bytes))
-    full_text = "\n".join([para.text for para in doc.paragraphs])
-    return full_text
+# Reads the text of a .docx straight from word/document.xml with an
+# incremental parser instead of building python-docx's object model.
+# Every element is dropped from the tree once its end tag is seen, so memory
+# stays bounded by the nesting depth rather than the document size.
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+DOCUMENT_PART = "word/document.xml"
+
+# Run content that stands for a character of its own. Only counted inside
+# a run (w:r): w:tab also defines tab stops under w:pPr/w:tabs.
+SPECIAL_CHARACTERS = {
+    f"{W}tab": "\t",
+    f"{W}br": "\n",
+    f"{W}cr": "\n",
+    f"{W}noBreakHyphen": "-",
+}
+
+def iter_docx_text(source):
+    # Yields the text of each body paragraph and of each table cell in
+    # document order. A cell's paragraphs are joined into one string; a
+    # table nested in a cell is read as part of that cell.
+    if isinstance(source, (bytes, bytearray)):
+        source = BytesIO(source)
+    with zipfile.ZipFile(source) as archive, archive.open(DOCUMENT_PART) as part:
+        stack = []
+        paragraph = []
+        cells = []
+        for event, element in iterparse(part, events=("start", "end")):
+            if event == "start":
+                stack.append(element)
+                if element.tag == f"{W}tc":
+                    cells.append([])
+                continue
+
+            stack.pop()
+            tag = element.tag
+            if tag == f"{W}t":
+                paragraph.append(element.text or "")
+            elif tag in SPECIAL_CHARACTERS and stack and stack[-1].tag == f"{W}r":
+                paragraph.append(SPECIAL_CHARACTERS[tag])
+            elif tag == f"{W}p":
+                text = "".join(paragraph)
+                paragraph = []
+                if cells:
+                    cells[-1].append(text)
+                else:
+                    yield text
+            elif tag == f"{W}tc":
+                text = "\n".join(line for line in cells.pop() if line)
+                if cells:
+                    cells[-1].append(text)
+                elif text:
+                    yield text
+            # Done with this element; detach it so the tree never grows
+            element.clear()
+            if stack:
+                stack[-1].remove(element)
+
+def extract_text_from_docx(source):
+    # Accepts raw bytes, a file path or a binary file object
+    return "\n".join(iter_docx_text(source))
@@ -0,0 +1,48 @@
+import json
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+
+# Streaming responses for upload progress. Events are dicts with a "type"
+# ("job", "stage", "segment", "partial", "summary", "result", "error" or
+# "heartbeat"), written either as server-sent events or as one JSON object
+# per line.
+
+FORMATS = {
+    "sse": "text/event-stream",
+    "ndjson": "application/x-ndjson",
+}
+# Proxies drop connections that stay quiet for too long
+HEARTBEAT_SECONDS = 15
+POLL_SECONDS = 0.25
+
+def resolve_format(stream: str):
+    # None means a plain JSON response
+    if stream is None:
+        return None
+    if stream not in FORMATS:
+        raise HTTPException(status_code=400, detail=f"stream must be one of {', '.join(FORMATS)}")
+    return stream
+
+def format_event(event: dict, fmt: str) -> str:
+    if fmt == "sse":
+        if event["type"] == "heartbeat":
+            return ": heartbeat\n\n"
+        lines = [f"event: {event['type']}"]
+        if "seq" in event:
+            lines.append(f"id: {event['seq']}")
+        lines.append(f"data: {json.dumps(event)}")
+        return "\n".join(lines) + "\n\n"
+    return json.dumps(event) + "\n"
+
+def response(events, fmt: str) -> StreamingResponse:
+    # events is an async iterator of event dicts
+    async def body():
+        async for event in events:
+            yield format_event(event, fmt)
+
+    return StreamingResponse(
+        body(),
+        media_type=FORMATS[fmt],
+        # Stop nginx and similar proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
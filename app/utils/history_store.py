@@ -0,0 +1,236 @@
+import os
+import re
+import sqlite3
+import time
+from app.config import HISTORY_DB_PATH
+from app.utils.summary_chunker import EMPTY_VALUES, parse_summaries
+
+# Every summary's per-person updates, one row per person per standup, with
+# an FTS5 index over the update text. A standup is identified by its
+# tenant and content hash, so re-uploading the same file replaces its rows
+# instead of adding them again.
+
+FIELDS = ["yesterday", "today", "blockers"]
+# Words too common in blockers to tell two of them apart
+STOPWORDS = {
+    "a", "an", "the", "and", "or", "on", "in", "for", "to", "of", "is", "are", "be", "with", "by",
+    "from", "at", "my", "our", "still", "waiting", "blocked", "blocker", "blockers", "need", "needs",
+}
+WORD = re.compile(r"[a-z0-9][a-z0-9._-]*")
+# Raw transcript segments saying there is no blocker, e.g. "blocker none."
+# or "no blockers today"
+NO_BLOCKER = re.compile(
+    r"\bno\s+blockers?\b|\bblockers?\W*(?:none|nothing|nil|n/?a)\b"
+    r"|\bnothing\s+(?:is\s+)?blocking\b|\bnot\s+blocked\b"
+)
+
+def _connect():
+    os.makedirs(os.path.dirname(HISTORY_DB_PATH) or ".", exist_ok=True)
+    conn = sqlite3.connect(HISTORY_DB_PATH, timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    return conn
+
+def init_db():
+    with _connect() as conn:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS standups (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                tenant_id TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                source TEXT NOT NULL,
+                meeting_date TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                UNIQUE (tenant_id, content_hash)
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS updates (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                standup_id INTEGER NOT NULL,
+                tenant_id TEXT NOT NULL,
+                meeting_date TEXT NOT NULL,
+                person TEXT NOT NULL,
+                person_key TEXT NOT NULL,
+                time TEXT,
+                yesterday TEXT,
+                today TEXT,
+                blockers TEXT,
+                has_blocker INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_updates_date ON updates(tenant_id, meeting_date)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_updates_person ON updates(tenant_id, person_key, meeting_date)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_updates_standup ON updates(standup_id)")
+        # External-content index: the text lives once, in updates
+        conn.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS updates_fts USING fts5(
+                yesterday, today, blockers, content='updates', content_rowid='id'
+            )
+        """)
+        # Version 1: rows stored before negated blockers were recognized
+        if conn.execute("PRAGMA user_version").fetchone()[0] < 1:
+            rows = conn.execute("SELECT id, blockers FROM updates WHERE has_blocker = 1").fetchall()
+            conn.executemany(
+                "UPDATE updates SET has_blocker = 0 WHERE id = ?",
+                [(row["id"],) for row in rows if not has_blocker(row["blockers"])]
+            )
+            conn.execute("PRAGMA user_version = 1")
+
+def has_blocker(blockers: str) -> bool:
+    text = (blockers or "").strip().lower()
+    return text not in EMPTY_VALUES and not NO_BLOCKER.search(text)
+
+def _delete_updates(conn, standup_id: int):
+    rows = conn.execute(
+        "SELECT id, yesterday, today, blockers FROM updates WHERE standup_id = ?", (standup_id,)
+    ).fetchall()
+    for row in rows:
+        conn.execute(
+            "INSERT INTO updates_fts (updates_fts, rowid, yesterday, today, blockers) VALUES ('delete', ?, ?, ?, ?)",
+            (row["id"], row["yesterday"], row["today"], row["blockers"])
+        )
+    conn.execute("DELETE FROM updates WHERE standup_id = ?", (standup_id,))
+
+def record_summary(tenant_id: str, content_hash: str, source: str, summary: str, meeting_date: str = None) -> int:
+    # Stores the people in a "{person_name} / time / yesterday / today /
+    # blockers" summary; returns how many were recorded
+    people = parse_summaries(summary)
+    if not people:
+        return 0
+    meeting_date = meeting_date or time.strftime("%Y-%m-%d")
+    now = time.time()
+    with _connect() as conn:
+        row = conn.execute(
+            "SELECT id FROM standups WHERE tenant_id = ? AND content_hash = ?", (tenant_id, content_hash)
+        ).fetchone()
+        if row is None:
+            standup_id = conn.execute(
+                "INSERT INTO standups (tenant_id, content_hash, source, meeting_date, created_at) VALUES (?, ?, ?, ?, ?)",
+                (tenant_id, content_hash, source, meeting_date, now)
+            ).lastrowid
+        else:
+            # Same upload again: keep its original date, refresh its updates
+            standup_id = row["id"]
+            meeting_date = conn.execute(
+                "SELECT meeting_date FROM standups WHERE id = ?", (standup_id,)
+            ).fetchone()["meeting_date"]
+            _delete_updates(conn, standup_id)
+        for person, fields in people:
+            values = {field: fields.get(field) or "none" for field in FIELDS}
+            update_id = conn.execute(
+                "INSERT INTO updates (standup_id, tenant_id, meeting_date, person, person_key, time, yesterday, today, "
+                "blockers, has_blocker) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (standup_id, tenant_id, meeting_date, person, person.casefold(), fields.get("time"),
+                 values["yesterday"], values["today"], values["blockers"],
+                 int(has_blocker(values["blockers"])))
+            ).lastrowid
+            conn.execute(
+                "INSERT INTO updates_fts (rowid, yesterday, today, blockers) VALUES (?, ?, ?, ?)",
+                (update_id, values["yesterday"], values["today"], values["blockers"])
+            )
+    return len(people)
+
+def _match_query(text: str, field: str = None) -> str:
+    # Every word must appear; quoted so user input is never FTS syntax
+    terms = [f'"{word}"' for word in WORD.findall(text.lower())]
+    if not terms:
+        return None
+    query = " ".join(terms)
+    return f"{field} : ({query})" if field else query
+
+def _filters(tenant_id, person=None, since=None, until=None):
+    conditions = ["u.tenant_id = ?"]
+    params = [tenant_id]
+    if person:
+        conditions.append("u.person_key = ?")
+        params.append(person.casefold())
+    if since:
+        conditions.append("u.meeting_date >= ?")
+        params.append(since)
+    if until:
+        conditions.append("u.meeting_date <= ?")
+        params.append(until)
+    return conditions, params
+
+def _row_to_update(row):
+    update = dict(row)
+    update.pop("person_key", None)
+    update.pop("standup_id", None)
+    update["has_blocker"] = bool(update["has_blocker"])
+    return update
+
+def search_updates(tenant_id: str, query: str = None, person: str = None, field: str = None, since: str = None,
+                   until: str = None, limit: int = 50, offset: int = 0, oldest_first: bool = False):
+    # field narrows a text query to one column; without a query,
+    # field="blockers" keeps only updates that reported a blocker
+    conditions, params = _filters(tenant_id, person, since, until)
+    match = _match_query(query, field) if query else None
+    if query and match is None:
+        return []
+    if match:
+        # A subquery rather than a join, so SQLite runs the match once and
+        # walks the date index for the ordering instead of the other way round
+        conditions.append("u.id IN (SELECT rowid FROM updates_fts WHERE updates_fts MATCH ?)")
+        params.append(match)
+    elif field == "blockers":
+        conditions.append("u.has_blocker = 1")
+    order = "ASC" if oldest_first else "DESC"
+    sql = (
+        f"SELECT u.* FROM updates u WHERE {' AND '.join(conditions)} "
+        f"ORDER BY u.meeting_date {order}, u.id {order} LIMIT ? OFFSET ?"
+    )
+    with _connect() as conn:
+        rows = conn.execute(sql, params + [limit, offset]).fetchall()
+    return [_row_to_update(row) for row in rows]
+
+def _keywords(text: str) -> set:
+    return {word for word in WORD.findall(text.lower()) if word not in STOPWORDS}
+
+def recurring_blockers(tenant_id: str, person: str = None, since: str = None, until: str = None,
+                       min_days: int = 2, similarity: float = 0.5, limit: int = 50, offset: int = 0):
+    # Groups each person's blockers whose keywords overlap by at least
+    # `similarity` (Jaccard) and returns the groups seen on min_days or
+    # more distinct standups, most frequent first
+    conditions, params = _filters(tenant_id, person, since, until)
+    conditions.append("u.has_blocker = 1")
+    sql = (
+        f"SELECT u.person, u.person_key, u.meeting_date, u.blockers FROM updates u "
+        f"WHERE {' AND '.join(conditions)} ORDER BY u.person_key, u.meeting_date, u.id"
+    )
+    with _connect() as conn:
+        rows = conn.execute(sql, params).fetchall()
+
+    groups = []
+    by_person = {}
+    for row in rows:
+        keywords = _keywords(row["blockers"])
+        candidates = by_person.setdefault(row["person_key"], [])
+        for group in candidates:
+            union = group["keywords"] | keywords
+            if union and len(group["keywords"] & keywords) / len(union) >= similarity:
+                break
+        else:
+            group = {"person": row["person"], "keywords": keywords, "dates": [], "mentions": []}
+            candidates.append(group)
+            groups.append(group)
+        if row["meeting_date"] not in group["dates"]:
+            group["dates"].append(row["meeting_date"])
+        group["mentions"].append(row["blockers"])
+
+    recurring = [
+        {
+            "person": group["person"],
+            "blocker": group["mentions"][-1],
+            "days": len(group["dates"]),
+            "first_seen": group["dates"][0],
+            "last_seen": group["dates"][-1],
+            "dates": group["dates"],
+            "keywords": sorted(group["keywords"]),
+        }
+        for group in groups
+        if len(group["dates"]) >= min_days
+    ]
+    recurring.sort(key=lambda item: item["last_seen"], reverse=True)
+    recurring.sort(key=lambda item: item["days"], reverse=True)
+    return recurring[offset:offset + limit]
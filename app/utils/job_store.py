@@ -0,0 +1,283 @@
+import os
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from app.config import JOB_DB_PATH, JOB_EVENT_RETENTION_SECONDS, JOB_HEARTBEAT_SECONDS, JOB_LEASE_SECONDS
+from app.utils import metrics
+
+STAGES = ["uploaded", "converting", "transcribing", "summarizing", "posting"]
+
+def _connect():
+    os.makedirs(os.path.dirname(JOB_DB_PATH) or ".", exist_ok=True)
+    conn = sqlite3.connect(JOB_DB_PATH, timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    return conn
+
+def init_db():
+    with _connect() as conn:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                status TEXT NOT NULL,
+                stage TEXT,
+                stages TEXT NOT NULL,
+                filename TEXT,
+                input_path TEXT,
+                file_ext TEXT,
+                content_hash TEXT,
+                tenant_id TEXT NOT NULL DEFAULT 'default',
+                backend TEXT,
+                result TEXT,
+                error TEXT,
+                worker_pid INTEGER,
+                heartbeat_at REAL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        columns = [row["name"] for row in conn.execute("PRAGMA table_info(jobs)")]
+        if "content_hash" not in columns:
+            conn.execute("ALTER TABLE jobs ADD COLUMN content_hash TEXT")
+        if "tenant_id" not in columns:
+            conn.execute("ALTER TABLE jobs ADD COLUMN tenant_id TEXT NOT NULL DEFAULT 'default'")
+        if "backend" not in columns:
+            conn.execute("ALTER TABLE jobs ADD COLUMN backend TEXT")
+        if "heartbeat_at" not in columns:
+            conn.execute("ALTER TABLE jobs ADD COLUMN heartbeat_at REAL")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_content_hash ON jobs(content_hash)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_created ON jobs(created_at)")
+        # Append-only progress log a client can stream while the job runs,
+        # from whichever web worker it is connected to
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS job_events (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_id TEXT NOT NULL,
+                type TEXT NOT NULL,
+                data TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_job_events_job ON job_events(job_id, seq)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_job_events_created ON job_events(created_at)")
+
+def _row_to_job(row):
+    if row is None:
+        return None
+    job = dict(row)
+    job["stages"] = json.loads(job["stages"])
+    job["result"] = json.loads(job["result"]) if job["result"] else None
+    job.pop("input_path", None)
+    job.pop("worker_pid", None)
+    job.pop("heartbeat_at", None)
+    job.pop("content_hash", None)
+    return job
+
+def _add_event(conn, job_id: str, event_type: str, data: dict, now: float):
+    conn.execute(
+        "INSERT INTO job_events (job_id, type, data, created_at) VALUES (?, ?, ?, ?)",
+        (job_id, event_type, json.dumps(data), now)
+    )
+
+def add_event(job_id: str, event_type: str, **data):
+    with _connect() as conn:
+        _add_event(conn, job_id, event_type, data, time.time())
+
+def list_events(job_id: str, after: int = 0, limit: int = 500):
+    # Events with seq greater than after, oldest first
+    with _connect() as conn:
+        rows = conn.execute(
+            "SELECT seq, type, data, created_at FROM job_events WHERE job_id = ? AND seq > ? ORDER BY seq LIMIT ?",
+            (job_id, after, limit)
+        ).fetchall()
+    return [
+        {"seq": row["seq"], "type": row["type"], "created_at": row["created_at"], **json.loads(row["data"])}
+        for row in rows
+    ]
+
+def create_job(kind: str, filename: str, input_path: str, file_ext: str, content_hash: str = None,
+               tenant_id: str = "default", backend: str = None):
+    # Returns (job_id, created). An upload whose content matches a job that
+    # is still queued or running for the same tenant and backend joins that
+    # job instead of starting another.
+    job_id = uuid.uuid4().hex
+    now = time.time()
+    stages = {stage: {"status": "pending"} for stage in STAGES}
+    stages["uploaded"] = {"status": "done", "started_at": now, "finished_at": now}
+    conn = _connect()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        if content_hash:
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE content_hash = ? AND kind = ? AND tenant_id = ? "
+                "AND backend IS ? AND status IN ('queued', 'running')",
+                (content_hash, kind, tenant_id, backend)
+            ).fetchone()
+            if row is not None:
+                conn.execute("COMMIT")
+                return row["id"], False
+        conn.execute(
+            "INSERT INTO jobs (id, kind, status, stage, stages, filename, input_path, file_ext, content_hash, tenant_id, "
+            "backend, created_at, updated_at) VALUES (?, ?, 'queued', 'uploaded', ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (job_id, kind, json.dumps(stages), filename, input_path, file_ext, content_hash, tenant_id, backend,
+             now, now)
+        )
+        _add_event(conn, job_id, "stage", {"stage": "uploaded", "status": "done"}, now)
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+    return job_id, True
+
+def claim_job(job_id: str):
+    # Atomic queued -> running transition so a job is only picked up once,
+    # even when several web workers re-submit the same queued jobs on boot.
+    now = time.time()
+    with _connect() as conn:
+        cur = conn.execute(
+            "UPDATE jobs SET status = 'running', worker_pid = ?, heartbeat_at = ?, updated_at = ? "
+            "WHERE id = ? AND status = 'queued'",
+            (os.getpid(), now, now, job_id)
+        )
+        if cur.rowcount == 0:
+            return None
+        row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(row)
+
+def set_stage(job_id: str, stage: str, status: str, **extra):
+    now = time.time()
+    with _connect() as conn:
+        row = conn.execute("SELECT stages FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return
+        stages = json.loads(row["stages"])
+        entry = stages.get(stage, {})
+        entry["status"] = status
+        if status == "running":
+            entry["started_at"] = now
+        elif status in ("done", "failed", "skipped"):
+            entry["finished_at"] = now
+        entry.update(extra)
+        stages[stage] = entry
+        if status in ("done", "failed") and "started_at" in entry:
+            metrics.observe_stage(stage, now - entry["started_at"])
+        if status == "failed":
+            metrics.STAGE_ERRORS.labels(stage).inc()
+        conn.execute(
+            "UPDATE jobs SET stage = ?, stages = ?, updated_at = ? WHERE id = ?",
+            (stage, json.dumps(stages), now, job_id)
+        )
+        _add_event(conn, job_id, "stage", {"stage": stage, "status": status, **extra}, now)
+
+def finish_job(job_id: str, result: dict = None, error: str = None):
+    status = "failed" if error else "completed"
+    now = time.time()
+    with _connect() as conn:
+        conn.execute(
+            "UPDATE jobs SET status = ?, result = ?, error = ?, updated_at = ? WHERE id = ?",
+            (status, json.dumps(result) if result is not None else None, error, now, job_id)
+        )
+        _add_event(conn, job_id, "error" if error else "result", {"error": error} if error else result, now)
+        _prune_events(conn, now)
+
+def _prune_events(conn, now: float) -> int:
+    # Drops the events of jobs that finished more than the retention window
+    # ago; the job row and its result stay. A job's events are all older
+    # than its finish, so the created_at index bounds the scan to events
+    # past the window.
+    cutoff = now - JOB_EVENT_RETENTION_SECONDS
+    cursor = conn.execute(
+        "DELETE FROM job_events WHERE created_at < ? AND EXISTS ("
+        "SELECT 1 FROM jobs WHERE jobs.id = job_events.job_id "
+        "AND jobs.status IN ('completed', 'failed') AND jobs.updated_at < ?)",
+        (cutoff, cutoff)
+    )
+    return cursor.rowcount
+
+def get_job(job_id: str):
+    with _connect() as conn:
+        row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    return _row_to_job(row)
+
+def list_jobs(status: str = None, limit: int = 50, offset: int = 0, tenant_id: str = None):
+    query = "SELECT * FROM jobs"
+    conditions = []
+    params = []
+    if status:
+        conditions.append("status = ?")
+        params.append(status)
+    if tenant_id:
+        conditions.append("tenant_id = ?")
+        params.append(tenant_id)
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += " ORDER BY created_at DESC LIMIT ? OFFSET ?"
+    params.extend([limit, offset])
+    with _connect() as conn:
+        rows = conn.execute(query, params).fetchall()
+    return [_row_to_job(row) for row in rows]
+
+def renew_lease(job_id: str) -> bool:
+    # False once the job is no longer running in this process
+    with _connect() as conn:
+        cur = conn.execute(
+            "UPDATE jobs SET heartbeat_at = ? WHERE id = ? AND status = 'running' AND worker_pid = ?",
+            (time.time(), job_id, os.getpid())
+        )
+    return cur.rowcount == 1
+
+def hold_lease(job_id: str) -> threading.Event:
+    # Renews the job's lease from a daemon thread until the returned event
+    # is set. A pid alone cannot tell whether the worker still exists: pids
+    # restart from 1 in a new container and may belong to another process.
+    stop = threading.Event()
+
+    def renew():
+        while not stop.wait(JOB_HEARTBEAT_SECONDS):
+            try:
+                if not renew_lease(job_id):
+                    return
+            except sqlite3.Error:
+                pass
+
+    threading.Thread(target=renew, daemon=True, name=f"lease-{job_id}").start()
+    return stop
+
+def requeue_expired():
+    # Puts running jobs whose lease ran out back in the queue and returns
+    # the ones this call requeued, so only one web worker re-submits each
+    now = time.time()
+    requeued = []
+    with _connect() as conn:
+        rows = conn.execute(
+            "SELECT id, input_path, file_ext FROM jobs WHERE status = 'running' "
+            "AND (heartbeat_at IS NULL OR heartbeat_at < ?) ORDER BY created_at",
+            (now - JOB_LEASE_SECONDS,)
+        ).fetchall()
+        for row in rows:
+            cur = conn.execute(
+                "UPDATE jobs SET status = 'queued', worker_pid = NULL, heartbeat_at = NULL, updated_at = ? "
+                "WHERE id = ? AND status = 'running' AND (heartbeat_at IS NULL OR heartbeat_at < ?)",
+                (now, row["id"], now - JOB_LEASE_SECONDS)
+            )
+            if cur.rowcount == 1:
+                requeued.append(dict(row))
+    return requeued
+
+def recover_jobs():
+    # Jobs whose worker stopped renewing their lease are put back in the
+    # queue; returns every queued job so it can be re-submitted.
+    with _connect() as conn:
+        _prune_events(conn, time.time())
+    requeue_expired()
+    with _connect() as conn:
+        rows = conn.execute(
+            "SELECT id, input_path, file_ext FROM jobs WHERE status = 'queued' ORDER BY created_at"
+        ).fetchall()
+    return [dict(row) for row in rows]
@@ -0,0 +1,152 @@
+import os
+import asyncio
+import random
+import threading
+import time
+import httpx
+from app.config import (
+    config,
+    GROQ_BASE_URL,
+    LLM_MAX_CONCURRENCY,
+    LLM_TIMEOUT_SECONDS,
+    LLM_MAX_RETRIES,
+    LLM_BACKOFF_SECONDS,
+)
+from app.utils import metrics
+from app.utils.log import get_logger
+
+# Shared client for the Groq chat completions API (or any OpenAI-compatible
+# stand-in at GROQ_BASE_URL). One pooled keep-alive connection set and one
+# concurrency limit per event loop; sync callers share a background loop.
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+logger = get_logger("llm")
+
+class LLMError(Exception):
+    pass
+
+class LLMTimeoutError(LLMError):
+    pass
+
+_state = {}
+_state_lock = threading.Lock()
+_sync_loop = None
+_api_key = os.getenv("GROQ_API_KEY")
+
+def _apply_config(bot_config):
+    # A .env reload may have brought a new GROQ_API_KEY into the environment
+    global _api_key
+    _api_key = os.getenv("GROQ_API_KEY")
+
+config.subscribe(_apply_config)
+
+def _get_state():
+    loop = asyncio.get_running_loop()
+    state = _state.get(loop)
+    if state is None:
+        state = {
+            "client": httpx.AsyncClient(
+                base_url=GROQ_BASE_URL,
+                timeout=LLM_TIMEOUT_SECONDS,
+                limits=httpx.Limits(max_connections=LLM_MAX_CONCURRENCY, max_keepalive_connections=LLM_MAX_CONCURRENCY)
+            ),
+            "semaphore": asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+        }
+        _state[loop] = state
+    return state
+
+def _retry_delay(attempt: int, response=None) -> float:
+    if response is not None:
+        retry_after = response.headers.get("retry-after")
+        if retry_after:
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                pass
+    return LLM_BACKOFF_SECONDS * (2 ** attempt) * (0.5 + random.random() / 2)
+
+async def chat_completion(prompt: str, model: str, max_tokens: int, timeout: float = None, **params) -> str:
+    config.get_config()
+    api_key = _api_key
+    if not api_key:
+        raise LLMError("GROQ_API_KEY environment variable is not set")
+
+    payload = {
+        "model": model,
+        "messages": [{"role": "user", "content": prompt}],
+        "max_tokens": max_tokens,
+        **params
+    }
+    headers = {"Authorization": f"Bearer {api_key}"}
+    state = _get_state()
+    start = time.perf_counter()
+    outcome = "error"
+
+    try:
+        for attempt in range(LLM_MAX_RETRIES + 1):
+            response = None
+            try:
+                async with state["semaphore"]:
+                    response = await state["client"].post(
+                        "/chat/completions",
+                        json=payload,
+                        headers=headers,
+                        timeout=timeout or LLM_TIMEOUT_SECONDS
+                    )
+                if response.status_code not in RETRY_STATUS_CODES:
+                    response.raise_for_status()
+                    break
+                error = LLMError(f"Groq API returned {response.status_code}")
+            except httpx.TimeoutException:
+                error = LLMTimeoutError("Groq API request timed out")
+            except httpx.HTTPStatusError as e:
+                raise LLMError(f"Groq API request failed: {str(e)}")
+            except httpx.HTTPError as e:
+                error = LLMError(f"Groq API request failed: {str(e)}")
+
+            if attempt == LLM_MAX_RETRIES:
+                if isinstance(error, LLMTimeoutError):
+                    outcome = "timeout"
+                raise error
+            delay = _retry_delay(attempt, response)
+            logger.warning(
+                "Retrying Groq request",
+                extra={"model": model, "attempt": attempt + 1, "delay": round(delay, 3), "error": str(error)}
+            )
+            await asyncio.sleep(delay)
+
+        try:
+            result = response.json()
+            content = result["choices"][0]["message"]["content"].strip()
+        except (KeyError, IndexError, TypeError, ValueError) as e:
+            raise LLMError(f"Failed to parse Groq API response: {str(e)}")
+
+        usage = result.get("usage") or {}
+        metrics.LLM_TOKENS.labels(model, "in").inc(usage.get("prompt_tokens", 0))
+        metrics.LLM_TOKENS.labels(model, "out").inc(usage.get("completion_tokens", 0))
+        outcome = "success"
+        return content
+    finally:
+        metrics.LLM_SECONDS.labels(model, outcome).observe(time.perf_counter() - start)
+
+def _get_sync_loop():
+    global _sync_loop
+    with _state_lock:
+        if _sync_loop is None:
+            _sync_loop = asyncio.new_event_loop()
+            threading.Thread(target=_sync_loop.run_forever, daemon=True).start()
+    return _sync_loop
+
+def chat_completion_sync(prompt: str, model: str, max_tokens: int, timeout: float = None, **params) -> str:
+    # For code that runs outside the event loop (job workers, scripts)
+    future = asyncio.run_coroutine_threadsafe(
+        chat_completion(prompt, model, max_tokens, timeout, **params),
+        _get_sync_loop()
+    )
+    return future.result()
+
+async def close():
+    state = _state.pop(asyncio.get_running_loop(), None)
+    if state is not None:
+        await state["client"].aclose()
@@ -0,0 +1,71 @@
+import contextvars
+import json
+import logging
+import sys
+import time
+from app.config import LOG_LEVEL, LOG_FORMAT
+
+# Structured logging. Every record carries the request or job it belongs
+# to (set through the context variables below) plus any fields passed with
+# extra=..., rendered as one JSON object per line or as key=value text.
+
+request_id_var = contextvars.ContextVar("request_id", default=None)
+job_id_var = contextvars.ContextVar("job_id", default=None)
+
+# Attributes every LogRecord has; anything else came in through extra=
+_STANDARD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+def _fields(record):
+    fields = {}
+    request_id = request_id_var.get()
+    job_id = job_id_var.get()
+    if request_id:
+        fields["request_id"] = request_id
+    if job_id:
+        fields["job_id"] = job_id
+    for key, value in vars(record).items():
+        if key not in _STANDARD_ATTRS and not key.startswith("_"):
+            fields[key] = value
+    return fields
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "msg": record.getMessage(),
+            **_fields(record),
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+class TextFormatter(logging.Formatter):
+    def format(self, record):
+        fields = " ".join(f"{key}={value}" for key, value in _fields(record).items())
+        line = f"{self.formatTime(record)} {record.levelname:<7} {record.name}: {record.getMessage()}"
+        if fields:
+            line += f" {fields}"
+        if record.exc_info:
+            line += "\n" + self.formatException(record.exc_info)
+        return line
+
+_configured = False
+
+def setup_logging():
+    # Idempotent; runs in the web workers, job workers and the Whisper server
+    global _configured
+    if _configured:
+        return
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(JsonFormatter() if LOG_FORMAT == "json" else TextFormatter())
+    logger = logging.getLogger("clover")
+    logger.addHandler(handler)
+    logger.setLevel(LOG_LEVEL.upper())
+    logger.propagate = False
+    _configured = True
+
+def get_logger(name: str) -> logging.Logger:
+    setup_logging()
+    return logging.getLogger(f"clover.{name}")
@@ -0,0 +1,128 @@
+import os
+import glob
+import time
+from contextlib import contextmanager
+from app.config import METRICS_DIR
+
+# Prometheus metrics shared by the web workers, job workers and the Whisper
+# server. prometheus_client's multiprocess mode keeps each process's values
+# in METRICS_DIR and /metrics aggregates them, so the variable must be set
+# before prometheus_client is first imported in any process.
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", METRICS_DIR)
+os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+
+from prometheus_client import (  # noqa: E402
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+# Seconds to tens of minutes: Groq calls and Slack posts sit at the low end,
+# Whisper inference on long recordings at the high end.
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1200)
+
+STAGE_SECONDS = Histogram(
+    "clover_stage_duration_seconds",
+    "Time spent in each pipeline stage",
+    ["stage"],
+    buckets=STAGE_BUCKETS,
+)
+STAGE_ERRORS = Counter(
+    "clover_stage_errors_total",
+    "Pipeline stages that raised an error",
+    ["stage"],
+)
+LLM_SECONDS = Histogram(
+    "clover_llm_request_duration_seconds",
+    "Groq chat completion calls, including retries",
+    ["model", "outcome"],
+    buckets=STAGE_BUCKETS,
+)
+LLM_TOKENS = Counter(
+    "clover_llm_tokens_total",
+    "Tokens reported by the Groq API",
+    ["model", "direction"],
+)
+SPEECH_RATIO = Histogram(
+    "clover_speech_ratio",
+    "Share of each recording the voice-activity pre-pass kept for transcription",
+    buckets=(0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0),
+)
+CACHE_REQUESTS = Counter(
+    "clover_cache_requests_total",
+    "Result cache lookups",
+    ["kind", "result"],
+)
+
+# Admission control; gauges are summed over the live web workers
+ADMISSION_QUEUE_DEPTH = Gauge(
+    "clover_admission_queue_depth",
+    "Requests waiting for admission",
+    ["lane"],
+    multiprocess_mode="livesum",
+)
+ADMISSION_IN_USE = Gauge(
+    "clover_admission_in_use",
+    "Admitted cost currently held (audio seconds for media, KB for transcripts)",
+    ["lane"],
+    multiprocess_mode="livesum",
+)
+ADMISSION_REJECTIONS = Counter(
+    "clover_admission_rejections_total",
+    "Requests turned away by admission control",
+    ["lane", "reason"],
+)
+ADMISSION_WAIT_SECONDS = Histogram(
+    "clover_admission_wait_seconds",
+    "Time admitted requests spent queued",
+    ["lane"],
+    buckets=STAGE_BUCKETS,
+)
+
+@contextmanager
+def stage_timer(stage: str):
+    # Observes the duration of the block and counts it as an error if it raises
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        STAGE_ERRORS.labels(stage).inc()
+        raise
+    finally:
+        STAGE_SECONDS.labels(stage).observe(time.perf_counter() - start)
+
+def observe_stage(stage: str, seconds: float):
+    STAGE_SECONDS.labels(stage).observe(seconds)
+
+def render():
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def cleanup_dead_processes():
+    # Drops the files of processes that have exited (previous runs, job
+    # workers that were replaced) so the directory does not grow forever.
+    # Their counters disappear, which Prometheus treats as a counter reset.
+    for path in glob.glob(os.path.join(os.environ["PROMETHEUS_MULTIPROC_DIR"], "*.db")):
+        try:
+            pid = int(os.path.basename(path).rsplit("_", 1)[-1].split(".")[0])
+        except ValueError:
+            continue
+        if not _pid_alive(pid):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,87 @@
+import os
+import threading
+import time
+from app.config import (
+    config,
+    READY_REQUIRES_WHISPER,
+    TRANSCRIBE_BACKEND,
+    TRANSCRIBE_BACKENDS,
+    WHISPER_MODEL_SIZE,
+    WHISPER_MODEL_SIZES,
+)
+from app.utils import metrics, tenant_store, whisper_utils
+from app.utils.log import get_logger
+
+# State behind /readyz. Warm-up steps run in background threads after
+# startup so the worker serves /healthz at once; it is ready when every
+# step has finished and, unless READY_REQUIRES_WHISPER is off, the Whisper
+# server is listening. Configuration problems are reported but do not
+# hold readiness back: credentials are often set at runtime through
+# /set-credentials, which needs the service to be receiving traffic.
+
+logger = get_logger("readiness")
+
+_steps = {}
+_lock = threading.Lock()
+_started_at = time.monotonic()
+
+def _set_step(name: str, **fields):
+    with _lock:
+        _steps[name] = {**_steps.get(name, {}), **fields}
+
+def _run_step(name: str, func):
+    start = time.perf_counter()
+    _set_step(name, status="running")
+    try:
+        func()
+    except Exception as e:
+        seconds = time.perf_counter() - start
+        _set_step(name, status="failed", error=str(e), seconds=round(seconds, 3))
+        logger.error("Warm-up step failed", extra={"step": name, "error": str(e)})
+        return
+    seconds = time.perf_counter() - start
+    metrics.observe_stage(f"warmup_{name}", seconds)
+    _set_step(name, status="done", seconds=round(seconds, 3))
+    logger.info("Warm-up step done", extra={"step": name, "seconds": round(seconds, 3)})
+
+def start_warmup(steps: dict):
+    # steps maps a name to a function run once in its own daemon thread
+    for name in steps:
+        _set_step(name, status="pending", error=None, seconds=None)
+    for name, func in steps.items():
+        threading.Thread(target=_run_step, args=(name, func), daemon=True, name=f"warmup-{name}").start()
+
+def config_problems() -> list:
+    # Settings that would make every upload of some kind fail
+    bot_config = config.get_config()
+    problems = []
+    if not os.getenv("GROQ_API_KEY"):
+        problems.append("GROQ_API_KEY is not set")
+    if TRANSCRIBE_BACKEND not in TRANSCRIBE_BACKENDS:
+        problems.append(f"TRANSCRIBE_BACKEND must be one of {', '.join(TRANSCRIBE_BACKENDS)}")
+    if TRANSCRIBE_BACKEND == "openai-whisper" and WHISPER_MODEL_SIZE not in WHISPER_MODEL_SIZES:
+        problems.append(f"WHISPER_MODEL_SIZE must be one of {', '.join(WHISPER_MODEL_SIZES)}")
+    # The default team may be left unset when teams are configured separately
+    if not bot_config.bot_token and len(tenant_store.list_tenants()) <= 1:
+        problems.append("No Slack bot token configured")
+    return problems
+
+def status() -> dict:
+    with _lock:
+        steps = {name: dict(step) for name, step in _steps.items()}
+    checks = {"warmup": steps}
+    try:
+        problems = config_problems()
+    except Exception as e:
+        problems = [f"Configuration check failed: {e}"]
+    checks["config"] = {"status": "ok" if not problems else "invalid", "problems": problems}
+    ready = all(step["status"] == "done" for step in steps.values())
+    if READY_REQUIRES_WHISPER:
+        listening = whisper_utils.server_ready()
+        checks["whisper_server"] = {"status": "listening" if listening else "down"}
+        ready = ready and listening
+    return {
+        "status": "ready" if ready else "not_ready",
+        "uptime_seconds": round(time.monotonic() - _started_at, 3),
+        "checks": checks,
+    }
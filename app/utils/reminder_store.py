@@ -0,0 +1,107 @@
+import os
+import sqlite3
+import time
+import uuid
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+from app.config import REMINDER_DB_PATH
+
+DEFAULT_REMINDER_ID = "default"
+# A reminder missed by less than this (e.g. during a leader handover) is still sent
+MISSED_GRACE = timedelta(minutes=5)
+
+def _connect():
+    os.makedirs(os.path.dirname(REMINDER_DB_PATH) or ".", exist_ok=True)
+    conn = sqlite3.connect(REMINDER_DB_PATH, timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    return conn
+
+def init_db():
+    with _connect() as conn:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS reminders (
+                id TEXT PRIMARY KEY,
+                tenant_id TEXT NOT NULL DEFAULT 'default',
+                channel_id TEXT NOT NULL,
+                time TEXT NOT NULL,
+                timezone TEXT,
+                enabled INTEGER NOT NULL DEFAULT 1,
+                last_sent_on TEXT,
+                updated_at REAL NOT NULL
+            )
+        """)
+        columns = [row["name"] for row in conn.execute("PRAGMA table_info(reminders)")]
+        if "tenant_id" not in columns:
+            conn.execute("ALTER TABLE reminders ADD COLUMN tenant_id TEXT NOT NULL DEFAULT 'default'")
+
+def validate(time_of_day: str, timezone: str = None):
+    try:
+        datetime.strptime(time_of_day, "%H:%M")
+    except (TypeError, ValueError):
+        raise ValueError("time must be in 24-hour HH:MM format")
+    if timezone:
+        try:
+            ZoneInfo(timezone)
+        except Exception:
+            raise ValueError(f"Unknown timezone: {timezone}")
+
+def default_reminder_id(tenant_id: str = None) -> str:
+    # The reminder kept in sync with a tenant's meeting_end_time
+    if not tenant_id or tenant_id == "default":
+        return DEFAULT_REMINDER_ID
+    return f"{DEFAULT_REMINDER_ID}:{tenant_id}"
+
+def upsert_reminder(channel_id: str, time_of_day: str, timezone: str = None, reminder_id: str = None,
+                    tenant_id: str = None) -> str:
+    validate(time_of_day, timezone)
+    reminder_id = reminder_id or uuid.uuid4().hex
+    with _connect() as conn:
+        conn.execute(
+            "INSERT INTO reminders (id, tenant_id, channel_id, time, timezone, updated_at) VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET channel_id = excluded.channel_id, time = excluded.time, "
+            "timezone = excluded.timezone, updated_at = excluded.updated_at",
+            (reminder_id, tenant_id or "default", channel_id, time_of_day, timezone, time.time())
+        )
+    return reminder_id
+
+def delete_reminder(reminder_id: str, tenant_id: str = None) -> bool:
+    with _connect() as conn:
+        if tenant_id is None:
+            return conn.execute("DELETE FROM reminders WHERE id = ?", (reminder_id,)).rowcount > 0
+        return conn.execute(
+            "DELETE FROM reminders WHERE id = ? AND tenant_id = ?", (reminder_id, tenant_id)
+        ).rowcount > 0
+
+def list_reminders(tenant_id: str = None):
+    with _connect() as conn:
+        if tenant_id is None:
+            rows = conn.execute("SELECT * FROM reminders ORDER BY channel_id, time").fetchall()
+        else:
+            rows = conn.execute(
+                "SELECT * FROM reminders WHERE tenant_id = ? ORDER BY channel_id, time", (tenant_id,)
+            ).fetchall()
+    return [dict(row) for row in rows]
+
+def _local_now(timezone):
+    return datetime.now(ZoneInfo(timezone)) if timezone else datetime.now().astimezone()
+
+def next_run(reminder) -> datetime:
+    # Today's run if it has not been sent and is not long past, else tomorrow's
+    local_now = _local_now(reminder["timezone"])
+    hour, minute = map(int, reminder["time"].split(":"))
+    run_at = local_now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if reminder["last_sent_on"] == run_at.date().isoformat() or run_at < local_now - MISSED_GRACE:
+        run_at += timedelta(days=1)
+    return run_at
+
+def claim_due(reminder_id: str, run_date: str) -> bool:
+    # Records the send before it happens so a reminder fires at most once
+    # per day, even across a leader handover.
+    with _connect() as conn:
+        cur = conn.execute(
+            "UPDATE reminders SET last_sent_on = ? WHERE id = ? AND enabled = 1 "
+            "AND (last_sent_on IS NULL OR last_sent_on != ?)",
+            (run_date, reminder_id, run_date)
+        )
+        return cur.rowcount > 0
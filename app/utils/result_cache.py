@@ -0,0 +1,120 @@
+import os
+import json
+import asyncio
+import hashlib
+import sqlite3
+import time
+from app.config import CACHE_DIR, CACHE_MAX_BYTES
+from app.utils import metrics
+
+# Content-addressed cache for transcripts and summaries. Values are JSON
+# files under CACHE_DIR; a SQLite index tracks their size and last access
+# for LRU eviction and keeps hit/miss counters shared by all processes.
+
+_inflight = {}
+
+def _connect():
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    conn = sqlite3.connect(os.path.join(CACHE_DIR, "index.db"), timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS entries (
+            key TEXT PRIMARY KEY,
+            kind TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            last_access REAL NOT NULL
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_access ON entries(last_access)")
+    conn.execute("CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+    return conn
+
+def content_hasher():
+    return hashlib.sha256()
+
+def make_key(kind: str, content_hash: str, *versions) -> str:
+    return hashlib.sha256(":".join([kind, content_hash, *map(str, versions)]).encode()).hexdigest()
+
+def _path(key: str) -> str:
+    return os.path.join(CACHE_DIR, key[:2], f"{key}.json")
+
+def _count(conn, name: str):
+    conn.execute(
+        "INSERT INTO stats (name, value) VALUES (?, 1) ON CONFLICT(name) DO UPDATE SET value = value + 1",
+        (name,)
+    )
+
+def get(key: str, kind: str):
+    with _connect() as conn:
+        try:
+            with open(_path(key)) as f:
+                value = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            _count(conn, f"{kind}_misses")
+            metrics.CACHE_REQUESTS.labels(kind, "miss").inc()
+            return None
+        conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+        _count(conn, f"{kind}_hits")
+        metrics.CACHE_REQUESTS.labels(kind, "hit").inc()
+        return value
+
+def put(key: str, kind: str, value):
+    path = _path(key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    data = json.dumps(value)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+    with _connect() as conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO entries (key, kind, size, last_access) VALUES (?, ?, ?, ?)",
+            (key, kind, len(data), time.time())
+        )
+        _evict(conn)
+
+def _evict(conn):
+    total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+    if total <= CACHE_MAX_BYTES:
+        return
+    rows = conn.execute("SELECT key, size FROM entries ORDER BY last_access").fetchall()
+    for key, size in rows:
+        if total <= CACHE_MAX_BYTES:
+            break
+        conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+        if os.path.exists(_path(key)):
+            os.remove(_path(key))
+        total -= size
+        _count(conn, "evictions")
+
+def stats() -> dict:
+    with _connect() as conn:
+        counters = dict(conn.execute("SELECT name, value FROM stats").fetchall())
+        entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+    return {"entries": entries, "size_bytes": size, "max_bytes": CACHE_MAX_BYTES, "counters": counters}
+
+async def get_or_compute(key: str, kind: str, compute):
+    # Single-flight: concurrent callers with the same key await one
+    # computation instead of each running it.
+    cached = await asyncio.to_thread(get, key, kind)
+    if cached is not None:
+        return cached
+    if key in _inflight:
+        return await asyncio.shield(_inflight[key])
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    try:
+        value = await compute()
+        await asyncio.to_thread(put, key, kind, value)
+        future.set_result(value)
+        return value
+    except BaseException as e:
+        future.set_exception(e)
+        # Mark the exception retrieved when no other caller was waiting
+        future.exception()
+        raise
+    finally:
+        _inflight.pop(key, None)
@@ -0,0 +1,26 @@
+import threading
+from collections import OrderedDict
+from slack_sdk import WebClient
+from app.config import SLACK_API_URL, SLACK_CLIENT_POOL_SIZE
+
+# LRU-bounded WebClient instances keyed by tenant. A client is replaced
+# when its tenant's bot token changes.
+
+_clients = OrderedDict()
+_lock = threading.Lock()
+
+def get_client(tenant_id: str, token: str) -> WebClient:
+    with _lock:
+        entry = _clients.get(tenant_id)
+        if entry is not None and entry[0] == token:
+            _clients.move_to_end(tenant_id)
+            return entry[1]
+        client = WebClient(token=token, base_url=SLACK_API_URL)
+        _clients[tenant_id] = (token, client)
+        _clients.move_to_end(tenant_id)
+        while len(_clients) > SLACK_CLIENT_POOL_SIZE:
+            _clients.popitem(last=False)
+        return client
+
+def pool_size() -> int:
+    return len(_clients)
@@ -0,0 +1,220 @@
+import os
+import json
+import fcntl
+import random
+import sqlite3
+import threading
+import time
+from slack_sdk.errors import SlackApiError
+from app.config import (
+    OUTBOX_DB_PATH,
+    OUTBOX_LOCK_PATH,
+    OUTBOX_POLL_SECONDS,
+    OUTBOX_MAX_ATTEMPTS,
+    OUTBOX_BACKOFF_SECONDS,
+    OUTBOX_COALESCE_MAX_CHARS,
+)
+from app.utils import metrics, tenant_store
+from app.utils.log import get_logger
+from app.utils.slack_clients import get_client
+
+# Durable Slack outbox: callers enqueue and return at once; a single sender
+# per replica (elected with a file lock) delivers messages in order per
+# channel, merging bursts and backing off on rate limits and errors.
+
+logger = get_logger("slack_outbox")
+
+_wake = threading.Event()
+
+def _connect():
+    os.makedirs(os.path.dirname(OUTBOX_DB_PATH) or ".", exist_ok=True)
+    conn = sqlite3.connect(OUTBOX_DB_PATH, timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    return conn
+
+def init_db():
+    with _connect() as conn:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                tenant_id TEXT NOT NULL DEFAULT 'default',
+                channel_id TEXT NOT NULL,
+                text TEXT NOT NULL,
+                blocks TEXT,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at REAL NOT NULL,
+                last_error TEXT,
+                created_at REAL NOT NULL,
+                sent_at REAL
+            )
+        """)
+        columns = [row["name"] for row in conn.execute("PRAGMA table_info(outbox)")]
+        if "tenant_id" not in columns:
+            conn.execute("ALTER TABLE outbox ADD COLUMN tenant_id TEXT NOT NULL DEFAULT 'default'")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_outbox_pending ON outbox(status, next_attempt_at)")
+        conn.execute("CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+
+def _count(conn, name: str, amount: int = 1):
+    conn.execute(
+        "INSERT INTO stats (name, value) VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET value = value + ?",
+        (name, amount, amount)
+    )
+
+def enqueue(channel_id: str, text: str, blocks: list = None, tenant_id: str = None) -> int:
+    now = time.time()
+    with _connect() as conn:
+        cur = conn.execute(
+            "INSERT INTO outbox (tenant_id, channel_id, text, blocks, next_attempt_at, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (tenant_store.resolve(tenant_id), channel_id, text, json.dumps(blocks) if blocks else None, now, now)
+        )
+        _count(conn, "enqueued")
+    _wake.set()
+    return cur.lastrowid
+
+def stats() -> dict:
+    with _connect() as conn:
+        counters = dict(conn.execute("SELECT name, value FROM stats").fetchall())
+        by_status = dict(conn.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall())
+        oldest = conn.execute("SELECT MIN(created_at) FROM outbox WHERE status = 'pending'").fetchone()[0]
+    return {
+        "queue": by_status,
+        "oldest_pending_age_seconds": round(time.time() - oldest, 1) if oldest else 0,
+        "counters": counters
+    }
+
+def _next_batch(conn, now):
+    # The oldest due message that heads its channel's queue (so a channel
+    # is never delivered out of order), plus any plain-text messages queued
+    # right behind it for the same channel, merged into one post.
+    first = conn.execute(
+        "SELECT * FROM outbox o WHERE status = 'pending' AND next_attempt_at <= ? "
+        "AND id = (SELECT MIN(id) FROM outbox WHERE status = 'pending' "
+        "AND tenant_id = o.tenant_id AND channel_id = o.channel_id) "
+        "ORDER BY id LIMIT 1",
+        (now,)
+    ).fetchone()
+    if first is None or first["blocks"]:
+        return [first] if first else []
+    batch = [first]
+    size = len(first["text"])
+    rows = conn.execute(
+        "SELECT * FROM outbox WHERE status = 'pending' AND tenant_id = ? AND channel_id = ? AND id > ? ORDER BY id",
+        (first["tenant_id"], first["channel_id"], first["id"])
+    ).fetchall()
+    for row in rows:
+        if row["blocks"] or size + len(row["text"]) > OUTBOX_COALESCE_MAX_CHARS:
+            break
+        batch.append(row)
+        size += len(row["text"])
+    return batch
+
+def _retry_after(error: SlackApiError):
+    if error.response.status_code == 429 or error.response.get("error") == "ratelimited":
+        try:
+            return float(error.response.headers.get("Retry-After", 1))
+        except (TypeError, ValueError):
+            return 1.0
+    return None
+
+def _deliver(batch):
+    ids = [row["id"] for row in batch]
+    placeholders = ",".join("?" * len(ids))
+    first = batch[0]
+    try:
+        tenant = tenant_store.get_tenant(first["tenant_id"])
+        if tenant is None or not tenant.bot_token:
+            raise ValueError(f"No Slack bot token configured for tenant {first['tenant_id']}")
+        client = get_client(first["tenant_id"], tenant.bot_token)
+        with metrics.stage_timer("slack_post"):
+            client.chat_postMessage(
+                channel=first["channel_id"],
+                text="\n\n".join(row["text"] for row in batch),
+                blocks=json.loads(first["blocks"]) if first["blocks"] else None
+            )
+        with _connect() as conn:
+            conn.execute(
+                f"UPDATE outbox SET status = 'sent', sent_at = ? WHERE id IN ({placeholders})",
+                (time.time(), *ids)
+            )
+            _count(conn, "sent", len(ids))
+            _count(conn, "posts")
+            if len(ids) > 1:
+                _count(conn, "coalesced", len(ids) - 1)
+        logger.info(
+            "Slack messages delivered",
+            extra={"tenant_id": first["tenant_id"], "channel_id": first["channel_id"], "messages": len(ids)}
+        )
+    except SlackApiError as e:
+        retry_after = _retry_after(e)
+        with _connect() as conn:
+            if retry_after is not None:
+                # Rate limits apply per channel, so hold back the whole channel
+                conn.execute(
+                    "UPDATE outbox SET next_attempt_at = ? WHERE status = 'pending' AND tenant_id = ? AND channel_id = ?",
+                    (time.time() + retry_after, first["tenant_id"], first["channel_id"])
+                )
+                _count(conn, "rate_limited")
+                logger.warning(
+                    "Slack rate limited",
+                    extra={"channel_id": first["channel_id"], "retry_after": retry_after}
+                )
+            else:
+                _record_failure(conn, batch, str(e))
+    except Exception as e:
+        with _connect() as conn:
+            _record_failure(conn, batch, str(e))
+
+def _record_failure(conn, batch, error: str):
+    jitter = 0.5 + random.random() / 2
+    for row in batch:
+        attempts = row["attempts"] + 1
+        if attempts >= OUTBOX_MAX_ATTEMPTS:
+            conn.execute(
+                "UPDATE outbox SET status = 'failed', attempts = ?, last_error = ? WHERE id = ?",
+                (attempts, error, row["id"])
+            )
+            _count(conn, "failed")
+            logger.error("Slack outbox gave up on message", extra={"message_id": row["id"], "error": error})
+        else:
+            delay = OUTBOX_BACKOFF_SECONDS * (2 ** row["attempts"]) * jitter
+            conn.execute(
+                "UPDATE outbox SET attempts = ?, next_attempt_at = ?, last_error = ? WHERE id = ?",
+                (attempts, time.time() + delay, error, row["id"])
+            )
+            _count(conn, "retries")
+
+def _run_sender():
+    while True:
+        _wake.clear()
+        try:
+            with _connect() as conn:
+                batch = _next_batch(conn, time.time())
+                if not batch:
+                    next_due = conn.execute(
+                        "SELECT MIN(next_attempt_at) FROM outbox WHERE status = 'pending'"
+                    ).fetchone()[0]
+            if batch:
+                _deliver(batch)
+                continue
+        except Exception:
+            logger.exception("Slack outbox error")
+            next_due = None
+        # Messages enqueued by job worker processes cannot set _wake, so the
+        # sender also re-checks every OUTBOX_POLL_SECONDS.
+        wait = OUTBOX_POLL_SECONDS
+        if next_due is not None:
+            wait = min(wait, max(0.0, next_due - time.time()))
+        _wake.wait(timeout=wait)
+
+def _run_as_sender():
+    os.makedirs(os.path.dirname(OUTBOX_LOCK_PATH) or ".", exist_ok=True)
+    lock_file = open(OUTBOX_LOCK_PATH, "w")
+    fcntl.flock(lock_file, fcntl.LOCK_EX)
+    logger.info("Slack outbox sender elected", extra={"pid": os.getpid()})
+    _run_sender()
+
+def start_sender():
+    init_db()
+    threading.Thread(target=_run_as_sender, daemon=True).start()
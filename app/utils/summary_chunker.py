@@ -0,0 +1,175 @@
+import re
+
+# Map-reduce helpers for summarizing transcripts longer than one prompt.
+# chunk_text splits the input on speaker turns and paragraphs into pieces
+# that fit a token budget; merge_summaries parses each chunk's
+# "{person_name} / time / yesterday / today / blockers" blocks and merges
+# them per person in order of first appearance, so the same chunk outputs
+# always give the same summary.
+
+# Close enough to the Llama tokenizer for budgeting, without loading it
+CHARS_PER_TOKEN = 4
+# Start of a turn: a "Priya Shah:" label as meeting tools export them, or
+# one of the scrum master's prompts the transcript parser keys on followed
+# by a name ("ok, sam")
+SPEAKER_LABEL = re.compile(r"^\s*([A-Z][\w.'-]*(?: [A-Z][\w.'-]*){0,2})\s*:")
+SPEAKER_CUE = re.compile(r"\b(?i:start from|ok,?|hello,?|next,?|you can start)\s+([A-Za-z]+)")
+# Words that follow a prompt without being anyone's name
+NOT_NAMES = {
+    "everyone", "everybody", "all", "guys", "team", "folks", "then", "so", "now", "time", "week",
+    "one", "step", "thing", "item", "we", "i", "you", "let", "lets", "the", "a", "to", "is", "and",
+    "please", "thanks", "thank", "good", "great", "cool", "yeah", "yes", "no", "sure", "with",
+}
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+FIELD_LINE = re.compile(r"^[\W_]*(time|yesterday|today|blockers?)[\W_]*:\s*(.*)$", re.IGNORECASE)
+FIELDS = ["time", "yesterday", "today", "blockers"]
+EMPTY_VALUES = {"", "none", "n/a", "na", "-", "nothing", "no blockers", "none."}
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+def find_cue_names(text: str) -> set:
+    # Lower-cased names the scrum master calls on. Only prompts at the start
+    # of a line or sentence count, so "ship it next week" or "ok then" does
+    # not make a name; once known, a name is a turn wherever it is called.
+    names = set()
+    for line in text.splitlines():
+        for match in SPEAKER_CUE.finditer(line):
+            before = line[:match.start()].rstrip()
+            word = match.group(1).lower()
+            if (not before or before[-1] in ".!?") and word not in NOT_NAMES:
+                names.add(word)
+    return names
+
+def _split_turns(line: str, names: set) -> list:
+    # A line can hold several turns ("... ok, sam yesterday i ...")
+    starts = [
+        match.start() for match in SPEAKER_CUE.finditer(line)
+        if match.start() > 0 and match.group(1).lower() in names
+    ]
+    bounds = [0] + starts + [len(line)]
+    return [line[a:b].strip() for a, b in zip(bounds, bounds[1:]) if line[a:b].strip()]
+
+def _speaker(unit: str, names: set = frozenset()):
+    match = SPEAKER_LABEL.match(unit)
+    # "Yesterday: ..." in a template is a field, not a person
+    if match and not FIELD_LINE.match(f"{match.group(1)}:"):
+        return match.group(1).strip()
+    match = SPEAKER_CUE.match(unit)
+    if match and match.group(1).lower() in names:
+        return match.group(1)
+    return None
+
+def _split_oversized(unit: str, budget: int) -> list:
+    # Sentences first, then words, for a single turn longer than the budget
+    pieces = []
+    current = ""
+    for sentence in SENTENCE_END.split(unit):
+        words = [sentence] if estimate_tokens(sentence) <= budget else sentence.split()
+        for word in words:
+            candidate = f"{current} {word}".strip()
+            if current and estimate_tokens(candidate) > budget:
+                pieces.append(current)
+                current = word
+            else:
+                current = candidate
+    if current:
+        pieces.append(current)
+    return pieces
+
+def chunk_text(text: str, budget_tokens: int) -> list:
+    # Returns the input unchanged as one chunk when it fits. Otherwise packs
+    # whole turns and paragraphs into chunks of at most budget_tokens,
+    # preferring to cut where a new speaker starts. A chunk that opens
+    # mid-turn is prefixed with "<speaker>: (continued)" so the model still
+    # knows whose update it is reading.
+    if estimate_tokens(text) <= budget_tokens:
+        return [text]
+
+    names = find_cue_names(text)
+    units = []
+    for line in text.splitlines():
+        for unit in _split_turns(line, names):
+            if estimate_tokens(unit) > budget_tokens:
+                units.extend(_split_oversized(unit, budget_tokens))
+            else:
+                units.append(unit)
+
+    # Leave room for the continuation prefix
+    budget = max(1, budget_tokens - 16)
+    chunks = []
+    current = []
+    current_tokens = 0
+    chunk_speaker = None
+    for unit in units:
+        tokens = estimate_tokens(unit)
+        if current and current_tokens + tokens > budget:
+            # Move a trailing partial turn to the next chunk if cutting at
+            # its start still leaves this chunk at least half full
+            cut = len(current)
+            for index in range(len(current) - 1, 0, -1):
+                if _speaker(current[index], names):
+                    if sum(estimate_tokens(u) for u in current[:index]) >= budget // 2:
+                        cut = index
+                    break
+            chunks.append((chunk_speaker, current[:cut]))
+            current = current[cut:]
+            current_tokens = sum(estimate_tokens(u) for u in current)
+            # The speaker in effect where the new chunk starts
+            speakers = [_speaker(u, names) for u in chunks[-1][1] if _speaker(u, names)]
+            chunk_speaker = speakers[-1] if speakers else chunk_speaker
+        current.append(unit)
+        current_tokens += tokens
+    if current:
+        chunks.append((chunk_speaker, current))
+
+    result = []
+    for chunk_speaker, chunk_units in chunks:
+        if chunk_speaker and not _speaker(chunk_units[0], names):
+            chunk_units = [f"{chunk_speaker}: (continued)"] + chunk_units
+        result.append("\n".join(chunk_units))
+    return result
+
+def parse_summaries(output: str) -> list:
+    # [(name, {field: value})] in the order the model wrote them
+    people = []
+    for line in output.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        field = FIELD_LINE.match(line)
+        if field and people:
+            name = field.group(1).lower()
+            people[-1][1]["blockers" if name.startswith("blocker") else name] = field.group(2).strip()
+        elif not field:
+            name = line.strip("*#_:- \t")
+            if name:
+                people.append((name, {}))
+    return [(name, fields) for name, fields in people if fields]
+
+def merge_summaries(outputs: list) -> str:
+    # A person mentioned in several chunks keeps the first time given and
+    # the distinct non-empty updates from each chunk, in chunk order
+    merged = {}
+    for output in outputs:
+        for name, fields in parse_summaries(output):
+            person = merged.setdefault(name.casefold(), {"name": name, **{f: [] for f in FIELDS}})
+            for field in FIELDS:
+                value = fields.get(field, "")
+                if value.lower() in EMPTY_VALUES:
+                    continue
+                if value.lower() not in (v.lower() for v in person[field]):
+                    person[field].append(value)
+
+    if not merged:
+        # Nothing in the expected format; keep what the model said
+        return "\n\n".join(output.strip() for output in outputs if output.strip())
+
+    blocks = []
+    for person in merged.values():
+        time_value = person["time"][0] if person["time"] else "none"
+        lines = [person["name"], f"time: {time_value}"]
+        for field in FIELDS[1:]:
+            lines.append(f"{field}: {'; '.join(person[field]) or 'none'}")
+        blocks.append("\n".join(lines))
+    return "\n\n".join(blocks)
@@ -0,0 +1,95 @@
+import os
+import sqlite3
+import time
+from app.config import config, BotConfig, TENANT_DB_PATH
+
+# Per-team Slack settings. The default tenant keeps using the .env-backed
+# Config so single-team deployments work unchanged; every other team's
+# settings live in SQLite.
+
+DEFAULT_TENANT = "default"
+
+def _connect():
+    os.makedirs(os.path.dirname(TENANT_DB_PATH) or ".", exist_ok=True)
+    conn = sqlite3.connect(TENANT_DB_PATH, timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    return conn
+
+def init_db():
+    with _connect() as conn:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS tenants (
+                tenant_id TEXT PRIMARY KEY,
+                bot_token TEXT,
+                bot_app_token TEXT,
+                channel_id TEXT,
+                meeting_end_time TEXT,
+                updated_at REAL NOT NULL
+            )
+        """)
+        # One row per team that has claimed a secret; the default team never does
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS tenant_secrets (
+                tenant_id TEXT PRIMARY KEY,
+                secret_hash TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+        """)
+
+def resolve(tenant_id: str = None) -> str:
+    return tenant_id or DEFAULT_TENANT
+
+def set_tenant(tenant_id: str, bot_token: str, bot_app_token: str, channel_id: str, meeting_end_time: str):
+    tenant_id = resolve(tenant_id)
+    if tenant_id == DEFAULT_TENANT:
+        config.set_config(
+            bot_token=bot_token,
+            bot_app_token=bot_app_token,
+            channel_id=channel_id,
+            meeting_end_time=meeting_end_time
+        )
+        return
+    with _connect() as conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO tenants (tenant_id, bot_token, bot_app_token, channel_id, meeting_end_time, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (tenant_id, bot_token, bot_app_token, channel_id, meeting_end_time, time.time())
+        )
+
+def get_tenant(tenant_id: str = None):
+    tenant_id = resolve(tenant_id)
+    if tenant_id == DEFAULT_TENANT:
+        return config.get_config()
+    with _connect() as conn:
+        row = conn.execute("SELECT * FROM tenants WHERE tenant_id = ?", (tenant_id,)).fetchone()
+    if row is None:
+        return None
+    return BotConfig(
+        bot_token=row["bot_token"],
+        bot_app_token=row["bot_app_token"],
+        channel_id=row["channel_id"],
+        meeting_end_time=row["meeting_end_time"]
+    )
+
+def list_tenants():
+    with _connect() as conn:
+        rows = conn.execute("SELECT tenant_id FROM tenants ORDER BY tenant_id").fetchall()
+    return [DEFAULT_TENANT] + [row["tenant_id"] for row in rows]
+
+def get_secret_hash(tenant_id: str = None):
+    with _connect() as conn:
+        row = conn.execute(
+            "SELECT secret_hash FROM tenant_secrets WHERE tenant_id = ?", (resolve(tenant_id),)
+        ).fetchone()
+    return row["secret_hash"] if row else None
+
+def claim_secret(tenant_id: str, secret_hash: str) -> bool:
+    # Stores the team's secret unless it already has one; False if another
+    # request claimed it first
+    with _connect() as conn:
+        cursor = conn.execute(
+            "INSERT OR IGNORE INTO tenant_secrets (tenant_id, secret_hash, created_at) VALUES (?, ?, ?)",
+            (resolve(tenant_id), secret_hash, time.time())
+        )
+    return cursor.rowcount == 1
@@ -0,0 +1,129 @@
+from abc import ABC, abstractmethod
+from app.config import (
+    WHISPER_MODEL_SIZE,
+    WHISPER_MODEL_SIZES,
+    WHISPER_THREADS,
+    WHISPER_BEAM_SIZE,
+    TRANSCRIBE_BACKEND,
+    TRANSCRIBE_BACKENDS,
+    FASTER_WHISPER_MODEL_SIZE,
+    FASTER_WHISPER_COMPUTE_TYPE,
+    FASTER_WHISPER_CPU_THREADS,
+    FASTER_WHISPER_BEAM_SIZE,
+)
+
+# Speech-to-text engines the Whisper server can run. Each backend takes
+# 16 kHz mono float32 samples (see audio_decoder) or a file path and returns
+# {"text": ..., "segments": [{"start", "end", "text"}, ...]}. An on_segment
+# callback, if given, is called with each segment as soon as it is known.
+# Model libraries are imported on load() so only the selected one is needed.
+
+class TranscriptionBackend(ABC):
+    name = None
+
+    def __init__(self, model_size: str, threads: int, beam_size):
+        self.model_size = model_size
+        self.threads = threads
+        self.beam_size = beam_size
+        self.model = None
+
+    @property
+    @abstractmethod
+    def cache_version(self) -> str:
+        # Identifies this backend's output for the result cache
+        ...
+
+    @abstractmethod
+    def load(self):
+        ...
+
+    @abstractmethod
+    def transcribe(self, audio, on_segment=None, **options) -> dict:
+        ...
+
+class OpenAIWhisperBackend(TranscriptionBackend):
+    name = "openai-whisper"
+
+    def __init__(self, model_size: str = WHISPER_MODEL_SIZE, threads: int = WHISPER_THREADS,
+                 beam_size=WHISPER_BEAM_SIZE):
+        super().__init__(model_size, threads, beam_size)
+
+    @property
+    def cache_version(self) -> str:
+        # Plain model size for the default settings, matching entries
+        # cached before backends were selectable
+        return f"{self.model_size}:beam{self.beam_size}" if self.beam_size else self.model_size
+
+    def load(self):
+        if self.model_size not in WHISPER_MODEL_SIZES:
+            raise ValueError(f"WHISPER_MODEL_SIZE must be one of {', '.join(WHISPER_MODEL_SIZES)}")
+        import torch
+        import whisper
+        if self.threads:
+            torch.set_num_threads(self.threads)
+        self.model = whisper.load_model(self.model_size)
+        return self
+
+    def transcribe(self, audio, on_segment=None, **options) -> dict:
+        if self.beam_size:
+            options.setdefault("beam_size", self.beam_size)
+        result = self.model.transcribe(audio, **options)
+        segments = [{"start": s["start"], "end": s["end"], "text": s["text"]} for s in result.get("segments", [])]
+        # openai-whisper only returns once the whole input is decoded
+        if on_segment:
+            for segment in segments:
+                on_segment(segment)
+        return {"text": result["text"], "segments": segments}
+
+class FasterWhisperBackend(TranscriptionBackend):
+    name = "faster-whisper"
+    # openai-whisper's "large" is large-v3; CTranslate2 models name the version
+    MODEL_ALIASES = {"large": "large-v3"}
+
+    def __init__(self, model_size: str = FASTER_WHISPER_MODEL_SIZE, threads: int = FASTER_WHISPER_CPU_THREADS,
+                 beam_size=FASTER_WHISPER_BEAM_SIZE, compute_type: str = FASTER_WHISPER_COMPUTE_TYPE):
+        super().__init__(self.MODEL_ALIASES.get(model_size, model_size), threads, beam_size)
+        self.compute_type = compute_type
+
+    @property
+    def cache_version(self) -> str:
+        return f"{self.name}:{self.model_size}:{self.compute_type}:beam{self.beam_size}"
+
+    def load(self):
+        from faster_whisper import WhisperModel
+        self.model = WhisperModel(
+            self.model_size,
+            device="cpu",
+            compute_type=self.compute_type,
+            cpu_threads=self.threads
+        )
+        return self
+
+    def transcribe(self, audio, on_segment=None, **options) -> dict:
+        options.setdefault("beam_size", self.beam_size)
+        lazy_segments, _info = self.model.transcribe(audio, **options)
+        # A lazy generator; decoding happens while iterating
+        segments = []
+        for s in lazy_segments:
+            segments.append({"start": s.start, "end": s.end, "text": s.text})
+            if on_segment:
+                on_segment(segments[-1])
+        return {"text": "".join(s["text"] for s in segments).strip(), "segments": segments}
+
+BACKENDS = {
+    OpenAIWhisperBackend.name: OpenAIWhisperBackend,
+    FasterWhisperBackend.name: FasterWhisperBackend,
+}
+
+def resolve(name: str = None) -> str:
+    name = name or TRANSCRIBE_BACKEND
+    if name not in TRANSCRIBE_BACKENDS:
+        raise ValueError(f"Transcription backend must be one of {', '.join(TRANSCRIBE_BACKENDS)}")
+    return name
+
+def create_backend(name: str = None, **settings) -> TranscriptionBackend:
+    # settings override the configured model_size, threads and beam_size
+    return BACKENDS[resolve(name)](**settings)
+
+def cache_version(name: str = None) -> str:
+    return create_backend(name).cache_version
@@ -0,0 +1,59 @@
+import os
+import time
+from fastapi import UploadFile, HTTPException
+from app.config import UPLOAD_CHUNK_SIZE
+from app.utils import metrics
+
+def _size_error(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"File too large. Maximum upload size is {max_bytes} bytes."
+    )
+
+def check_content_length(content_length, max_bytes: int):
+    # Reject on the declared size before any of the body is read
+    if content_length is None:
+        return
+    try:
+        declared = int(content_length)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid Content-Length header")
+    if declared > max_bytes:
+        raise _size_error(max_bytes)
+
+async def save_upload(file: UploadFile, dest_path: str, max_bytes: int, hasher=None) -> int:
+    # Copy the upload to disk one chunk at a time so memory stays bounded
+    # by UPLOAD_CHUNK_SIZE regardless of how large the file is. A hashlib
+    # hasher, if given, is fed every chunk on the way through.
+    if file.size is not None and file.size > max_bytes:
+        raise _size_error(max_bytes)
+
+    written = 0
+    read_seconds = write_seconds = 0.0
+    try:
+        with open(dest_path, "wb") as out:
+            while True:
+                start = time.perf_counter()
+                chunk = await file.read(UPLOAD_CHUNK_SIZE)
+                read_seconds += time.perf_counter() - start
+                if not chunk:
+                    break
+                written += len(chunk)
+                if written > max_bytes:
+                    raise _size_error(max_bytes)
+                start = time.perf_counter()
+                out.write(chunk)
+                if hasher is not None:
+                    hasher.update(chunk)
+                write_seconds += time.perf_counter() - start
+        metrics.observe_stage("upload_read", read_seconds)
+        metrics.observe_stage("temp_write", write_seconds)
+    except BaseException:
+        if os.path.exists(dest_path):
+            os.remove(dest_path)
+        raise
+
+    if written == 0:
+        os.remove(dest_path)
+        raise HTTPException(status_code=400, detail="Empty file provided")
+    return written
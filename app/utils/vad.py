@@ -0,0 +1,83 @@
+import bisect
+import numpy as np
+from app.config import VAD_MIN_SILENCE_SECONDS, VAD_MIN_SPEECH_SECONDS, VAD_PAD_SECONDS
+from app.utils.audio_chunker import FRAME_SECONDS, SAMPLE_RATE, frame_energy, silence_threshold
+
+# Energy-based voice-activity detection run before the transcription model.
+# Non-speech is cut out and the speech regions are joined into one shorter
+# array; the offset map records where each region sat in the original
+# recording so segment timestamps can be mapped back.
+# An offset map is a list of (compact_seconds, original_seconds) pairs, one
+# per kept region, sorted by compact_seconds.
+
+def cache_version() -> str:
+    # Distinguishes transcripts made with these settings in the result cache
+    return f"vad2:{VAD_MIN_SILENCE_SECONDS}:{VAD_MIN_SPEECH_SECONDS}:{VAD_PAD_SECONDS}"
+
+def detect_speech(audio: np.ndarray, min_silence_seconds: float = VAD_MIN_SILENCE_SECONDS,
+                  min_speech_seconds: float = VAD_MIN_SPEECH_SECONDS,
+                  pad_seconds: float = VAD_PAD_SECONDS) -> list:
+    # Returns (start_sample, end_sample) for each speech region, padded and
+    # with gaps shorter than min_silence_seconds bridged
+    energy = frame_energy(audio)
+    if len(energy) == 0:
+        return [(0, len(audio))] if len(audio) else []
+    voiced = energy >= silence_threshold(energy)
+    frame = int(SAMPLE_RATE * FRAME_SECONDS)
+
+    runs = []
+    run_start = None
+    for index, is_voiced in enumerate(np.append(voiced, False)):
+        if is_voiced and run_start is None:
+            run_start = index
+        elif not is_voiced and run_start is not None:
+            runs.append((run_start * frame, index * frame))
+            run_start = None
+
+    pad = int(pad_seconds * SAMPLE_RATE)
+    min_gap = int(min_silence_seconds * SAMPLE_RATE)
+    regions = []
+    for start, end in runs:
+        start, end = max(0, start - pad), min(len(audio), end + pad)
+        if regions and start - regions[-1][1] < min_gap:
+            regions[-1] = (regions[-1][0], end)
+        else:
+            regions.append((start, end))
+    # Judged after merging, so short syllables inside speech are kept
+    min_speech = int(min_speech_seconds * SAMPLE_RATE) + 2 * pad
+    regions = [(start, end) for start, end in regions if end - start >= min_speech]
+    # The tail shorter than one frame is never measured; keep it with the
+    # last region if that one runs up to it
+    if regions and regions[-1][1] >= len(audio) - frame - pad:
+        regions[-1] = (regions[-1][0], len(audio))
+    return regions
+
+def strip_silence(audio: np.ndarray, **settings):
+    # Returns (speech_audio, offset_map, speech_ratio)
+    regions = detect_speech(audio, **settings)
+    if not regions:
+        return audio[:0], [], 0.0
+    offset_map = []
+    compact_position = 0
+    for start, end in regions:
+        offset_map.append((compact_position / SAMPLE_RATE, start / SAMPLE_RATE))
+        compact_position += end - start
+    speech = np.concatenate([audio[start:end] for start, end in regions])
+    return speech, offset_map, compact_position / len(audio)
+
+def to_original(seconds: float, offset_map: list, is_end: bool = False) -> float:
+    # A time exactly on a join belongs to the later region, or to the
+    # earlier one when it ends a segment
+    if not offset_map:
+        return seconds
+    find = bisect.bisect_left if is_end else bisect.bisect_right
+    index = find([compact for compact, _ in offset_map], seconds) - 1
+    compact, original = offset_map[max(0, index)]
+    return original + seconds - compact
+
+def remap_segment(segment: dict, offset_map: list) -> dict:
+    return {
+        **segment,
+        "start": round(to_original(segment["start"], offset_map), 2),
+        "end": round(to_original(segment["end"], offset_map, is_end=True), 2),
+    }
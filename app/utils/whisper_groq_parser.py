@@ -1,47 +1,27 @@
+import bisect
 import re
 import sys
-import requests
-import os
 import json
+from app.config import SPEAKER_BATCH_SIZE, SPEAKER_CONTEXT_WINDOW, SPEAKER_CONFIDENCE_THRESHOLD
+from app.utils import metrics
+from app.utils.llm_client import chat_completion_sync, LLMError, LLMTimeoutError
+from app.utils.log import get_logger
 
-GROQ_API_KEY = os.getenv("GROQ_API_KEY")
-if not GROQ_API_KEY:
-    raise ValueError("GROQ_API_KEY environment variable is not set")
+SPEAKER_CUE_PATTERN = r'\b(start from|ok,?|hello,?|next,?|you can start)\s+([a-z]+)'
+UPDATE_PATTERN = r'\b(yesterday|today|blocker|pr)\b'
 
-GROQ_API_URL = "https://api.groq.com/openai/v1/chat/completions"
+logger = get_logger("parser")
 
-def query_groq(prompt):
-    if not GROQ_API_KEY:
-        raise ValueError("GROQ_API_KEY is not set")
-        
-    headers = {
-        "Authorization": f"Bearer {GROQ_API_KEY}",
-        "Content-Type": "application/json"
-    }
-    
-    data = {
-        "model": "llama3-70b-8192",
-        "messages": [{"role": "user", "content": prompt}],
-        "max_tokens": 100
-    }
-    
+# Bump when segmenting, attribution prompts or output format change so cached summaries are not reused
+PROMPT_VERSION = "2"
+
+def query_groq(prompt, max_tokens=100):
     try:
-        response = requests.post(GROQ_API_URL, headers=headers, json=data, timeout=30)
-        response.raise_for_status()  # Raise an exception for bad status codes
-        
-        result = response.json()
-        if "choices" not in result or not result["choices"]:
-            raise ValueError("Invalid response format from Groq API")
-            
-        return result["choices"][0]["message"]["content"].strip()
-    except requests.exceptions.Timeout:
+        return chat_completion_sync(prompt, model="llama3-70b-8192", max_tokens=max_tokens)
+    except LLMTimeoutError:
         raise Exception("Groq API request timed out")
-    except requests.exceptions.RequestException as e:
+    except LLMError as e:
         raise Exception(f"Groq API request failed: {str(e)}")
-    except (KeyError, json.JSONDecodeError) as e:
-        raise Exception(f"Failed to parse Groq API response: {str(e)}")
-    except Exception as e:
-        raise Exception(f"Unexpected error in Groq API call: {str(e)}")
 
 # Function to read transcript from file
 def read_transcript(file_path):
@@ -49,69 +29,216 @@ def read_transcript(file_path):
         with open(file_path, 'r') as f:
             return f.read().strip()
     except FileNotFoundError:
-        print(f"Error: File '{file_path}' not found.")
+        logger.error("Transcript file not found", extra={"path": file_path})
         sys.exit(1)
     except Exception as e:
-        print(f"Error reading file: {e}")
+        logger.error("Error reading transcript file", extra={"path": file_path, "error": str(e)})
         sys.exit(1)
 
-# Function to query Groq API for speaker identification
-def identify_speaker(text_segment, context, previous_speaker):
-    try:
-        prompt = f"""
-        Given the meeting transcript segment and context, identify the speaker.
-        Context: {context}
-        Segment: {text_segment}
-        Previous speaker: {previous_speaker}
-        Return the speaker's name in 'FirstName LastName' format or 'Unknown' if unclear.
+# Function to query Groq API for the speakers of many segments in one request
+def identify_speakers_batch(batch, context_lines, names):
+    # batch: [(segment_index, segment, previous_speaker), ...]
+    # Returns {segment_index: speaker} for the segments Groq could attribute.
+    numbered = "\n".join(
+        f"{index}. (previous speaker: {previous}) {segment}" for index, segment, previous in batch
+    )
+    context = "\n".join(context_lines) or "(start of meeting)"
+    prompt = f"""
+        Given the recent meeting transcript context and numbered segments, identify the speaker of each numbered segment.
+        Team members: {", ".join(sorted(names))}
+        Recent context:
+        {context}
+        Segments:
+        {numbered}
+        Return only a JSON object mapping each segment number to a team member name from the list above, or "Unknown" if unclear, e.g. {{"12": "Anshid", "15": "Unknown"}}.
         Rules:
         - The Scrum Master often prompts others (e.g., 'OK, [name]', 'Hello, [name]', 'Next, [name]') or uses 'OK', 'Hello', 'Thank you'.
         - Updates with 'yesterday', 'today', or 'blocker' belong to the prompted speaker.
         - Short responses (e.g., 'yeah', 'sure') may belong to the previous speaker or Scrum Master if following a prompt.
         - Responses to questions (e.g., 'Do you know why?') are from the previously prompted speaker.
-        - Identify names from context cues like prompts or explicit mentions in the transcript.
         """
-        result = query_groq(prompt)
-        if result == "Unknown":
-            return previous_speaker  # Return previous speaker instead of Unknown
-        return result
+    try:
+        result = query_groq(prompt, max_tokens=20 * len(batch) + 20)
+        match = re.search(r'\{.*\}', result, re.DOTALL)
+        if not match:
+            raise ValueError("No JSON object in Groq response")
+        mapping = json.loads(match.group(0))
+        return {
+            int(index): speaker for index, speaker in mapping.items()
+            if str(index).isdigit() and speaker in names
+        }
     except Exception as e:
-        print(f"Error in identify_speaker: {str(e)}")
-        return previous_speaker  # Return previous speaker on error
+        logger.warning("Speaker identification batch failed", extra={"batch_size": len(batch), "error": str(e)})
+        return {}  # Fall back to the previous speaker for the whole batch
+
+FIRST_PERSON_PATTERN = re.compile(r"\b(i|i'm|i've|i'll|my|me)\b")
+
+# Function to score how sure the cue-following rule is about a segment's speaker
+def score_attribution(segment, cue_speaker, names, segments_since_cue, question_since_cue):
+    if cue_speaker not in names:
+        return 0.0
+    score = 0.9
+    # The further from the Scrum Master's prompt, the likelier someone else has taken over
+    score -= 0.05 * max(0, segments_since_cue - 1)
+    if question_since_cue:
+        score -= 0.3
+    words = set(re.findall(r"[a-z]+", segment))
+    if any(name.lower() in words for name in names if name != cue_speaker):
+        score -= 0.4
+    if FIRST_PERSON_PATTERN.search(segment):
+        score += 0.05
+    return max(0.0, min(1.0, score))
+
+# Function to attribute update-bearing segments to speakers, asking Groq only when unsure
+def attribute_speakers(segments, names):
+    # First pass: follow the Scrum Master's cues and turn-taking to give
+    # every update segment a local speaker and a confidence score.
+    cue_speakers = []
+    resolved = {}
+    escalated = []
+    current_speaker = "Unknown"
+    segments_since_cue = 0
+    question_since_cue = False
+    for index, segment in enumerate(segments):
+        speaker_match = re.search(SPEAKER_CUE_PATTERN, segment)
+        if speaker_match:
+            current_speaker = speaker_match.group(2).capitalize()
+            segments_since_cue = 0
+            question_since_cue = False
+        else:
+            segments_since_cue += 1
+            if re.search(UPDATE_PATTERN, segment):
+                confidence = score_attribution(segment, current_speaker, names, segments_since_cue, question_since_cue)
+                if confidence >= SPEAKER_CONFIDENCE_THRESHOLD:
+                    resolved[index] = current_speaker
+                else:
+                    escalated.append((index, segment, current_speaker))
+            if segment.endswith("?"):
+                question_since_cue = True
+        cue_speakers.append(current_speaker)
+
+    # Second pass: one Groq request per batch of low-confidence segments,
+    # each carrying only a bounded window of the segments before it.
+    stats = {
+        "local": len(resolved),
+        "escalated": len(escalated),
+        "llm_calls": (len(escalated) + SPEAKER_BATCH_SIZE - 1) // SPEAKER_BATCH_SIZE
+    }
+    for start in range(0, len(escalated), SPEAKER_BATCH_SIZE):
+        batch = escalated[start:start + SPEAKER_BATCH_SIZE]
+        first_index = batch[0][0]
+        window = range(max(0, first_index - SPEAKER_CONTEXT_WINDOW), first_index)
+        context_lines = [f"{cue_speakers[i]}: {segments[i]}" for i in window]
+        resolved.update(identify_speakers_batch(batch, context_lines, names))
+    return resolved, stats
+
+# Precompiled normalization substitutions, applied in order
+NORMALIZATIONS = [
+    (re.compile(r'(\s*hello\s*)+'), ' hello '),
+    (re.compile(r'\bshit\b'), 'anshid'),
+    (re.compile(r'\bliedida\b'), 'ladeeda'),
+    (re.compile(r'\bsaina\b'), 'sayana'),
+]
+
+# Sentence punctuation, or a closing phrase such as "ok" or "thank you"
+SEGMENT_BOUNDARY = re.compile(r'[.!?]|\s(?:okay|ok|yeah|thank you|bye)\b')
+
+def normalize_transcript(text):
+    text = text.lower()
+    for pattern, replacement in NORMALIZATIONS:
+        text = pattern.sub(replacement, text)
+    return text
+
+def _iter_segment_spans(text):
+    # Yields (segment, offset) from already normalized text, with offset
+    # where the segment's first character sits in text
+    start = 0
+    for match in SEGMENT_BOUNDARY.finditer(text):
+        # A closing phrase only ends a segment that already has content, so
+        # a segment can still start with a prompt like "ok sam"
+        if match.group(0) not in '.!?' and not text[start:match.start()].strip():
+            continue
+        piece = text[start:match.end()]
+        if piece.strip():
+            yield piece.strip(), start + len(piece) - len(piece.lstrip())
+        start = match.end()
+    piece = text[start:]
+    if piece.strip():
+        yield piece.strip(), start + len(piece) - len(piece.lstrip())
+
+# Function to clean and split transcript into segments, yielded as they are found
+def iter_segments(text):
+    for segment, _offset in _iter_segment_spans(normalize_transcript(text)):
+        yield segment
 
-# Function to clean and split transcript into segments
 def parse_transcript(text):
-    # Normalize text
-    text = re.sub(r'(\s*hello\s*)+', ' hello ', text.lower())
-    text = re.sub(r'\bshit\b', 'anshid', text)
-    text = re.sub(r'\bliedida\b', 'ladeeda', text)
-    text = re.sub(r'\bsaina\b', 'sayana', text)
-    # Split into segments based on punctuation and key phrases
+    return list(iter_segments(text))
+
+# A complete cue at the very end of the text, e.g. "next, priya"
+CUE_AT_END = re.compile(SPEAKER_CUE_PATTERN + r'[\s,]*$')
+
+# Function to split timestamped Whisper segments, keeping each piece's start time.
+# The text is split as one transcript so a cue such as "next, rahul" that
+# Whisper (or a short caption cue) broke in two is still found; each piece
+# takes the start of the Whisper segment its first character came from.
+# A piece still breaks at a Whisper boundary that follows a complete cue, so
+# an unpunctuated "next, priya" does not swallow the update after it.
+def parse_timed_segments(whisper_segments):
+    pieces = []
+    offsets = []
+    position = 0
+    for whisper_segment in whisper_segments:
+        offsets.append(position)
+        pieces.append(normalize_transcript(whisper_segment["text"]))
+        position += len(pieces[-1]) + 1
+    text = " ".join(pieces)
     segments = []
-    current_segment = ""
-    for char in text + " ":
-        current_segment += char
-        if char in '.!?':
-            segments.append(current_segment.strip())
-            current_segment = ""
-        elif current_segment.strip().endswith((' ok', ' okay', ' yeah', ' thank you', ' bye')):
-            segments.append(current_segment.strip())
-            current_segment = ""
-    if current_segment.strip():
-        segments.append(current_segment.strip())
-    return [s.strip() for s in segments if s.strip()]
+    start_times = []
+
+    def add(start, end):
+        segment = text[start:end].strip()
+        if segment:
+            segments.append(segment)
+            start_times.append(whisper_segments[bisect.bisect_right(offsets, start) - 1]["start"])
+
+    for segment, offset in _iter_segment_spans(text):
+        end = offset + len(segment)
+        start = offset
+        first = bisect.bisect_right(offsets, offset)
+        for boundary in offsets[first:bisect.bisect_left(offsets, end)]:
+            if CUE_AT_END.search(text[start:boundary].strip()):
+                add(start, boundary)
+                start = boundary
+        add(start, end)
+    return segments, start_times
+
+def format_timestamp(seconds):
+    seconds = int(seconds)
+    hours, remainder = divmod(seconds, 3600)
+    minutes, secs = divmod(remainder, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{secs:02d}"
+    return f"{minutes}:{secs:02d}"
 
 # Function to extract names from transcript
 def extract_names(segments):
     names = set()
-    name_pattern = r'\b(start from|ok,?|hello,?|next,?|you can start)\s+([a-z]+)'
     for segment in segments:
-        match = re.search(name_pattern, segment)
+        match = re.search(SPEAKER_CUE_PATTERN, segment)
         if match:
             name = match.group(2).capitalize()
             names.add(name)
     return names
 
+# Function to file an update under yesterday, today or blockers
+def add_update(summary, segment):
+    if "yesterday" in segment:
+        summary["yesterday"].append(segment)
+    elif "today" in segment:
+        summary["today"].append(segment)
+    elif "blocker" in segment:
+        summary["blockers"].append(segment)
+
 # Function to summarize updates
 def summarize_updates(updates):
     if not updates:
@@ -121,13 +248,19 @@ def summarize_updates(updates):
         return updates
     return ' '.join(words[:10]) + "..."
 
-# Main processing logic
-def process_transcript(transcript):
+# Main processing logic. on_event(type, **data), if given, hears about the
+# attribution step and each person's summary as soon as it is ready.
+def process_transcript(transcript, whisper_segments=None, on_event=None):
     try:
         if not transcript or not isinstance(transcript, str):
             raise ValueError("Invalid transcript: empty or not a string")
 
-        segments = parse_transcript(transcript)
+        start_times = None
+        with metrics.stage_timer("segmenting"):
+            if whisper_segments:
+                segments, start_times = parse_timed_segments(whisper_segments)
+            else:
+                segments = parse_transcript(transcript)
         if not segments:
             raise ValueError("No valid segments found in transcript")
 
@@ -135,7 +268,13 @@ def process_transcript(transcript):
         if not names:
             raise ValueError("No speaker names found in transcript")
 
-        context = "Scrum meeting with multiple team members providing updates."
+        if on_event:
+            on_event("stage", stage="attributing", status="running", speakers=sorted(names))
+        with metrics.stage_timer("speaker_attribution"):
+            resolved_speakers, attribution_stats = attribute_speakers(segments, names)
+        if on_event:
+            on_event("stage", stage="attributing", status="done", **attribution_stats)
+        logger.info("Speaker attribution finished", extra={"segments": len(segments), **attribution_stats})
         current_speaker = "Unknown"
         summaries = {}
         
@@ -147,24 +286,25 @@ def process_transcript(transcript):
             segment = segments[segment_index]
             try:
                 # Check for Scrum Master prompts
-                speaker_match = re.search(r'\b(start from|ok,?|hello,?|next,?|you can start)\s+([a-z]+)', segment)
+                speaker_match = re.search(SPEAKER_CUE_PATTERN, segment)
                 if speaker_match:
                     current_speaker = speaker_match.group(2).capitalize()
                     if current_speaker in names:
-                        summaries[current_speaker]["time"] = f"{segment_index // 2}:{segment_index % 2:02d}"
-                elif re.search(r'\b(yesterday|today|blocker|pr)\b', segment):
-                    speaker = identify_speaker(segment, context, current_speaker)
+                        if start_times:
+                            summaries[current_speaker]["time"] = format_timestamp(start_times[segment_index])
+                        else:
+                            summaries[current_speaker]["time"] = f"{segment_index // 2}:{segment_index % 2:02d}"
+                        # The speaker may start their update in the same segment
+                        update = segment[speaker_match.end():].strip()
+                        if re.search(UPDATE_PATTERN, update):
+                            add_update(summaries[current_speaker], update)
+                elif re.search(UPDATE_PATTERN, segment):
+                    speaker = resolved_speakers.get(segment_index, "Unknown")
                     if speaker != "Unknown" and speaker in names:
                         current_speaker = speaker
-                    if "yesterday" in segment:
-                        summaries[current_speaker]["yesterday"].append(segment)
-                    elif "today" in segment:
-                        summaries[current_speaker]["today"].append(segment)
-                    elif "blocker" in segment:
-                        summaries[current_speaker]["blockers"].append(segment)
-                context += f"\n{current_speaker}: {segment}"
+                    add_update(summaries[current_speaker], segment)
             except Exception as e:
-                print(f"Error processing segment {segment_index}: {str(e)}")
+                logger.warning("Error processing segment", extra={"segment_index": segment_index, "error": str(e)})
                 # Continue with next segment
             segment_index += 1
 
@@ -175,6 +315,8 @@ def process_transcript(transcript):
             today = summarize_updates(" ".join(summaries[name]["today"]))
             blockers = summarize_updates(" ".join(summaries[name]["blockers"]))
             output.append(f"{name}\ntime: {summaries[name]['time']}\nyesterday: {yesterday}\ntoday: {today}\nblockers: {blockers}")
+            if on_event:
+                on_event("summary", person=name, text=output[-1])
         
         if not output:
             raise ValueError("No valid summaries generated")
@@ -0,0 +1,166 @@
+import os
+import queue
+import threading
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.connection import Listener
+from app.config import (
+    WHISPER_SOCKET_PATH,
+    TRANSCRIBE_MODE,
+    TRANSCRIBE_CHUNK_WORKERS,
+    TRANSCRIBE_CHUNK_SECONDS,
+    TRANSCRIBE_MIN_SILENCE_SECONDS,
+    VAD_ENABLED,
+)
+from app.utils import metrics, transcription_backends, vad
+from app.utils.audio_chunker import split_on_silence, stitch_segments
+from app.utils.audio_decoder import decode_audio, SAMPLE_RATE
+from app.utils.log import get_logger
+
+# Local inference server: loads each transcription backend's model once per
+# replica and serves requests from every web and job worker over a Unix socket.
+
+logger = get_logger("whisper_server")
+
+_requests = queue.Queue()
+_backends = {}
+_chunk_pools = {}
+
+def load_backend(name: str = None, **settings):
+    backend = transcription_backends.create_backend(name, **settings)
+    logger.info("Loading transcription model", extra={"backend": backend.name, "model_size": backend.model_size})
+    with metrics.stage_timer("whisper_model_load"):
+        backend.load()
+    logger.info("Transcription model loaded", extra={"backend": backend.name, "model_size": backend.model_size})
+    return backend
+
+def _get_backend(name: str = None):
+    name = transcription_backends.resolve(name)
+    if name not in _backends:
+        _backends[name] = load_backend(name)
+    return _backends[name]
+
+def _init_chunk_worker(name, threads):
+    _backends[name] = load_backend(name, threads=threads)
+
+def _transcribe_chunk(name, audio, options):
+    return _backends[name].transcribe(audio, **options)
+
+def _get_chunk_pool(name):
+    # Each chunk worker holds its own model copy, so a backend's pool is
+    # only created once the first chunked request for it arrives.
+    if name not in _chunk_pools:
+        threads = max(1, (os.cpu_count() or 1) // TRANSCRIBE_CHUNK_WORKERS)
+        _chunk_pools[name] = ProcessPoolExecutor(
+            max_workers=TRANSCRIBE_CHUNK_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_chunk_worker,
+            initargs=(name, threads)
+        )
+    return _chunk_pools[name]
+
+def _transcribe_chunked(name, audio, options, on_segment=None):
+    chunks = split_on_silence(audio, TRANSCRIBE_CHUNK_SECONDS, TRANSCRIBE_MIN_SILENCE_SECONDS)
+    pool = _get_chunk_pool(name)
+    futures = [(offset, pool.submit(_transcribe_chunk, name, samples, options)) for offset, samples in chunks]
+    results = []
+    for offset, future in futures:
+        results.append((offset, future.result()))
+        # Chunks are reported in audio order as soon as each one is done
+        if on_segment:
+            for segment in stitch_segments([results[-1]])["segments"]:
+                on_segment(segment)
+    return stitch_segments(results)
+
+def _transcribe(request, reply):
+    options = request.get("options", {})
+    mode = request.get("mode") or TRANSCRIBE_MODE
+    name = transcription_backends.resolve(request.get("backend"))
+    audio = decode_audio(request["audio_path"])
+    audio_seconds = len(audio) / SAMPLE_RATE
+    use_vad = VAD_ENABLED if request.get("vad") is None else request["vad"]
+    offset_map = []
+    speech_ratio = 1.0
+    if use_vad:
+        # Only speech reaches the model; timestamps are mapped back below
+        with metrics.stage_timer("vad"):
+            audio, offset_map, speech_ratio = vad.strip_silence(audio)
+        metrics.SPEECH_RATIO.observe(speech_ratio)
+    speech_seconds = len(audio) / SAMPLE_RATE
+
+    def _emit(segment):
+        segment = vad.remap_segment(segment, offset_map)
+        progress = min(1.0, segment["end"] / audio_seconds) if audio_seconds else 1.0
+        reply.put({"status": "segment", "segment": segment, "progress": round(progress, 3)})
+
+    on_segment = _emit if request.get("stream") else None
+    if speech_seconds == 0:
+        result = {"text": "", "segments": []}
+    elif mode == "chunked":
+        result = _transcribe_chunked(name, audio, options, on_segment)
+    else:
+        result = _get_backend(name).transcribe(audio, on_segment=on_segment, **options)
+    segments = [vad.remap_segment(s, offset_map) for s in result.get("segments", [])]
+    return {
+        "text": result["text"],
+        "segments": [{"start": s["start"], "end": s["end"], "text": s["text"]} for s in segments],
+        "audio_seconds": round(audio_seconds, 2),
+        "speech_seconds": round(speech_seconds, 2),
+        "speech_ratio": round(speech_ratio, 4),
+    }
+
+def _handle_connection(conn):
+    try:
+        while True:
+            try:
+                request = conn.recv()
+            except EOFError:
+                break
+            # Streaming requests get "segment" messages before the final reply
+            reply = queue.Queue()
+            _requests.put((request, reply, time.perf_counter()))
+            while True:
+                message = reply.get()
+                conn.send(message)
+                if message["status"] != "segment":
+                    break
+    except Exception as e:
+        logger.error("Whisper client connection error", extra={"error": str(e)})
+    finally:
+        conn.close()
+
+def _inference_loop():
+    # One request at a time, in arrival order, from every connected worker;
+    # the model is shared, not run on several requests at once
+    while True:
+        request, reply, queued_at = _requests.get()
+        metrics.observe_stage("whisper_queue_wait", time.perf_counter() - queued_at)
+        try:
+            with metrics.stage_timer("whisper_inference"):
+                result = _transcribe(request, reply)
+            reply.put({"status": "success", **result})
+        except Exception as e:
+            logger.error("Transcription failed", extra={"audio_path": request.get("audio_path"), "error": str(e)})
+            reply.put({"status": "error", "error": str(e)})
+
+def serve(socket_path: str = WHISPER_SOCKET_PATH):
+    if TRANSCRIBE_MODE != "chunked":
+        _get_backend()
+
+    os.makedirs(os.path.dirname(socket_path) or ".", exist_ok=True)
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+    listener = Listener(socket_path, family="AF_UNIX")
+    logger.info("Whisper server listening", extra={"socket_path": socket_path})
+
+    threading.Thread(target=_inference_loop, daemon=True).start()
+    try:
+        while True:
+            conn = listener.accept()
+            threading.Thread(target=_handle_connection, args=(conn,), daemon=True).start()
+    finally:
+        listener.close()
+
+if __name__ == "__main__":
+    serve()
@@ -1,15 +1,89 @@
-import ffmpeg
-import whisper
+import fcntl
 import os
-import tempfile
+import subprocess
+import sys
+import time
+from multiprocessing.connection import Client
+from app.config import WHISPER_SOCKET_PATH, WHISPER_SERVER_AUTOSTART
+from app.utils.log import get_logger
 
-model = whisper.load_model("large")
+SERVER_START_TIMEOUT = 600
 
-def convert_to_audio(input_path: str) -> str:
-    output_audio = tempfile.NamedTemporaryFile(delete=False, suffix=".mp3").name
-    ffmpeg.input(input_path).output(output_audio, **{'q:a': 0, 'map': 'a'}).run(overwrite_output=True)
-    return output_audio
+logger = get_logger("whisper")
 
-def transcribe_audio(audio_path: str) -> str:
-    result = model.transcribe(audio_path)
-    return result["text"]
+def _connect():
+    try:
+        return Client(WHISPER_SOCKET_PATH, family="AF_UNIX")
+    except (FileNotFoundError, ConnectionRefusedError):
+        if not WHISPER_SERVER_AUTOSTART:
+            raise RuntimeError(f"Whisper server is not running on {WHISPER_SOCKET_PATH}")
+    _start_server()
+    return Client(WHISPER_SOCKET_PATH, family="AF_UNIX")
+
+def _start_server():
+    # Only one process per replica may launch the server; the others wait on
+    # the lock and then find the socket already listening.
+    os.makedirs(os.path.dirname(WHISPER_SOCKET_PATH) or ".", exist_ok=True)
+    with open(WHISPER_SOCKET_PATH + ".lock", "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            if server_ready():
+                return
+            logger.info("Starting Whisper server", extra={"socket_path": WHISPER_SOCKET_PATH})
+            process = subprocess.Popen(
+                [sys.executable, "-m", "app.utils.whisper_server"],
+                start_new_session=True
+            )
+            deadline = time.time() + SERVER_START_TIMEOUT
+            while time.time() < deadline:
+                if server_ready():
+                    return
+                if process.poll() is not None:
+                    raise RuntimeError("Whisper server exited during startup")
+                time.sleep(1)
+            raise RuntimeError("Timed out waiting for Whisper server to start")
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def ensure_server():
+    # Starts the server now (when autostart is on) rather than on the first
+    # transcription; returns once its model is loaded and it is listening
+    _connect().close()
+
+def server_ready() -> bool:
+    # Outside chunked mode the server only listens once its model is loaded
+    try:
+        Client(WHISPER_SOCKET_PATH, family="AF_UNIX").close()
+        return True
+    except (FileNotFoundError, ConnectionRefusedError):
+        return False
+
+def transcribe_audio_segments(audio_path: str, mode: str = None, backend: str = None, on_segment=None) -> dict:
+    # Returns {"text": ..., "segments": [{"start", "end", "text"}, ...]} with
+    # timestamps in seconds from the start of the original recording, even
+    # when the server cut silence before transcribing. backend picks a
+    # transcription_backends engine, defaulting to TRANSCRIBE_BACKEND.
+    # on_segment(segment, progress) is called for each segment as the server
+    # decodes it, with progress the fraction of the recording covered so far.
+    conn = _connect()
+    try:
+        conn.send({
+            "audio_path": os.path.abspath(audio_path),
+            "mode": mode,
+            "backend": backend,
+            "stream": on_segment is not None
+        })
+        result = conn.recv()
+        while result["status"] == "segment":
+            on_segment(result["segment"], result["progress"])
+            result = conn.recv()
+    finally:
+        conn.close()
+    if result["status"] != "success":
+        raise RuntimeError(f"Whisper transcription failed: {result['error']}")
+    # audio_seconds, speech_seconds and speech_ratio describe the
+    # voice-activity pre-pass (a ratio of 1.0 when it is off)
+    return {key: value for key, value in result.items() if key != "status"}
+
+def transcribe_audio(audio_path: str, backend: str = None) -> str:
+    return transcribe_audio_segments(audio_path, backend=backend)["text"]
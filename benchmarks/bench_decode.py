@@ -0,0 +1,67 @@
+import argparse
+import os
+import statistics
+import subprocess
+import tempfile
+import time
+import numpy as np
+from benchmarks import corpus, results
+from app.utils.audio_decoder import decode_audio
+
+# Compares the single-pass ffmpeg decode to PCM with the path it replaced:
+# re-encode to a q:a 0 mp3 temp file, then decode that mp3 again the way
+# whisper.load_audio does.
+# Usage: python -m benchmarks.bench_decode [--clips a.mp4 b.webm] [--repeat 3]
+
+def legacy_decode(path: str) -> np.ndarray:
+    mp3_path = tempfile.NamedTemporaryFile(delete=False, suffix=".mp3").name
+    try:
+        subprocess.run(
+            ["ffmpeg", "-nostdin", "-loglevel", "error", "-y", "-i", path, "-q:a", "0", "-map", "a", mp3_path],
+            check=True
+        )
+        out = subprocess.run(
+            ["ffmpeg", "-nostdin", "-threads", "0", "-i", mp3_path, "-f", "s16le", "-ac", "1",
+             "-acodec", "pcm_s16le", "-ar", "16000", "-"],
+            capture_output=True, check=True
+        ).stdout
+    finally:
+        os.remove(mp3_path)
+    return np.frombuffer(out, np.int16).flatten().astype(np.float32) / 32768.0
+
+def timed(func, path, repeat):
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(path)
+        runs.append(time.perf_counter() - start)
+    return statistics.median(runs)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clips", nargs="+", help="media files (default: synthetic corpus clips)")
+    parser.add_argument("--audio-sizes", nargs="+", default=list(corpus.AUDIO_SIZES), choices=list(corpus.AUDIO_SIZES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--corpus-dir", default=os.path.join(os.path.dirname(__file__), "corpus"))
+    parser.add_argument("--output", help="result file (default: benchmarks/results/)")
+    args = parser.parse_args()
+
+    clips = args.clips
+    if not clips:
+        audio = corpus.build(args.corpus_dir)["audio"]
+        clips = [audio[size] for size in args.audio_sizes]
+
+    report = {}
+    print(f"{'clip':<24}{'direct (s)':>12}{'legacy (s)':>12}{'speedup':>10}")
+    for path in clips:
+        direct = timed(decode_audio, path, args.repeat)
+        legacy = timed(legacy_decode, path, args.repeat)
+        clip = os.path.basename(path)
+        report[clip] = {"direct_seconds": round(direct, 4), "legacy_seconds": round(legacy, 4)}
+        print(f"{clip:<24}{direct:>12.4f}{legacy:>12.4f}{legacy / direct:>9.1f}x")
+
+    path = results.write("decode", vars(args), report, args.output)
+    print(f"Results written to {path}")
+
+if __name__ == "__main__":
+    main()
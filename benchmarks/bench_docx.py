@@ -0,0 +1,98 @@
+import argparse
+import multiprocessing
+import os
+import statistics
+import time
+from benchmarks import corpus, results
+
+# Compares the streaming .docx extractor with the python-docx path it
+# replaced: wall time, peak resident memory above the baseline and how much
+# text each one finds (python-docx skips tables). Each run happens in a
+# fresh process so peak memory is per run.
+# Usage: python -m benchmarks.bench_docx [--sizes medium large] [--extra-chars 5000000] [--repeat 3]
+
+def python_docx_text(path: str) -> str:
+    from docx import Document
+    return "\n".join(para.text for para in Document(path).paragraphs)
+
+def streaming_text(path: str) -> str:
+    from app.utils.docx_parser import extract_text_from_docx
+    return extract_text_from_docx(path)
+
+EXTRACTORS = {"python-docx": python_docx_text, "streaming": streaming_text}
+
+def _memory_kb(field: str) -> int:
+    # VmHWM is the process's peak RSS; unlike ru_maxrss it is not inherited
+    # from the parent across exec. Linux only.
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+    return 0
+
+def _run(name: str, path: str, queue):
+    # Import the extractor's modules first so only extraction is measured
+    if name == "python-docx":
+        import docx  # noqa: F401
+    else:
+        import app.utils.docx_parser  # noqa: F401
+    before = _memory_kb("VmRSS")
+    start = time.perf_counter()
+    text = EXTRACTORS[name](path)
+    seconds = time.perf_counter() - start
+    peak = _memory_kb("VmHWM")
+    queue.put({"seconds": seconds, "peak_rss_mb": max(0, peak - before) / 1024, "chars": len(text)})
+
+def measure(name: str, path: str, repeat: int) -> dict:
+    context = multiprocessing.get_context("spawn")
+    runs = []
+    for _ in range(repeat):
+        queue = context.Queue()
+        process = context.Process(target=_run, args=(name, path, queue))
+        process.start()
+        runs.append(queue.get())
+        process.join()
+    return {
+        "seconds": round(statistics.median(run["seconds"] for run in runs), 4),
+        "peak_rss_mb": round(max(run["peak_rss_mb"] for run in runs), 1),
+        "chars": runs[0]["chars"],
+    }
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", nargs="+", default=list(corpus.TRANSCRIPT_SIZES),
+                        choices=list(corpus.TRANSCRIPT_SIZES))
+    parser.add_argument("--extra-chars", type=int, default=5_000_000,
+                        help="also generate paragraph and table documents of this many characters (0 to skip)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--corpus-dir", default=os.path.join(os.path.dirname(__file__), "corpus"))
+    parser.add_argument("--output", help="result file (default: benchmarks/results/)")
+    args = parser.parse_args()
+
+    files = corpus.build(args.corpus_dir, audio=False)["docx"]
+    documents = {size: files[size] for size in args.sizes}
+    if args.extra_chars:
+        text = corpus.make_transcript(args.extra_chars)
+        for layout, table in (("paragraphs", False), ("table", True)):
+            path = os.path.join(args.corpus_dir, f"transcript-{args.extra_chars}-{layout}.docx")
+            if not os.path.exists(path):
+                with open(path, "wb") as f:
+                    f.write(corpus.make_docx(text, table=table))
+            documents[f"{args.extra_chars}-{layout}"] = path
+
+    report = {}
+    print(f"{'document':<22}{'extractor':<14}{'MB':>8}{'seconds':>10}{'peak RSS MB':>13}{'chars':>11}")
+    for label, path in documents.items():
+        size_mb = os.path.getsize(path) / 1024 / 1024
+        report[label] = {"file_mb": round(size_mb, 2)}
+        for name in EXTRACTORS:
+            stats = measure(name, path, args.repeat)
+            report[label][name] = stats
+            print(f"{label:<22}{name:<14}{size_mb:>8.2f}{stats['seconds']:>10.4f}"
+                  f"{stats['peak_rss_mb']:>13.1f}{stats['chars']:>11}")
+
+    path = results.write("docx", vars(args), report, args.output)
+    print(f"Results written to {path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+import argparse
+import asyncio
+import importlib.util
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+import httpx
+from docx import Document
+from benchmarks import corpus, results
+from benchmarks.fake_services import FakeGroq, FakeSlack
+
+# End-to-end load test of /upload-transcript and /upload_media against a
+# real uvicorn server whose Groq and Slack calls go to local fakes.
+# Usage: python -m benchmarks.bench_endpoints [--requests 50] [--concurrency 8]
+#        [--groq-latency 0.3] [--error-rate 0.05] [--scenarios docx media]
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DOCX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+def _unique(data: bytes, kind: str) -> bytes:
+    # Makes each upload distinct so the result cache and job dedup do not
+    # turn the benchmark into a cache benchmark
+    marker = uuid.uuid4().hex
+    if kind == "docx":
+        doc = Document(io.BytesIO(data))
+        doc.add_paragraph(f"ref {marker}")
+        buffer = io.BytesIO()
+        doc.save(buffer)
+        return buffer.getvalue()
+    return data + bytes.fromhex(marker)
+
+def start_server(port: int, data_dir: str, env_overrides: dict, log_path: str = None, ready_timeout: float = 60):
+    # Returns once /readyz answers 200, i.e. after the server's warm-up
+    env = dict(os.environ)
+    env.update({
+        "PYTHONPATH": ROOT,
+        "DATA_DIR": data_dir,
+        "SLACK_BOT_TOKEN": "xoxb-bench",
+        "SLACK_APP_TOKEN": "xapp-bench",
+        "SLACK_CHANNEL_ID": "CBENCH",
+        "MEETING_END_TIME": "09:00",
+        "GROQ_API_KEY": "bench",
+        "OUTBOX_POLL_SECONDS": "0.2",
+        "LLM_BACKOFF_SECONDS": "0.05",
+        # Only scenarios that transcribe need the Whisper server warmed up
+        "READY_REQUIRES_WHISPER": "false",
+        **env_overrides,
+    })
+    # Run from data_dir so the repo's .env is not picked up
+    log = open(log_path, "w") if log_path else subprocess.DEVNULL
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=data_dir, env=env, stdout=log
+    )
+    deadline = time.time() + ready_timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode}")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/readyz", timeout=1).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"Server was not ready within {ready_timeout}s")
+
+async def _wait_for_job(client, job_id: str, timeout: float):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        job = (await client.get(f"/jobs/{job_id}")).json()
+        if job["status"] in ("completed", "failed"):
+            return job
+        await asyncio.sleep(0.1)
+    return {"status": "timeout"}
+
+async def run_scenario(base_url: str, scenario: str, payload: bytes, filename: str,
+                       requests: int, concurrency: int, job_timeout: float):
+    latencies = []
+    statuses = {}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(client):
+        async with semaphore:
+            data = _unique(payload, scenario)
+            start = time.perf_counter()
+            try:
+                if scenario == "docx":
+                    response = await client.post(
+                        "/upload-transcript", files={"file": (filename, data, DOCX_CONTENT_TYPE)}
+                    )
+                    outcome = str(response.status_code)
+                else:
+                    response = await client.post("/upload_media", files={"file": (filename, data)})
+                    outcome = str(response.status_code)
+                    if response.status_code == 200:
+                        job = await _wait_for_job(client, response.json()["data"]["job_id"], job_timeout)
+                        outcome = job["status"]
+            except httpx.HTTPError as e:
+                outcome = type(e).__name__
+            elapsed = time.perf_counter() - start
+            statuses[outcome] = statuses.get(outcome, 0) + 1
+            if outcome in ("200", "completed"):
+                latencies.append(elapsed)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=job_timeout) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(one(client) for _ in range(requests)))
+        wall = time.perf_counter() - start
+
+    summary = results.summarize_latencies(latencies, wall)
+    summary["wall_seconds"] = round(wall, 3)
+    summary["outcomes"] = statuses
+    return summary
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scenarios", nargs="+", default=["docx", "media"], choices=["docx", "media"])
+    parser.add_argument("--docx-sizes", nargs="+", default=["small", "medium"], choices=list(corpus.TRANSCRIPT_SIZES))
+    parser.add_argument("--audio-sizes", nargs="+", default=["short"], choices=list(corpus.AUDIO_SIZES))
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--media-requests", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--groq-latency", type=float, default=0.3)
+    parser.add_argument("--slack-latency", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="injected 5xx rate for both fakes")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="injected 429 rate for both fakes")
+    parser.add_argument("--job-timeout", type=float, default=600)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--whisper-model", default="tiny")
+    parser.add_argument("--backend", default="openai-whisper", choices=["openai-whisper", "faster-whisper"])
+    parser.add_argument("--corpus-dir", default=os.path.join(ROOT, "benchmarks", "corpus"))
+    parser.add_argument("--server-log", help="write the server's stdout here")
+    parser.add_argument("--output", help="result file (default: benchmarks/results/)")
+    args = parser.parse_args()
+
+    scenarios = list(args.scenarios)
+    backend_module = "whisper" if args.backend == "openai-whisper" else "faster_whisper"
+    if "media" in scenarios and importlib.util.find_spec(backend_module) is None:
+        print(f"⚠️ {args.backend} is not installed; skipping the media scenario")
+        scenarios.remove("media")
+
+    files = corpus.build(args.corpus_dir, audio="media" in scenarios)
+    groq = FakeGroq(latency=args.groq_latency, jitter=args.groq_latency / 4,
+                    error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate).start()
+    slack = FakeSlack(latency=args.slack_latency, error_rate=args.error_rate,
+                      rate_limit_rate=args.rate_limit_rate).start()
+    data_dir = tempfile.mkdtemp(prefix="clover-bench-")
+    server = start_server(args.port, data_dir, {
+        "GROQ_BASE_URL": groq.url,
+        "SLACK_API_URL": f"{slack.url}/api/",
+        "WHISPER_MODEL_SIZE": args.whisper_model,
+        "TRANSCRIBE_BACKEND": args.backend,
+        "READY_REQUIRES_WHISPER": "true" if "media" in scenarios else "false",
+    }, args.server_log, ready_timeout=args.job_timeout if "media" in scenarios else 60)
+
+    report = {}
+    try:
+        base_url = f"http://127.0.0.1:{args.port}"
+        for scenario in scenarios:
+            sizes = args.docx_sizes if scenario == "docx" else args.audio_sizes
+            count = args.requests if scenario == "docx" else args.media_requests
+            for size_name in sizes:
+                path = files["docx" if scenario == "docx" else "audio"][size_name]
+                with open(path, "rb") as f:
+                    payload = f.read()
+                summary = asyncio.run(run_scenario(
+                    base_url, scenario, payload, os.path.basename(path),
+                    count, args.concurrency, args.job_timeout
+                ))
+                report.setdefault(scenario, {})[size_name] = summary
+                print(f"{scenario:<6}{size_name:<8} n={summary['count']:<4} p50={summary['p50']:.3f}s "
+                      f"p95={summary['p95']:.3f}s p99={summary['p99']:.3f}s "
+                      f"{summary.get('throughput_per_second', 0):.2f} req/s {summary['outcomes']}")
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+        report["fakes"] = {"groq": groq.counts, "slack": dict(slack.counts, posts=len(slack.posts))}
+        groq.stop()
+        slack.stop()
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    path = results.write("endpoints", vars(args), report, args.output)
+    print(f"Results written to {path}")
+
+if __name__ == "__main__":
+    main()
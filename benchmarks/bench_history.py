@@ -0,0 +1,91 @@
+import argparse
+import datetime
+import os
+import random
+import statistics
+import tempfile
+import time
+from benchmarks import corpus, results
+
+# Fills a throwaway history database with years of synthetic standups and
+# times the /history queries against it: full-text search, per-person
+# timelines and recurring-blocker detection.
+# Usage: python -m benchmarks.bench_history [--years 3] [--people 8] [--repeat 20]
+
+BLOCKERS = [
+    "waiting on review for the {topic}", "{topic} credentials from ops", "flaky tests in the {topic}",
+    "none", "none", "none", "none",
+]
+
+def summary_for(rng, people):
+    blocks = []
+    for name in people:
+        topic = rng.choice(corpus.TOPICS)
+        blocks.append(
+            f"{name.capitalize()}\ntime: {rng.randint(0, 14)}:{rng.randint(0, 59):02d}\n"
+            f"yesterday: worked on the {rng.choice(corpus.TOPICS)}\ntoday: finish the {topic}\n"
+            f"blockers: {rng.choice(BLOCKERS).format(topic=topic)}"
+        )
+    return "\n\n".join(blocks)
+
+def timed(func, repeat):
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        runs.append(time.perf_counter() - start)
+    return {"median_ms": round(statistics.median(runs) * 1000, 3), "max_ms": round(max(runs) * 1000, 3)}
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--people", type=int, default=len(corpus.NAMES))
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output", help="result file (default: benchmarks/results/)")
+    args = parser.parse_args()
+
+    os.environ["HISTORY_DB_PATH"] = os.path.join(tempfile.mkdtemp(), "history.db")
+    from app.utils import history_store
+    history_store.init_db()
+
+    rng = random.Random(0)
+    people = [corpus.NAMES[i % len(corpus.NAMES)] + ("" if i < len(corpus.NAMES) else str(i))
+              for i in range(args.people)]
+    day = datetime.date.today() - datetime.timedelta(days=365 * args.years)
+    start = time.perf_counter()
+    standups = 0
+    while day <= datetime.date.today():
+        if day.weekday() < 5:
+            history_store.record_summary("default", f"bench-{day}", "bench", summary_for(rng, people), day.isoformat())
+            standups += 1
+        day += datetime.timedelta(days=1)
+    load_seconds = time.perf_counter() - start
+    print(f"recorded {standups} standups x {len(people)} people in {load_seconds:.1f}s")
+
+    month_ago = (datetime.date.today() - datetime.timedelta(days=30)).isoformat()
+    person = people[0]
+    cases = {
+        "search_all": lambda: history_store.search_updates("default", query="review"),
+        "search_blockers_person_month": lambda: history_store.search_updates(
+            "default", query="credentials", person=person, field="blockers", since=month_ago),
+        "blockers_person_month": lambda: history_store.search_updates(
+            "default", person=person, field="blockers", since=month_ago),
+        "timeline_page": lambda: history_store.search_updates("default", person=person, limit=100, oldest_first=True),
+        "timeline_deep_page": lambda: history_store.search_updates(
+            "default", person=person, limit=100, offset=standups // 2, oldest_first=True),
+        "recurring_person": lambda: history_store.recurring_blockers("default", person=person),
+        "recurring_all_quarter": lambda: history_store.recurring_blockers(
+            "default", since=(datetime.date.today() - datetime.timedelta(days=90)).isoformat()),
+    }
+    report = {"standups": standups, "people": len(people), "load_seconds": round(load_seconds, 2), "queries": {}}
+    print(f"{'query':<32}{'median ms':>11}{'max ms':>10}")
+    for name, func in cases.items():
+        stats = timed(func, args.repeat)
+        report["queries"][name] = stats
+        print(f"{name:<32}{stats['median_ms']:>11.2f}{stats['max_ms']:>10.2f}")
+
+    path = results.write("history", vars(args), report, args.output)
+    print(f"Results written to {path}")
+
+if __name__ == "__main__":
+    main()
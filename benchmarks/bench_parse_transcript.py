@@ -0,0 +1,80 @@
+import argparse
+import random
+import re
+import time
+from app.utils.whisper_groq_parser import parse_transcript
+
+# Micro-benchmark for the transcript segmenter.
+# Usage: python -m benchmarks.bench_parse_transcript [--sizes 10000 100000 1000000]
+
+WORDS = ["we", "worked", "on", "the", "login", "api", "and", "deployment", "pipeline",
+         "yesterday", "today", "blocker", "review", "pr", "merged", "tests", "sam", "bob"]
+CLOSERS = [".", " ok", " yeah", " thank you", "?", " bye"]
+
+def legacy_parse_transcript(text):
+    # The per-character implementation this segmenter replaced
+    text = re.sub(r'(\s*hello\s*)+', ' hello ', text.lower())
+    text = re.sub(r'\bshit\b', 'anshid', text)
+    text = re.sub(r'\bliedida\b', 'ladeeda', text)
+    text = re.sub(r'\bsaina\b', 'sayana', text)
+    segments = []
+    current_segment = ""
+    for char in text + " ":
+        current_segment += char
+        if char in '.!?':
+            segments.append(current_segment.strip())
+            current_segment = ""
+        elif current_segment.strip().endswith((' ok', ' okay', ' yeah', ' thank you', ' bye')):
+            segments.append(current_segment.strip())
+            current_segment = ""
+    if current_segment.strip():
+        segments.append(current_segment.strip())
+    return [s.strip() for s in segments if s.strip()]
+
+def make_transcript(size, run_on, seed=0):
+    # run_on=True models Whisper output with almost no punctuation
+    rng = random.Random(seed)
+    parts = []
+    length = 0
+    while length < size:
+        word = rng.choice(WORDS)
+        if not run_on and rng.random() < 0.08:
+            word += rng.choice(CLOSERS)
+        parts.append(word)
+        length += len(word) + 1
+    return " ".join(parts)[:size]
+
+def timed(func, text, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--legacy-max", type=int, default=100_000,
+                        help="skip the quadratic legacy segmenter above this size")
+    args = parser.parse_args()
+
+    print(f"{'shape':<10}{'chars':>10}{'segments':>10}{'new (s)':>12}{'legacy (s)':>12}{'speedup':>10}")
+    for run_on in (False, True):
+        shape = "run-on" if run_on else "punctuated"
+        for size in args.sizes:
+            text = make_transcript(size, run_on)
+            segments = parse_transcript(text)
+            new = timed(parse_transcript, text, args.repeat)
+            if size <= args.legacy_max:
+                legacy = timed(legacy_parse_transcript, text, 1)
+                legacy_col = f"{legacy:>12.4f}"
+                speedup = f"{legacy / new:>9.1f}x"
+            else:
+                legacy_col = f"{'skipped':>12}"
+                speedup = f"{'-':>10}"
+            print(f"{shape:<10}{size:>10}{len(segments):>10}{new:>12.4f}{legacy_col}{speedup}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import argparse
+import os
+import statistics
+import time
+from benchmarks import corpus, results
+from benchmarks.fake_services import FakeGroq
+
+# Micro-benchmarks of the transcript parser functions over the synthetic
+# corpus. process_transcript and attribute_speakers call a local fake Groq
+# server, so only parser time (plus loopback HTTP) is measured.
+# Usage: python -m benchmarks.bench_parser [--repeat 5] [--output results.json]
+
+def timed(func, *args, repeat: int):
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        runs.append(time.perf_counter() - start)
+    return {
+        "best": round(min(runs), 6),
+        "median": round(statistics.median(runs), 6),
+        "ops_per_second": round(1 / statistics.median(runs), 3) if statistics.median(runs) else 0.0,
+    }
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--sizes", nargs="+", default=list(corpus.TRANSCRIPT_SIZES),
+                        choices=list(corpus.TRANSCRIPT_SIZES))
+    parser.add_argument("--groq-latency", type=float, default=0.0)
+    parser.add_argument("--output", help="result file (default: benchmarks/results/)")
+    args = parser.parse_args()
+
+    groq = FakeGroq(latency=args.groq_latency).start()
+    os.environ["GROQ_BASE_URL"] = groq.url
+    os.environ.setdefault("GROQ_API_KEY", "bench")
+
+    # Imported after GROQ_BASE_URL is set, since app.config reads it at import
+    from app.utils import whisper_groq_parser as wgp
+
+    report = {}
+    print(f"{'function':<22}{'size':<8}{'chars':>9}{'best (s)':>12}{'median (s)':>12}")
+    for size_name in args.sizes:
+        text = corpus.make_transcript(corpus.TRANSCRIPT_SIZES[size_name])
+        segments = wgp.parse_transcript(text)
+        names = wgp.extract_names(segments)
+        cases = {
+            "normalize_transcript": (wgp.normalize_transcript, text),
+            "parse_transcript": (wgp.parse_transcript, text),
+            "extract_names": (wgp.extract_names, segments),
+            "attribute_speakers": (wgp.attribute_speakers, segments, names),
+            "process_transcript": (wgp.process_transcript, text),
+        }
+        report[size_name] = {"chars": len(text), "segments": len(segments)}
+        for name, (func, *func_args) in cases.items():
+            stats = timed(func, *func_args, repeat=args.repeat)
+            report[size_name][name] = stats
+            print(f"{name:<22}{size_name:<8}{len(text):>9}{stats['best']:>12.4f}{stats['median']:>12.4f}")
+    report["groq_requests"] = groq.counts["requests"]
+    groq.stop()
+
+    path = results.write("parser", vars(args), report, args.output)
+    print(f"Results written to {path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import httpx
+from benchmarks import results
+from benchmarks.fake_services import FakeSlack
+
+# Measures how long a web worker takes to come up: importing app.main in a
+# fresh interpreter, then booting uvicorn until /healthz answers (accepting
+# requests) and until /readyz answers 200 (warm-up finished). Slack calls go
+# to a local fake with --slack-latency added, standing in for the real API.
+# Usage: python -m benchmarks.bench_startup [--repeat 5] [--slack-latency 0.3]
+#        [--with-whisper]
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORT_SNIPPET = (
+    "import sys, time\n"
+    "start = time.perf_counter()\n"
+    "import app.main\n"
+    "print(time.perf_counter() - start)\n"
+    "print(','.join(name for name in ('numpy', 'torch', 'slack_bolt') if name in sys.modules))\n"
+)
+
+def _env(data_dir: str, slack_url: str, with_whisper: bool) -> dict:
+    env = dict(os.environ)
+    env.update({
+        "PYTHONPATH": ROOT,
+        "DATA_DIR": data_dir,
+        "SLACK_API_URL": slack_url,
+        "SLACK_BOT_TOKEN": "xoxb-bench",
+        "SLACK_APP_TOKEN": "xapp-bench",
+        "SLACK_CHANNEL_ID": "CBENCH",
+        "MEETING_END_TIME": "09:00",
+        "GROQ_API_KEY": "bench",
+        "READY_REQUIRES_WHISPER": "true" if with_whisper else "false",
+    })
+    return env
+
+def measure_import(env: dict, cwd: str) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET], cwd=cwd, env=env, capture_output=True, text=True, check=True
+    ).stdout.splitlines()
+    return {"seconds": float(output[0]), "heavy_modules": [name for name in output[1].split(",") if name]}
+
+def measure_boot(port: int, env: dict, cwd: str, timeout: float) -> dict:
+    url = f"http://127.0.0.1:{port}"
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=cwd, env=env, stdout=subprocess.DEVNULL
+    )
+    timings = {}
+    readiness = None
+    try:
+        while time.perf_counter() - start < timeout:
+            if process.poll() is not None:
+                raise RuntimeError(f"Server exited with code {process.returncode}")
+            try:
+                if "healthz" not in timings:
+                    httpx.get(f"{url}/healthz", timeout=1).raise_for_status()
+                    timings["healthz"] = time.perf_counter() - start
+                response = httpx.get(f"{url}/readyz", timeout=1)
+                if response.status_code == 200:
+                    timings["readyz"] = time.perf_counter() - start
+                    readiness = response.json()
+                    break
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.01)
+    finally:
+        process.terminate()
+        process.wait()
+    if "readyz" not in timings:
+        raise RuntimeError(f"Server was not ready within {timeout}s")
+    warmup = readiness["checks"]["warmup"]
+    return {**timings, "warmup": {name: step["seconds"] for name, step in warmup.items()}}
+
+def _median(values) -> float:
+    return round(statistics.median(values), 4)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--slack-latency", type=float, default=0.3, help="seconds added to each fake Slack call")
+    parser.add_argument("--with-whisper", action="store_true",
+                        help="wait for the Whisper server and its model before counting as ready")
+    parser.add_argument("--port", type=int, default=8790)
+    parser.add_argument("--timeout", type=float, default=900)
+    parser.add_argument("--output", help="result file (default: benchmarks/results/)")
+    args = parser.parse_args()
+
+    slack = FakeSlack(latency=args.slack_latency).start()
+    imports, boots = [], []
+    for run in range(args.repeat):
+        # A fresh data dir each run so every boot creates its databases
+        with tempfile.TemporaryDirectory() as data_dir:
+            env = _env(data_dir, slack.url + "/api/", args.with_whisper)
+            imports.append(measure_import(env, data_dir))
+            boots.append(measure_boot(args.port, env, data_dir, args.timeout))
+        print(f"run {run + 1}: import {imports[-1]['seconds']:.3f}s  healthz {boots[-1]['healthz']:.3f}s  "
+              f"readyz {boots[-1]['readyz']:.3f}s")
+
+    report = {
+        "import_seconds": _median(run["seconds"] for run in imports),
+        "heavy_modules_on_import": sorted({name for run in imports for name in run["heavy_modules"]}),
+        "healthz_seconds": _median(boot["healthz"] for boot in boots),
+        "readyz_seconds": _median(boot["readyz"] for boot in boots),
+        "warmup_seconds": {
+            name: _median(boot["warmup"][name] for boot in boots) for name in boots[0]["warmup"]
+        },
+    }
+    print(f"import app.main  {report['import_seconds']:.3f}s  (heavy modules: "
+          f"{', '.join(report['heavy_modules_on_import']) or 'none'})")
+    print(f"/healthz         {report['healthz_seconds']:.3f}s")
+    print(f"/readyz          {report['readyz_seconds']:.3f}s")
+    for name, seconds in report["warmup_seconds"].items():
+        print(f"  warm-up {name:<16}{seconds:.3f}s")
+    path = results.write("startup", vars(args), report, args.output)
+    print(f"Results written to {path}")
+
+if __name__ == "__main__":
+    main()
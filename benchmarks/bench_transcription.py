@@ -0,0 +1,87 @@
+import argparse
+import difflib
+import importlib.util
+import os
+import statistics
+import time
+from benchmarks import corpus, results
+
+# Compares transcription backends on the same clips: model load time,
+# wall time and real-time factor per clip, and how closely each backend's
+# text matches the first one's. Clips are decoded once, as the Whisper
+# server does, and every backend gets the same samples.
+# Usage: python -m benchmarks.bench_transcription [--backends openai-whisper faster-whisper]
+#        [--model-size base] [--threads 4] [--clips a.wav b.mp3]
+
+BACKEND_MODULES = {"openai-whisper": "whisper", "faster-whisper": "faster_whisper"}
+
+def similarity(a: str, b: str) -> float:
+    return round(difflib.SequenceMatcher(None, a.lower().split(), b.lower().split()).ratio(), 4)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--backends", nargs="+", default=list(BACKEND_MODULES), choices=list(BACKEND_MODULES))
+    parser.add_argument("--model-size", default="base")
+    parser.add_argument("--threads", type=int, default=0, help="0 keeps each backend's default")
+    parser.add_argument("--beam-size", type=int, default=0, help="0 keeps each backend's configured beam size")
+    parser.add_argument("--clips", nargs="+", help="audio files (default: synthetic corpus clips)")
+    parser.add_argument("--audio-sizes", nargs="+", default=["short", "medium"], choices=list(corpus.AUDIO_SIZES))
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--corpus-dir", default=os.path.join(os.path.dirname(__file__), "corpus"))
+    parser.add_argument("--output", help="result file (default: benchmarks/results/)")
+    args = parser.parse_args()
+
+    from app.utils import transcription_backends
+    from app.utils.audio_decoder import decode_audio, SAMPLE_RATE
+
+    clips = args.clips
+    if not clips:
+        audio = corpus.build(args.corpus_dir)["audio"]
+        clips = [audio[size] for size in args.audio_sizes]
+    decoded = {}
+    for path in clips:
+        start = time.perf_counter()
+        decoded[path] = decode_audio(path)
+        print(f"decoded {os.path.basename(path)} in {time.perf_counter() - start:.3f}s")
+
+    report = {}
+    reference = {}
+    for name in args.backends:
+        if importlib.util.find_spec(BACKEND_MODULES[name]) is None:
+            print(f"⚠️ {BACKEND_MODULES[name]} is not installed; skipping {name}")
+            continue
+        settings = {"model_size": args.model_size, "threads": args.threads}
+        if args.beam_size:
+            settings["beam_size"] = args.beam_size
+        backend = transcription_backends.create_backend(name, **settings)
+        start = time.perf_counter()
+        backend.load()
+        load_seconds = time.perf_counter() - start
+        entry = {"cache_version": backend.cache_version, "load_seconds": round(load_seconds, 3), "clips": {}}
+
+        for path in clips:
+            duration = len(decoded[path]) / SAMPLE_RATE
+            runs = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                result = backend.transcribe(decoded[path])
+                runs.append(time.perf_counter() - start)
+            seconds = statistics.median(runs)
+            clip = os.path.basename(path)
+            reference.setdefault(clip, result["text"])
+            entry["clips"][clip] = {
+                "audio_seconds": round(duration, 2),
+                "seconds": round(seconds, 3),
+                "real_time_factor": round(seconds / duration, 4) if duration else None,
+                "segments": len(result["segments"]),
+                "similarity_to_first_backend": similarity(reference[clip], result["text"]),
+            }
+            print(f"{name:<16}{clip:<22}{duration:>8.1f}s audio{seconds:>9.2f}s  "
+                  f"RTF {entry['clips'][clip]['real_time_factor']}")
+        report[name] = entry
+
+    path = results.write("transcription", vars(args), report, args.output)
+    print(f"Results written to {path}")
+
+if __name__ == "__main__":
+    main()
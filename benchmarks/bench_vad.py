@@ -0,0 +1,94 @@
+import argparse
+import importlib.util
+import os
+import time
+import numpy as np
+from benchmarks import corpus, results
+
+# Measures the voice-activity pre-pass: how long detection takes, how much
+# audio it keeps, and (with --backends) transcription time with and without
+# it on the same samples. Corpus clips are padded with the silence a real
+# standup has: people joining at the start and pauses between speakers.
+# Usage: python -m benchmarks.bench_vad [--lead-silence 60] [--gap-silence 8]
+#        [--backends faster-whisper] [--model-size base] [--clips a.wav]
+
+BACKEND_MODULES = {"openai-whisper": "whisper", "faster-whisper": "faster_whisper"}
+
+def meeting_like(audio: np.ndarray, lead_seconds: float, gap_seconds: float, seed: int = 0) -> np.ndarray:
+    # Low-level room noise instead of digital silence
+    from app.utils.audio_chunker import SAMPLE_RATE
+    rng = np.random.default_rng(seed)
+
+    def noise(seconds):
+        return rng.normal(0, 0.002, int(seconds * SAMPLE_RATE)).astype(np.float32)
+
+    pieces = [noise(lead_seconds)]
+    step = 10 * SAMPLE_RATE
+    for start in range(0, len(audio), step):
+        pieces.append(audio[start:start + step])
+        pieces.append(noise(gap_seconds))
+    return np.concatenate(pieces)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clips", nargs="+", help="audio files (default: synthetic corpus clips)")
+    parser.add_argument("--audio-sizes", nargs="+", default=["medium", "long"], choices=list(corpus.AUDIO_SIZES))
+    parser.add_argument("--lead-silence", type=float, default=60.0)
+    parser.add_argument("--gap-silence", type=float, default=8.0, help="silence added after every 10s of audio")
+    parser.add_argument("--backends", nargs="*", default=[], choices=list(BACKEND_MODULES))
+    parser.add_argument("--model-size", default="base")
+    parser.add_argument("--corpus-dir", default=os.path.join(os.path.dirname(__file__), "corpus"))
+    parser.add_argument("--output", help="result file (default: benchmarks/results/)")
+    args = parser.parse_args()
+
+    from app.utils import transcription_backends, vad
+    from app.utils.audio_decoder import decode_audio, SAMPLE_RATE
+
+    clips = args.clips
+    if not clips:
+        audio = corpus.build(args.corpus_dir)["audio"]
+        clips = [audio[size] for size in args.audio_sizes]
+
+    backends = {}
+    for name in args.backends:
+        if importlib.util.find_spec(BACKEND_MODULES[name]) is None:
+            print(f"⚠️ {BACKEND_MODULES[name]} is not installed; skipping {name}")
+            continue
+        backends[name] = transcription_backends.create_backend(name, model_size=args.model_size).load()
+
+    report = {}
+    print(f"{'clip':<22}{'audio (s)':>10}{'speech (s)':>11}{'ratio':>8}{'vad (s)':>9}")
+    for path in clips:
+        samples = meeting_like(decode_audio(path), args.lead_silence, args.gap_silence)
+        start = time.perf_counter()
+        speech, offset_map, ratio = vad.strip_silence(samples)
+        vad_seconds = time.perf_counter() - start
+        clip = os.path.basename(path)
+        entry = {
+            "audio_seconds": round(len(samples) / SAMPLE_RATE, 2),
+            "speech_seconds": round(len(speech) / SAMPLE_RATE, 2),
+            "speech_ratio": round(ratio, 4),
+            "regions": len(offset_map),
+            "vad_seconds": round(vad_seconds, 4),
+        }
+        print(f"{clip:<22}{entry['audio_seconds']:>10.1f}{entry['speech_seconds']:>11.1f}"
+              f"{ratio:>8.2f}{vad_seconds:>9.3f}")
+        for name, backend in backends.items():
+            timings = {}
+            for label, audio in (("full", samples), ("vad", speech)):
+                start = time.perf_counter()
+                backend.transcribe(audio)
+                timings[label] = time.perf_counter() - start
+            entry[name] = {
+                "full_seconds": round(timings["full"], 3),
+                "vad_seconds": round(timings["vad"], 3),
+                "speedup": round(timings["full"] / timings["vad"], 2) if timings["vad"] else None,
+            }
+            print(f"  {name:<20}full {timings['full']:.2f}s  with vad {timings['vad']:.2f}s")
+        report[clip] = entry
+
+    path = results.write("vad", vars(args), report, args.output)
+    print(f"Results written to {path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import argparse
+import json
+
+# Compares two benchmark result files metric by metric.
+# Usage: python -m benchmarks.compare OLD.json NEW.json [--threshold 10]
+
+# Metrics where a larger number is an improvement; everything else is a time
+HIGHER_IS_BETTER = ("throughput_per_second", "ops_per_second", "similarity_to_first_backend")
+# Bookkeeping that is reported but not compared
+SKIPPED = ("count", "chars", "segments", "wall_seconds", "audio_seconds")
+SKIPPED_SECTIONS = ("outcomes", "fakes", "groq_requests")
+
+def _flatten(value, prefix=""):
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield from _flatten(item, f"{prefix}.{key}" if prefix else key)
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        yield prefix, value
+
+def compare(old: dict, new: dict, threshold: float):
+    old_metrics = dict(_flatten(old["results"]))
+    new_metrics = dict(_flatten(new["results"]))
+    rows = []
+    for name in sorted(old_metrics.keys() & new_metrics.keys()):
+        before, after = old_metrics[name], new_metrics[name]
+        if name.endswith(SKIPPED) or before == 0 or any(part in SKIPPED_SECTIONS for part in name.split(".")):
+            continue
+        change = (after - before) / before * 100
+        better = change > 0 if name.endswith(HIGHER_IS_BETTER) else change < 0
+        flag = ""
+        if abs(change) >= threshold:
+            flag = "improved" if better else "REGRESSED"
+        rows.append((name, before, after, change, flag))
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("old")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="flag changes larger than this many percent")
+    args = parser.parse_args()
+
+    with open(args.old) as f:
+        old = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+
+    print(f"old: {old['environment'].get('git_commit')}  new: {new['environment'].get('git_commit')}")
+    regressions = 0
+    for name, before, after, change, flag in compare(old, new, args.threshold):
+        print(f"{name:<60}{before:>14.4f}{after:>14.4f}{change:>+9.1f}%  {flag}")
+        regressions += flag == "REGRESSED"
+    raise SystemExit(1 if regressions else 0)
+
+if __name__ == "__main__":
+    main()
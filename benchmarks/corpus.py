@@ -0,0 +1,116 @@
+import io
+import math
+import os
+import random
+import wave
+from docx import Document
+
+# Synthetic standup transcripts, .docx files and audio clips in several
+# sizes. Everything is generated from a seed, so the corpus is the same on
+# every machine and between commits.
+
+SAMPLE_RATE = 16000
+NAMES = ["alex", "sam", "priya", "chen", "maria", "omar", "lena", "tom"]
+CUES = ["ok, {name}", "next, {name}", "hello, {name}", "you can start {name}"]
+UPDATES = [
+    "yesterday i worked on the {topic} and fixed two bugs.",
+    "today i will finish the {topic} and open a pr.",
+    "no blocker for me, the {topic} is on track.",
+    "blocker is the {topic}, waiting on review.",
+    "my pr for the {topic} was merged yesterday.",
+]
+CHATTER = ["yeah", "thank you", "sounds good.", "do you know why?", "i think so."]
+TOPICS = ["login api", "deployment pipeline", "billing service", "search index",
+          "mobile release", "test suite", "dashboard", "auth tokens"]
+
+# Approximate transcript sizes in characters
+TRANSCRIPT_SIZES = {"small": 2_000, "medium": 20_000, "large": 200_000}
+# Audio clip lengths in seconds
+AUDIO_SIZES = {"short": 10, "medium": 60, "long": 300}
+
+def make_transcript(size: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    parts = []
+    length = 0
+    while length < size:
+        name = rng.choice(NAMES)
+        turn = [rng.choice(CUES).format(name=name)]
+        for _ in range(rng.randint(2, 5)):
+            turn.append(rng.choice(UPDATES).format(topic=rng.choice(TOPICS)))
+        if rng.random() < 0.5:
+            turn.append(rng.choice(CHATTER))
+        text = " ".join(turn)
+        parts.append(text)
+        length += len(text) + 1
+    return " ".join(parts)
+
+def make_docx(text: str, table: bool = False) -> bytes:
+    # A paragraph every few sentences, the way meeting tools export notes,
+    # or one table row per group of sentences like a standup template
+    doc = Document()
+    doc.add_heading("Daily standup", level=1)
+    sentences = text.split(". ")
+    groups = [". ".join(sentences[start:start + 5]) for start in range(0, len(sentences), 5)]
+    if table:
+        rows = doc.add_table(rows=0, cols=2)
+        for index, group in enumerate(groups):
+            cells = rows.add_row().cells
+            cells[0].text = f"update {index + 1}"
+            cells[1].text = group
+    else:
+        for group in groups:
+            doc.add_paragraph(group)
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+def make_audio(seconds: float, seed: int = 0) -> bytes:
+    # 16 kHz mono WAV of voiced tone bursts separated by pauses, enough to
+    # exercise decoding, silence detection and the model without real speech
+    rng = random.Random(seed)
+    frames = bytearray()
+    total = int(seconds * SAMPLE_RATE)
+    position = 0
+    while position < total:
+        burst = int(rng.uniform(0.8, 4.0) * SAMPLE_RATE)
+        pitch = rng.uniform(110, 260)
+        for i in range(min(burst, total - position)):
+            value = 0.3 * math.sin(2 * math.pi * pitch * i / SAMPLE_RATE) + rng.uniform(-0.02, 0.02)
+            frames += int(value * 32767).to_bytes(2, "little", signed=True)
+        position += burst
+        pause = min(int(rng.uniform(0.3, 1.5) * SAMPLE_RATE), max(0, total - position))
+        frames += bytes(2 * pause)
+        position += pause
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(bytes(frames))
+    return buffer.getvalue()
+
+def build(corpus_dir: str, seed: int = 0, audio: bool = True) -> dict:
+    # Writes the corpus to corpus_dir (skipping files that already exist)
+    # and returns {kind: {size: path}}
+    os.makedirs(corpus_dir, exist_ok=True)
+    files = {"txt": {}, "docx": {}, "audio": {}}
+    for size_name, size in TRANSCRIPT_SIZES.items():
+        text = None
+        txt_path = os.path.join(corpus_dir, f"transcript-{size_name}.txt")
+        docx_path = os.path.join(corpus_dir, f"transcript-{size_name}.docx")
+        if not os.path.exists(txt_path) or not os.path.exists(docx_path):
+            text = make_transcript(size, seed)
+            with open(txt_path, "w") as f:
+                f.write(text)
+            with open(docx_path, "wb") as f:
+                f.write(make_docx(text))
+        files["txt"][size_name] = txt_path
+        files["docx"][size_name] = docx_path
+    if audio:
+        for size_name, seconds in AUDIO_SIZES.items():
+            wav_path = os.path.join(corpus_dir, f"clip-{size_name}.wav")
+            if not os.path.exists(wav_path):
+                with open(wav_path, "wb") as f:
+                    f.write(make_audio(seconds, seed))
+            files["audio"][size_name] = wav_path
+    return files
@@ -0,0 +1,165 @@
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Local stand-ins for the Groq chat completions API and the Slack Web API,
+# with configurable latency and error injection. Point GROQ_BASE_URL and
+# SLACK_API_URL at them to run the service without network access.
+
+class FakeService:
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 rate_limit_rate: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.counts = {"requests": 0, "errors": 0, "rate_limited": 0}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _outcome(self):
+        # Decides up front how a request is answered: "ok", "error" or "rate_limited"
+        with self._lock:
+            self.counts["requests"] += 1
+            roll = self._rng.random()
+            delay = max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+            if roll < self.rate_limit_rate:
+                self.counts["rate_limited"] += 1
+                return "rate_limited", delay
+            if roll < self.rate_limit_rate + self.error_rate:
+                self.counts["errors"] += 1
+                return "error", delay
+            return "ok", delay
+
+    def handle(self, path: str, body: bytes, headers):
+        raise NotImplementedError
+
+    def start(self, host: str = "127.0.0.1", port: int = 0):
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length)
+                status, payload, extra_headers = service.handle(self.path, body, self.headers)
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in extra_headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+class FakeGroq(FakeService):
+    # OpenAI-compatible /chat/completions. Speaker-attribution prompts get a
+    # JSON mapping of every numbered segment to the first listed team member,
+    # so the parser's reply handling runs for real; other prompts get a
+    # summary in the format the docx prompt asks for.
+    SUMMARY = "Alex\ntime: 0:00\nyesterday: finished login api\ntoday: deploy pipeline\nblockers: none"
+
+    def reply_for(self, prompt: str) -> str:
+        members = re.search(r"Team members: (.*)", prompt)
+        if members:
+            name = members.group(1).split(",")[0].strip() or "Unknown"
+            numbers = re.findall(r"^\s*(\d+)\. \(previous speaker", prompt, re.MULTILINE)
+            return json.dumps({number: name for number in numbers})
+        return self.SUMMARY
+
+    def handle(self, path, body, headers):
+        outcome, delay = self._outcome()
+        time.sleep(delay)
+        if outcome == "rate_limited":
+            return 429, {"error": {"message": "rate limited"}}, {"Retry-After": "0"}
+        if outcome == "error":
+            return 503, {"error": {"message": "injected error"}}, {}
+        if not path.rstrip("/").endswith("/chat/completions"):
+            return 404, {"error": {"message": f"unknown path {path}"}}, {}
+        request = json.loads(body or b"{}")
+        prompt = request.get("messages", [{}])[-1].get("content", "")
+        content = self.reply_for(prompt)
+        return 200, {
+            "id": "chatcmpl-bench",
+            "object": "chat.completion",
+            "model": request.get("model"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content},
+                         "finish_reason": "stop"}],
+            # Roughly four characters per token, like the real tokenizer
+            "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(content) // 4}
+        }, {}
+
+class FakeSlack(FakeService):
+    # Answers every Web API method successfully; chat.postMessage calls are
+    # recorded so a benchmark can wait for its messages to be delivered.
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.posts = []
+
+    def handle(self, path, body, headers):
+        outcome, delay = self._outcome()
+        time.sleep(delay)
+        if outcome == "rate_limited":
+            return 429, {"ok": False, "error": "ratelimited"}, {"Retry-After": "1"}
+        if outcome == "error":
+            return 200, {"ok": False, "error": "internal_error"}, {}
+        method = path.rstrip("/").rsplit("/", 1)[-1]
+        if method == "chat.postMessage":
+            with self._lock:
+                self.posts.append(time.time())
+        return 200, {
+            "ok": True,
+            "ts": f"{time.time():.6f}",
+            "channel": "CBENCH",
+            "url": "https://bench.slack.com/",
+            "team": "bench",
+            "team_id": "TBENCH",
+            "user": "bench-bot",
+            "user_id": "UBENCH",
+            "bot_id": "BBENCH"
+        }, {}
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Run the fake Groq and Slack servers until interrupted")
+    parser.add_argument("--groq-port", type=int, default=8801)
+    parser.add_argument("--slack-port", type=int, default=8802)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    groq = FakeGroq(latency=args.latency, error_rate=args.error_rate).start(port=args.groq_port)
+    slack = FakeSlack(latency=args.latency / 4, error_rate=args.error_rate).start(port=args.slack_port)
+    print(f"GROQ_BASE_URL={groq.url}")
+    print(f"SLACK_API_URL={slack.url}/api/")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+
+# Shared helpers for recording benchmark results as JSON that can be
+# compared between commits with `python -m benchmarks.compare`.
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+def percentile(values, pct: float) -> float:
+    # Nearest-rank percentile; 0.0 for an empty sample
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+def summarize_latencies(latencies, wall_seconds: float = None) -> dict:
+    summary = {
+        "count": len(latencies),
+        "mean": sum(latencies) / len(latencies) if latencies else 0.0,
+        "p50": percentile(latencies, 50),
+        "p90": percentile(latencies, 90),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "max": max(latencies) if latencies else 0.0,
+    }
+    if wall_seconds:
+        summary["throughput_per_second"] = len(latencies) / wall_seconds
+    return {key: round(value, 6) if isinstance(value, float) else value for key, value in summary.items()}
+
+def _git(*args):
+    try:
+        return subprocess.run(
+            ["git", *args], capture_output=True, text=True, timeout=10,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+def environment() -> dict:
+    return {
+        "git_commit": _git("rev-parse", "HEAD") or None,
+        "git_dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+def write(name: str, params: dict, results: dict, output: str = None) -> str:
+    document = {
+        "benchmark": name,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "environment": environment(),
+        "params": params,
+        "results": results,
+    }
+    if output is None:
+        commit = (document["environment"]["git_commit"] or "nogit")[:10]
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"{name}-{commit}-{time.strftime('%Y%m%d%H%M%S')}.json")
+    with open(output, "w") as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+    return output
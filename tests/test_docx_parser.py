@@ -0,0 +1,24 @@
+import zipfile
+from io import BytesIO
+from app.utils.docx_parser import extract_text_from_docx
+
+DOCUMENT = (
+    '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>'
+    '<w:p><w:pPr><w:tabs><w:tab w:val="left" w:pos="720"/></w:tabs></w:pPr>'
+    '<w:r><w:t>Sam: yesterday fixed login</w:t></w:r></w:p>'
+    '<w:p><w:r><w:t>Priya:</w:t><w:tab/><w:t>today tests</w:t><w:br/><w:t>no blockers</w:t></w:r></w:p>'
+    '</w:body></w:document>'
+)
+
+
+def _docx(document):
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("word/document.xml", document)
+    return buffer.getvalue()
+
+
+def test_tab_stop_definitions_are_not_text():
+    assert extract_text_from_docx(_docx(DOCUMENT)) == (
+        "Sam: yesterday fixed login\nPriya:\ttoday tests\nno blockers"
+    )
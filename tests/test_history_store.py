@@ -0,0 +1,22 @@
+from app.utils import history_store
+
+
+def _summary(blockers):
+    return f"Sam\ntime: 0:05\nyesterday: fixed login\ntoday: tests\nblockers: {blockers}"
+
+
+def test_negated_blockers_are_not_blockers():
+    for text in ["blocker none.", "no blockers today", "Blockers: nothing", "nothing blocking me", "not blocked"]:
+        assert not history_store.has_blocker(text), text
+    for text in ["waiting on api keys from ops", "no access to the prod db"]:
+        assert history_store.has_blocker(text), text
+
+
+def test_recurring_blockers_skip_negated_blockers(tmp_path, monkeypatch):
+    monkeypatch.setattr(history_store, "HISTORY_DB_PATH", str(tmp_path / "history.db"))
+    history_store.init_db()
+    for day, blockers in (("2026-01-05", "blocker none."), ("2026-01-06", "blocker none."),
+                          ("2026-01-07", "waiting on api keys"), ("2026-01-08", "still waiting on api keys")):
+        history_store.record_summary("default", day, "media", _summary(blockers), meeting_date=day)
+    recurring = history_store.recurring_blockers("default")
+    assert [item["blocker"] for item in recurring] == ["still waiting on api keys"]
@@ -0,0 +1,31 @@
+from app.utils.summary_chunker import _speaker, _split_turns, chunk_text, find_cue_names
+
+
+def test_cue_words_in_ordinary_speech_are_not_speakers():
+    names = find_cue_names("ok, sam yesterday i fixed the login. next week we plan the release.")
+    assert names == {"sam"}
+    assert _speaker("next week we plan", names) is None
+    assert _split_turns("I will look ok then we move next time", names) == [
+        "I will look ok then we move next time"
+    ]
+
+
+def test_known_names_start_turns_anywhere():
+    names = {"sam", "priya"}
+    assert _speaker("ok, sam yesterday i fixed bugs", names) == "sam"
+    assert _speaker("Priya Shah: today I test", names) == "Priya Shah"
+    assert _speaker("Yesterday: fixed bugs", names) is None
+    assert _split_turns("thanks ok priya yesterday i wrote docs", names) == [
+        "thanks", "ok priya yesterday i wrote docs"
+    ]
+
+
+def test_continuation_prefix_names_the_real_speaker():
+    text = (
+        "ok, sam yesterday i worked on the api. "
+        + "next week we plan to ship it and then we move on to the billing page. " * 12
+    )
+    chunks = chunk_text(text.replace(". ", ".\n"), 80)
+    assert len(chunks) > 1
+    for chunk in chunks[1:]:
+        assert chunk.startswith("sam: (continued)")
@@ -0,0 +1,23 @@
+import numpy as np
+from app.utils import vad
+from app.utils.audio_chunker import SAMPLE_RATE
+
+
+def _speech(seconds):
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return (0.3 * np.sin(2 * np.pi * 220 * t) * (0.6 + 0.4 * np.sin(2 * np.pi * 3 * t))).astype(np.float32)
+
+
+def test_mostly_silent_recording_keeps_only_the_speech():
+    noise = (0.005 * np.random.default_rng(0).standard_normal(60 * SAMPLE_RATE)).astype(np.float32)
+    audio = np.concatenate([noise[:30 * SAMPLE_RATE], _speech(3), noise[30 * SAMPLE_RATE:]])
+    speech, offset_map, speech_ratio = vad.strip_silence(audio)
+    assert speech_ratio < 0.1
+    assert len(offset_map) == 1
+    assert abs(offset_map[0][1] - 30) < 0.5
+
+
+def test_short_pauses_inside_speech_are_kept():
+    pause = np.zeros(SAMPLE_RATE // 2, dtype=np.float32)
+    audio = np.concatenate([_speech(3), pause, _speech(3), pause, _speech(3)])
+    assert len(vad.detect_speech(audio)) == 1
@@ -0,0 +1,23 @@
+from app.utils.whisper_groq_parser import parse_timed_segments, process_transcript
+
+SEGMENTS = [
+    {"start": 0.0, "text": "Ok, let's start. Next,"},
+    {"start": 2.0, "text": "rahul yesterday i fixed bugs."},
+    {"start": 5.0, "text": "next, priya"},
+    {"start": 7.0, "text": "yesterday i did docs."},
+    {"start": 9.0, "text": "today tests."},
+]
+
+
+def test_unpunctuated_cue_ends_at_its_segment_boundary():
+    segments, start_times = parse_timed_segments(SEGMENTS)
+    assert "next, rahul yesterday i fixed bugs." in segments
+    index = segments.index("next, priya")
+    assert segments[index + 1] == "yesterday i did docs."
+    assert start_times[index:index + 2] == [5.0, 7.0]
+
+
+def test_update_after_a_cue_is_kept():
+    summary = process_transcript(" ".join(s["text"] for s in SEGMENTS), SEGMENTS)
+    assert "Priya\ntime: 0:05\nyesterday: yesterday i did docs.\ntoday: today tests." in summary
+    assert "Rahul\ntime: 0:00\nyesterday: yesterday i fixed bugs." in summary